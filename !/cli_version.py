@@ -1,10 +1,23 @@
 # cli_version.py
+import argparse
+import itertools
+import json
 import sys
-from dilution_core import calculate_dilution
+
+from dilution_core import calculate_dilution, calculate_dilution_array
+
+CHUNK_ROWS = 10000  # Jobs read, computed and written at a time (bounds memory)
+INPUT_COLUMNS = ["c1", "c2", "v2"]
+RESULT_FIELDS = ["v1", "added", "error"]
+
 
 def cli_mode():
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        sys.exit(batch_mode(sys.argv[2:]))
+
     if len(sys.argv) < 4:
         print("Usage: python cli_version.py <C1> <C2> <V2>")
+        print("       python cli_version.py --batch [FILE|-] [--format csv|jsonl] [--chunk-rows N]")
         sys.exit(1)
 
     c1 = float(sys.argv[1])
@@ -15,5 +28,243 @@ def cli_mode():
     print(f"You need {v1:.3f} units of stock solution.")
     print(f"Add {added:.3f} units of solvent to reach {v2} total volume.")
 
+
+# --- Batch mode: many jobs per process, streamed in chunks ---
+
+# Output rows echo the input text (no re-formatting of C1, C2, V2) followed by the results.
+# NumPy is only imported by the batch functions, so the single-triple mode never loads it.
+CSV_ROW = "%d,%s,%.10g,%.10g,\n"
+JSONL_ROW = '{"line": %d, %s, "v1": %.10g, "added": %.10g}\n'
+
+
+def _read_chunk(stream, chunk_rows, first_number):
+    """Reads up to `chunk_rows` lines; returns (line numbers, stripped non-blank lines, lines read)."""
+    raw = list(itertools.islice(stream, chunk_rows))
+    texts = [line.strip() for line in raw]
+    if all(texts):
+        return range(first_number, first_number + len(texts)), texts, len(raw)
+    kept = [i for i, text in enumerate(texts) if text]
+    return [first_number + i for i in kept], [texts[i] for i in kept], len(raw)
+
+
+def _csv_columns(first_line):
+    """
+    Returns (column indices of C1, C2, V2, all column names, whether the first line is a header).
+
+    The first line is a header when it names any of c1, c2, v2; otherwise it is data
+    (a malformed first row is reported like any other bad row). Headerless files take
+    their column count from the first row, extra columns being named field4, field5, ...
+    """
+    fields = [field.strip().lower() for field in first_line.split(",")]
+    if not any(name in fields for name in INPUT_COLUMNS):
+        extra = [f"field{i + 1}" for i in range(len(INPUT_COLUMNS), len(fields))]
+        return [0, 1, 2], INPUT_COLUMNS + extra, False
+    missing = [name for name in INPUT_COLUMNS if name not in fields]
+    if missing:
+        raise ValueError(f"CSV header is missing column(s): {', '.join(missing)}")
+    return [fields.index(name) for name in INPUT_COLUMNS], [field.strip() for field in first_line.split(",")], True
+
+
+def _csv_texts(lines, columns, n_fields, values, parse_errors):
+    """
+    Input rows in the output layout: C1, C2, V2, then the other columns, always
+    n_fields fields (short rows are padded). Rows with more fields than the header
+    cannot be lined up and become "too many values" errors.
+    """
+    passthrough = [i for i in range(n_fields) if i not in columns]
+    in_order = columns == [0, 1, 2]
+    texts = []
+    for i, line in enumerate(lines):
+        extra_commas = line.count(",") - (n_fields - 1)
+        if in_order and extra_commas == 0:
+            texts.append(line)  # Already in the output layout
+            continue
+        fields = line.split(",")
+        if extra_commas > 0:
+            fields = fields[:n_fields]
+            values[i] = float("nan")
+            parse_errors[i] = parse_errors[i] or "too many values"
+        fields += [""] * (n_fields - len(fields))
+        texts.append(",".join([fields[c] for c in columns] + [fields[c] for c in passthrough]))
+    return texts
+
+
+def _parse_csv_chunk(lines, columns):
+    """Returns a (n, 3) array of C1, C2, V2 (NaN where unreadable) and per-row parse errors."""
+    import numpy as np
+
+    try:
+        # Fast path: NumPy's C parser for a chunk without bad rows. comments=None keeps
+        # '#' lines (they fail as bad rows) so results stay paired with their jobs
+        values = np.loadtxt(lines, delimiter=",", usecols=columns, ndmin=2, dtype=float, comments=None)
+        if values.shape[0] == len(lines):
+            return values, [""] * len(lines)
+    except ValueError:
+        pass
+    values = np.full((len(lines), 3), np.nan)
+    errors = [""] * len(lines)
+    for i, line in enumerate(lines):
+        fields = line.split(",")
+        try:
+            values[i] = [float(fields[column]) for column in columns]
+        except IndexError:
+            errors[i] = "missing value"
+        except ValueError:
+            errors[i] = "not a number"
+    return values, errors
+
+
+def _job_values(job):
+    return [float(job[name]) for name in INPUT_COLUMNS]
+
+
+def _parse_jsonl_chunk(lines):
+    """Same as _parse_csv_chunk for JSON objects with c1, c2 and v2 keys."""
+    import numpy as np
+
+    try:
+        # Fast path: the whole chunk as one JSON array (one C-level parse)
+        values = np.array([_job_values(job) for job in json.loads("[" + ",".join(lines) + "]")],
+                          dtype=float).reshape(-1, 3)
+        if len(values) == len(lines):
+            return values, [""] * len(lines)
+    except (ValueError, TypeError, KeyError, AttributeError):
+        pass
+    values = np.full((len(lines), 3), np.nan)
+    errors = [""] * len(lines)
+    for i, line in enumerate(lines):
+        try:
+            job = json.loads(line)
+            values[i] = _job_values(job)
+        except KeyError as e:
+            errors[i] = f"missing value {e}"
+        except (ValueError, TypeError, AttributeError):
+            errors[i] = "not a number" if line.startswith("{") else "invalid JSON"
+    return values, errors
+
+
+def _row_errors(values, valid, parse_errors):
+    """Explains every invalid row (parse errors first, then the physical checks)."""
+    import numpy as np
+
+    c1, c2, v2 = values.T
+    reasons = np.select(
+        [~np.isfinite(values).all(axis=1), c1 <= 0, (c2 < 0) | (v2 < 0)],
+        ["not a finite number", "C1 must be positive", "C2 and V2 must not be negative"],
+        default="C2 exceeds C1",
+    )
+    errors = parse_errors
+    for i in np.flatnonzero(~valid).tolist():
+        if not errors[i]:
+            errors[i] = str(reasons[i])
+    return errors
+
+
+def _format_rows(row_format, error_format, numbers, texts, v1, added, valid, errors):
+    """Formats a whole chunk; rows with errors get the error line instead of volumes."""
+    import numpy as np
+
+    rows = list(map(row_format.__mod__, zip(numbers, texts, v1.tolist(), added.tolist())))
+    for i in np.flatnonzero(~valid).tolist():
+        rows[i] = error_format(numbers[i], texts[i], errors[i])
+    return "".join(rows)
+
+
+def _csv_error(number, text, error):
+    return f"{number},{text},,,{error}\n"
+
+
+def _jsonl_error(number, text, error):
+    return json.dumps({"line": number, "error": error}) + "\n"
+
+
+def run_batch(stream, out, input_format="auto", chunk_rows=CHUNK_ROWS):
+    """
+    Streams dilution jobs from `stream` to `out`, `chunk_rows` jobs at a time.
+
+    Input is CSV (C1,C2,V2 per line, optional header naming c1, c2, v2 columns)
+    or JSON lines ({"c1": ..., "c2": ..., "v2": ...}). Output uses the same
+    format: the input line number, the input values as given (so extra columns such
+    as job ids pass through), then v1, added and error. CSV output has fixed
+    columns: line, c1, c2, v2, the other input columns, v1, added, error. Bad rows
+    get an error message instead of volumes and do not stop the run.
+
+    Returns:
+        (number of jobs, number of failed jobs)
+
+    Raises:
+        ValueError: For a CSV header without c1, c2 and v2 columns.
+    """
+    import numpy as np
+
+    numbers, lines, n_read = _read_chunk(stream, chunk_rows, 1)
+    next_number = 1 + n_read
+    while n_read and not lines:  # Leading blank lines
+        numbers, lines, n_read = _read_chunk(stream, chunk_rows, next_number)
+        next_number += n_read
+    if not lines:
+        return 0, 0
+    if input_format == "auto":
+        input_format = "jsonl" if lines[0].startswith("{") else "csv"
+
+    if input_format == "csv":
+        columns, names, has_header = _csv_columns(lines[0])
+        n_fields = len(names)
+        header = [names[c] for c in columns] + [name for i, name in enumerate(names) if i not in columns]
+        out.write(",".join(["line"] + header + RESULT_FIELDS) + "\n")
+        if has_header:
+            numbers, lines = numbers[1:], lines[1:]
+        row_format, error_format = CSV_ROW, _csv_error
+    else:
+        row_format, error_format = JSONL_ROW, _jsonl_error
+
+    total = failed = 0
+    while n_read:
+        if lines:
+            if input_format == "csv":
+                values, parse_errors = _parse_csv_chunk(lines, columns)
+            else:
+                values, parse_errors = _parse_jsonl_chunk(lines)
+
+            if not values.shape[0] == len(lines) == len(parse_errors):
+                raise ValueError(f"Lines {numbers[0]}-{numbers[-1]}: parsed {values.shape[0]} rows "
+                                 f"for {len(lines)} jobs.")
+            if input_format == "jsonl":
+                texts = [line[1:-1] for line in lines]  # Object members, to be extended with the results
+            else:
+                texts = _csv_texts(lines, columns, n_fields, values, parse_errors)
+            v1, added, valid = calculate_dilution_array(values[:, 0], values[:, 1], values[:, 2])
+            valid &= np.isfinite(values).all(axis=1)
+            errors = _row_errors(values, valid, parse_errors)
+            out.write(_format_rows(row_format, error_format, numbers, texts, v1, added, valid, errors))
+            out.flush()
+            total += len(lines)
+            failed += int(np.count_nonzero(~valid))
+        numbers, lines, n_read = _read_chunk(stream, chunk_rows, next_number)
+        next_number += n_read
+    return total, failed
+
+
+def batch_mode(argv):
+    parser = argparse.ArgumentParser(prog="cli_version.py --batch",
+                                     description="Compute many dilutions from a CSV or JSON-lines file.")
+    parser.add_argument("input", nargs="?", default="-", help="Job file (default: stdin)")
+    parser.add_argument("--format", choices=["auto", "csv", "jsonl"], default="auto")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.input == "-":
+            total, failed = run_batch(sys.stdin, sys.stdout, args.format, args.chunk_rows)
+        else:
+            with open(args.input, newline="") as stream:
+                total, failed = run_batch(stream, sys.stdout, args.format, args.chunk_rows)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(f"Processed {total} jobs, {failed} failed.", file=sys.stderr)
+    return 1 if failed else 0
+
+
 if __name__ == "__main__":
     cli_mode()
@@ -6,4 +6,35 @@ def calculate_dilution(c1, c2, v2):
 
     v1 = (c2 * v2) / c1
     added = v2 - v1
-    return v1, added
\ No newline at end of file
+    return v1, added
+
+
+def calculate_dilution_array(c1, c2, v2):
+    """
+    Array version of calculate_dilution for whole lookup sheets at once.
+
+    C1, C2 and V2 are broadcast against each other (e.g. stocks[:, None, None],
+    targets[None, :, None], volumes[None, None, :] gives every combination).
+    Rows that cannot be made are flagged instead of raising: C1 <= 0, C2 < 0,
+    V2 < 0 or C2 > C1 (target stronger than the stock, i.e. V1 > V2 and
+    negative solvent). Their v1 and added are NaN.
+
+    Returns:
+        (v1, added, valid): float arrays of the broadcast shape and a boolean mask
+        (0-d arrays for scalar inputs). For valid rows the values equal
+        calculate_dilution's.
+    """
+    # Imported here so scalar callers (main.py, gui_version.py, and cli_version.py,
+    # which imports NumPy only in --batch mode) do not pay for loading it
+    import numpy as np
+
+    c1, c2, v2 = np.broadcast_arrays(np.asarray(c1, dtype=float),
+                                     np.asarray(c2, dtype=float),
+                                     np.asarray(v2, dtype=float))
+    # C2 <= C1 already implies V1 <= V2; comparing V1 with V2 would reject
+    # 1:1 transfers whose V1 rounds a hair above V2
+    valid = (c1 > 0) & (c2 >= 0) & (v2 >= 0) & (c2 <= c1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v1 = np.where(valid, np.minimum(c2 * v2 / c1, v2), np.nan)
+    added = np.where(valid, v2 - v1, np.nan)
+    return v1, added, valid
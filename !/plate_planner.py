@@ -0,0 +1,255 @@
+# plate_planner.py
+"""
+Plans a whole plate of dilutions from one stock, with shared intermediate stocks.
+
+Every well gets its own final concentration. Diluting each well straight from
+the stock (calculate_dilution per well) often needs transfers below the
+pipette minimum, so the planner adds intermediate stocks: each is made from
+the stock or from another intermediate (a tree of dilutions), and each well is
+made from the source that keeps its transfer within [min_volume, max_volume].
+
+Search: on a log scale a source at concentration S can make any target whose
+dilution factor S/c lies in a fixed window set by the volumes, i.e. each source
+covers an interval of log-concentrations. The targets are swept from the
+highest to the lowest concentration; when a target is not covered by any
+existing source, one intermediate is placed at the LOWEST concentration that
+still covers it (so it reaches as far down as possible), chained through
+maximal dilution steps if no existing source can make it directly. This is the
+greedy interval cover, which is minimal for the interval-covering part, and
+runs in O(n log n + n * k) for n targets and k intermediates (a 384-well plate
+takes milliseconds).
+
+Example:
+    plan = plan_plate(stock=1000.0, targets=[50, 5, 0.5, 0.05], well_volume=100.0,
+                      min_volume=2.0, max_volume=50.0)
+    write_worklist(plan, sys.stdout)
+"""
+import argparse
+import csv
+import math
+import sys
+
+import numpy as np
+
+from dilution_core import calculate_dilution
+
+WORKLIST_FIELDS = ["step", "source", "destination", "volume", "concentration"]
+DILUENT = "DILUENT"
+STOCK = "STOCK"
+_SAME = 1e-9  # Log10 tolerance for "target equals source concentration"
+
+
+class DilutionPlan:
+    """
+    Result of plan_plate.
+
+    Attributes:
+        intermediates: List of (name, concentration, parent name, volume made), in the order they are made.
+        assignments: Dict well -> source name (stock or intermediate).
+        unreachable: Wells that cannot be made within the volume limits.
+        worklist: List of dicts with the WORKLIST_FIELDS, in pipetting order.
+        stock_used: Volume of stock the whole plan draws.
+    """
+
+    def __init__(self):
+        self.intermediates = []
+        self.assignments = {}
+        self.unreachable = []
+        self.worklist = []
+        self.stock_used = 0.0
+
+    def summary(self):
+        return (f"{len(self.assignments)} wells planned with {len(self.intermediates)} intermediate "
+                f"stock(s), {len(self.worklist)} transfers, {len(self.unreachable)} unreachable.")
+
+
+def _window(volume, min_volume):
+    """
+    Log10 range of dilution factors a make of `volume` allows: transfer and diluent
+    >= min_volume (either may be split into several aspirations of at most max_volume).
+    """
+    largest_transfer = volume - min_volume
+    if largest_transfer < min_volume:
+        raise ValueError("Volume is too small for two transfers of at least min_volume.")
+    return math.log10(volume / largest_transfer), math.log10(volume / min_volume)
+
+
+def _split(volume, min_volume, max_volume):
+    """
+    Splits a volume into the fewest equal aspirations of at most max_volume. If
+    those fall below min_volume, so would any split (more aspirations are smaller).
+    """
+    n = max(1, math.ceil(volume / max_volume - 1e-12))
+    if n > 1 and volume / n < min_volume * (1 - 1e-9):
+        raise ValueError(f"{volume:.3f} cannot be pipetted in transfers of {min_volume}-{max_volume}.")
+    return [volume / n] * n
+
+
+def plan_plate(stock, targets, well_volume, min_volume, max_volume, wells=None,
+               intermediate_volume=1000.0, dead_volume=20.0):
+    """
+    Plans intermediate stocks and a pipetting worklist for a plate.
+
+    Args:
+        stock (float): Stock concentration.
+        targets (array-like): Final concentration of every well (> 0).
+        well_volume (float): Final volume of every well.
+        min_volume, max_volume (float): Pipetting limits per transfer.
+        wells (list): Well names (default: "W1", "W2", ...).
+        intermediate_volume (float): Smallest volume an intermediate stock is made in; a
+            busier one is made in what it supplies plus dead_volume (transfers above
+            max_volume are split into several aspirations).
+        dead_volume (float): Volume that must remain in each intermediate.
+
+    Returns:
+        DilutionPlan
+
+    Raises:
+        ValueError: For invalid inputs, or a transfer that no split fits into
+            [min_volume, max_volume] (only possible when min_volume > max_volume / 2).
+            Wells that cannot be made are reported in DilutionPlan.unreachable instead.
+    """
+    targets = np.asarray(targets, dtype=float).ravel()
+    if wells is None:
+        wells = [f"W{i + 1}" for i in range(targets.size)]
+    if len(wells) != targets.size:
+        raise ValueError("There must be one well name per target.")
+    if stock <= 0 or not np.all(targets > 0):
+        raise ValueError("Stock and target concentrations must be positive.")
+    if not 0 < min_volume <= max_volume:
+        raise ValueError("Pipetting limits must satisfy 0 < min_volume <= max_volume.")
+    if dead_volume < 0:
+        raise ValueError("Dead volume must not be negative.")
+    well_low, well_high = _window(well_volume, min_volume)
+    step_low, step_high = _window(intermediate_volume, min_volume)
+
+    # 1. Sweep the targets from high to low concentration (log10 scale)
+    log_targets = np.log10(targets)
+    sources = [(STOCK, math.log10(stock), None)]  # (name, log10 concentration, parent index)
+    assigned = {}
+
+    def covering(t):
+        # Lowest-concentration source that can make t (largest, most accurate transfer)
+        for index in range(len(sources) - 1, -1, -1):
+            gap = sources[index][1] - t
+            # A target equal to the source is a plain (possibly split) transfer without diluent
+            if well_low <= gap <= well_high or abs(gap) < _SAME:
+                return index
+        return None
+
+    def add_intermediate(position, parent):
+        sources.append((f"INT{len(sources)}", position, parent))
+        return len(sources) - 1
+
+    plan = DilutionPlan()
+    for i in np.argsort(-log_targets, kind="stable").tolist():
+        t = log_targets[i]
+        index = covering(t)
+        if index is None and t < sources[0][1] - well_low - _SAME:
+            # 2. New intermediate: lowest position in [t + well_low, t + well_high] some source can make
+            low, high = t + well_low, t + well_high
+            best = None
+            for parent, (_, s, _) in enumerate(sources):
+                position = max(low, s - step_high)
+                if position <= min(high, s - step_low) and (best is None or position < best[0]):
+                    best = (position, parent)
+            if best is None:
+                # 3. Too far below every source: chain maximal dilution steps down from the lowest one
+                parent = len(sources) - 1
+                while sources[parent][1] - step_high > high:
+                    parent = add_intermediate(sources[parent][1] - step_high, parent)
+                position = max(low, sources[parent][1] - step_high)
+                if position <= min(high, sources[parent][1] - step_low):
+                    best = (position, parent)
+            if best is not None:
+                index = add_intermediate(*best)
+        if index is None:
+            plan.unreachable.append(wells[i])
+        else:
+            assigned[i] = index
+
+    # 4. Volumes: every transfer via C1V1 = C2V2. Each intermediate is made in what its
+    # wells and child intermediates draw plus the dead volume (at least intermediate_volume,
+    # which only widens its dilution window); children are made after their parents, so
+    # one pass in reverse creation order settles every volume before its parent's
+    concentrations = [float(stock)] + [float(10.0 ** s) for _, s, _ in sources[1:]]
+    consumed = [0.0] * len(sources)
+    well_makes = []
+    for i, index in sorted(assigned.items()):
+        v1, added = calculate_dilution(concentrations[index], targets[i], well_volume)
+        consumed[index] += v1
+        well_makes.append((wells[i], index, v1, added, targets[i]))
+        plan.assignments[wells[i]] = sources[index][0]
+    volumes = [0.0] * len(sources)
+    intermediate_makes = []
+    for index in range(len(sources) - 1, 0, -1):
+        name, _, parent = sources[index]
+        volumes[index] = max(float(intermediate_volume), float(consumed[index]) + dead_volume)
+        v1, added = calculate_dilution(concentrations[parent], concentrations[index], volumes[index])
+        consumed[parent] += v1
+        intermediate_makes.append((name, parent, v1, added, concentrations[index]))
+    intermediate_makes.reverse()
+    makes = intermediate_makes + well_makes  # (destination, source index, transfer, diluent, concentration)
+    for index in range(1, len(sources)):
+        plan.intermediates.append((sources[index][0], concentrations[index], sources[sources[index][2]][0],
+                                   volumes[index]))
+    plan.stock_used = float(consumed[0])
+
+    # 5. Worklist: intermediates in the order they are made (parents first), then the wells
+    for destination, index, v1, added, concentration in makes:
+        for volume in _split(added, min_volume, max_volume) if added > 1e-12 else []:
+            plan.worklist.append({"source": DILUENT, "destination": destination,
+                                  "volume": volume, "concentration": 0.0})
+        for volume in _split(v1, min_volume, max_volume):
+            plan.worklist.append({"source": sources[index][0], "destination": destination,
+                                  "volume": volume, "concentration": concentrations[index]})
+    for step, row in enumerate(plan.worklist, start=1):
+        row["step"] = step
+    return plan
+
+
+def write_worklist(plan, out):
+    """Writes the worklist as CSV (step, source, destination, volume, source concentration)."""
+    writer = csv.DictWriter(out, fieldnames=WORKLIST_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    for row in plan.worklist:
+        writer.writerow({**row, "volume": f"{row['volume']:.3f}", "concentration": f"{row['concentration']:.6g}"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan a plate of dilutions with shared intermediate stocks.")
+    parser.add_argument("targets", help="CSV with 'well,concentration' rows")
+    parser.add_argument("--stock", type=float, required=True, help="Stock concentration")
+    parser.add_argument("--well-volume", type=float, required=True)
+    parser.add_argument("--min-volume", type=float, required=True, help="Smallest allowed transfer")
+    parser.add_argument("--max-volume", type=float, required=True, help="Largest allowed transfer")
+    parser.add_argument("--intermediate-volume", type=float, default=1000.0,
+                        help="Smallest volume an intermediate stock is made in")
+    parser.add_argument("--dead-volume", type=float, default=20.0,
+                        help="Volume left unused in every intermediate stock")
+    args = parser.parse_args()
+
+    wells, targets = [], []
+    with open(args.targets, newline="") as f:
+        for row in csv.reader(f):
+            if len(row) < 2:
+                continue
+            try:
+                targets.append(float(row[1]))
+            except ValueError:
+                continue  # Header
+            wells.append(row[0].strip())
+    try:
+        plan = plan_plate(args.stock, targets, args.well_volume, args.min_volume, args.max_volume, wells,
+                          args.intermediate_volume, args.dead_volume)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    write_worklist(plan, sys.stdout)
+    print(plan.summary(), file=sys.stderr)
+    if plan.unreachable:
+        print("Unreachable wells: " + ", ".join(plan.unreachable), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
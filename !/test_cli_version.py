@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from cli_version import batch_mode, run_batch
+
+
+def run(text, **kwargs):
+    out = io.StringIO()
+    total, failed = run_batch(io.StringIO(text), out, **kwargs)
+    return total, failed, out.getvalue().splitlines()
+
+
+def test_batch_csv_with_header_keeps_rows_paired():
+    """Test that comment, blank and bad rows get an error line and do not shift the results."""
+    total, failed, rows = run("c1,c2,v2,id\n10,1,5,a\n# comment\n\n10,2,5,b\n5,10,1,c\n10,x,5,d\n10,1\n")
+    assert rows[0] == "line,c1,c2,v2,id,v1,added,error"
+    assert rows[1] == "2,10,1,5,a,0.5,4.5,"
+    assert rows[2] == "3,# comment,,,,,,not a number"
+    assert rows[3] == "5,10,2,5,b,1,4,"
+    assert rows[4] == "6,5,10,1,c,,,C2 exceeds C1"
+    assert rows[5] == "7,10,x,5,d,,,not a number"
+    assert rows[6] == "8,10,1,,,,,missing value"
+    assert (total, failed) == (6, 4)
+    assert {len(row) for row in csv.reader(rows)} == {8}
+
+
+def test_batch_csv_comment_line_in_clean_chunk():
+    """Test the fast path: a '#' line among valid rows must not be skipped by the parser."""
+    total, failed, rows = run("c1,c2,v2,id\n10,1,5,a\n# comment\n10,2,5,b\n5,10,1,c\n")
+    assert rows[1:] == ["2,10,1,5,a,0.5,4.5,", "3,# comment,,,,,,not a number",
+                        "4,10,2,5,b,1,4,", "5,5,10,1,c,,,C2 exceeds C1"]
+    assert (total, failed) == (4, 2)
+
+
+def test_batch_csv_without_header_and_small_chunks():
+    """Test headerless input split over several chunks, including a 1:1 transfer."""
+    total, failed, rows = run("3,3,0.1\n0,1,1\n10,1,1\n", chunk_rows=1)
+    assert rows == ["line,c1,c2,v2,v1,added,error", "1,3,3,0.1,0.1,0,",
+                    "2,0,1,1,,,C1 must be positive", "3,10,1,1,0.1,0.9,"]
+    assert (total, failed) == (3, 1)
+
+
+def test_batch_csv_fixed_columns():
+    """Test that reordered, short and long rows all land in the line, c1, c2, v2, ..., error columns."""
+    total, failed, rows = run("id,v2,c1,c2\na,5,10,1\nb,5,10\nc,5,10,1,extra\n")
+    assert rows == ["line,c1,c2,v2,id,v1,added,error",
+                    "2,10,1,5,a,0.5,4.5,",
+                    "3,10,,5,b,,,missing value",
+                    "4,10,1,5,c,,,too many values"]
+    assert (total, failed) == (3, 2)
+
+
+def test_batch_csv_malformed_first_row_is_data():
+    """Test that a bad first row of headerless input is reported instead of aborting the run."""
+    total, failed, rows = run("abc,1,2,x\n10,1,5,y\n")
+    assert rows == ["line,c1,c2,v2,field4,v1,added,error",
+                    "1,abc,1,2,x,,,not a number",
+                    "2,10,1,5,y,0.5,4.5,"]
+    assert (total, failed) == (2, 1)
+
+
+def test_single_triple_mode_does_not_import_numpy():
+    code = "import sys, cli_version; sys.argv[1:] = ['10', '1', '5']; cli_version.cli_mode(); print('numpy' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    assert output.splitlines()[-1] == "False"
+
+
+def test_batch_header_missing_column():
+    with pytest.raises(ValueError):
+        run("c1,c2,volume\n10,1,5\n")
+
+
+def test_batch_jsonl():
+    """Test JSON lines: extra keys pass through, bad lines get an error object."""
+    text = '{"c1": 10, "c2": 1, "v2": 5, "id": "a"}\n\n{"c1": 10, "v2": 5}\nnot json\n{"c1": 1, "c2": 2, "v2": 1}\n'
+    total, failed, rows = run(text)
+    results = [json.loads(row) for row in rows]
+    assert results[0] == {"line": 1, "c1": 10, "c2": 1, "v2": 5, "id": "a", "v1": 0.5, "added": 4.5}
+    assert results[1] == {"line": 3, "error": "missing value 'c2'"}
+    assert results[2] == {"line": 4, "error": "invalid JSON"}
+    assert results[3] == {"line": 5, "error": "C2 exceeds C1"}
+    assert (total, failed) == (4, 3)
+
+
+def test_batch_mode_exit_codes(tmp_path, capsys):
+    path = tmp_path / "jobs.csv"
+    path.write_text("10,1,5\n")
+    assert batch_mode([str(path)]) == 0
+    path.write_text("10,1,5\n1,2,1\n")
+    assert batch_mode([str(path)]) == 1
+    assert batch_mode([str(tmp_path / "missing.csv")]) == 2
+    assert "Processed 2 jobs, 1 failed." in capsys.readouterr().err
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from dilution_core import calculate_dilution, calculate_dilution_array
+
+
+def test_array_matches_scalar_reference():
+    """Test that every valid combination equals calculate_dilution, the reference implementation."""
+    c1 = np.array([0.0, 1.0, 10.0, 250.0])
+    c2 = np.array([0.0, 0.5, 1.0, 10.0, 300.0])
+    v2 = np.array([0.1, 1.0, 100.0])
+    v1, added, valid = calculate_dilution_array(c1[:, None, None], c2[None, :, None], v2[None, None, :])
+    assert v1.shape == added.shape == valid.shape == (4, 5, 3)
+    for i, j, k in np.ndindex(valid.shape):
+        if valid[i, j, k]:
+            expected = calculate_dilution(c1[i], c2[j], v2[k])
+            assert np.allclose((v1[i, j, k], added[i, j, k]), expected)
+        else:
+            assert c1[i] == 0 or c2[j] > c1[i]
+            assert np.isnan(v1[i, j, k]) and np.isnan(added[i, j, k])
+    with pytest.raises(ValueError):
+        calculate_dilution(0.0, 1.0, 1.0)
+
+
+def test_scalar_inputs_and_one_to_one_transfers():
+    """Test 0-d inputs and that C2 == C1 is valid despite float rounding."""
+    v1, added, valid = calculate_dilution_array(3, 3, 0.1)
+    assert valid and v1 == 0.1 and added == 0.0
+    c = np.linspace(0.1, 10, 1000)
+    v1, added, valid = calculate_dilution_array(c, c, 0.1)
+    assert valid.all() and np.all(added >= 0)
+    assert not calculate_dilution_array(1.0, 2.0, 1.0)[2]
+
+
+def test_scalar_use_does_not_import_numpy():
+    """Test that importing dilution_core and running calculate_dilution leaves NumPy unloaded."""
+    code = "import sys, dilution_core; dilution_core.calculate_dilution(10, 1, 5); print('numpy' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    assert output.strip() == "False"
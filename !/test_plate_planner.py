@@ -0,0 +1,109 @@
+import io
+
+import numpy as np
+import pytest
+
+from plate_planner import DILUENT, STOCK, plan_plate, write_worklist
+
+STOCK_CONCENTRATION = 1000.0
+WELL_VOLUME, MIN_VOLUME, MAX_VOLUME, DEAD_VOLUME = 100.0, 2.0, 50.0, 20.0
+TOLERANCE = 1e-9
+
+
+def replay(plan):
+    """Pipettes the worklist into tubes; returns {tube: (volume, amount)} and checks every source."""
+    tubes = {STOCK: [np.inf, np.inf]}
+    made = {}
+    for row in plan.worklist:
+        source, destination, volume = row["source"], row["destination"], row["volume"]
+        assert MIN_VOLUME * (1 - TOLERANCE) <= volume <= MAX_VOLUME * (1 + TOLERANCE)
+        tube = tubes.setdefault(destination, [0.0, 0.0])
+        if source == DILUENT:
+            concentration = 0.0
+        else:
+            assert source in tubes, f"{source} is used before it is made"
+            if source == STOCK:
+                concentration = STOCK_CONCENTRATION
+            else:
+                concentration = tubes[source][1] / tubes[source][0]
+                made.setdefault(source, tubes[source][0])
+                tubes[source][0] -= volume
+                tubes[source][1] -= volume * concentration
+            assert concentration == pytest.approx(row["concentration"], rel=1e-9)
+        tube[0] += volume
+        tube[1] += volume * concentration
+    return tubes
+
+
+def check_plan(plan, targets):
+    tubes = replay(plan)
+    for i, target in enumerate(targets):
+        well = f"W{i + 1}"
+        if well in plan.unreachable:
+            continue
+        volume, amount = tubes[well]
+        assert volume == pytest.approx(WELL_VOLUME, rel=1e-9)
+        assert amount / volume == pytest.approx(target, rel=1e-9)
+    for name, concentration, _, volume in plan.intermediates:
+        # Every intermediate is made in what it supplies plus at least its dead volume
+        assert tubes[name][0] >= DEAD_VOLUME * (1 - 1e-6)
+        assert volume == pytest.approx(max(1000.0, volume - tubes[name][0] + DEAD_VOLUME), rel=1e-9)
+        assert tubes[name][1] / tubes[name][0] == pytest.approx(concentration, rel=1e-9)
+
+
+def plan(targets, **kwargs):
+    return plan_plate(STOCK_CONCENTRATION, targets, WELL_VOLUME, MIN_VOLUME, MAX_VOLUME,
+                      dead_volume=DEAD_VOLUME, **kwargs)
+
+
+def test_plan_plate_small_series():
+    targets = [1000, 500, 50, 5, 0.5, 0.05]
+    result = plan(targets)
+    assert not result.unreachable and len(result.assignments) == len(targets)
+    check_plan(result, targets)
+
+
+def test_plan_plate_busy_intermediate_is_made_in_a_larger_volume():
+    """Test a full 384-well plate drawn from one intermediate (was rejected at intermediate_volume)."""
+    targets = [0.5] * 384
+    result = plan(targets, intermediate_volume=1000.0)
+    (_, _, _, volume), = result.intermediates
+    assert volume > 1000.0
+    check_plan(result, targets)
+
+
+def test_plan_plate_random_plate():
+    rng = np.random.default_rng(0)
+    targets = 10.0 ** rng.uniform(-6, np.log10(800), 384)
+    result = plan(targets)
+    assert not result.unreachable
+    check_plan(result, targets)
+
+
+def test_plan_plate_unreachable_wells():
+    """Test that targets just below the stock (diluent below the minimum) or above it are reported."""
+    targets = [990.0, 2000.0, 10.0]
+    result = plan(targets)
+    assert sorted(result.unreachable) == ["W1", "W2"]
+    assert list(result.assignments) == ["W3"]
+    check_plan(result, targets)
+
+
+def test_plan_plate_invalid_inputs():
+    with pytest.raises(ValueError):
+        plan([1.0, -1.0])
+    with pytest.raises(ValueError):
+        plan_plate(STOCK_CONCENTRATION, [1.0], WELL_VOLUME, 10.0, 5.0)
+    with pytest.raises(ValueError):
+        plan([1.0], wells=["A1", "A2"])
+    with pytest.raises(ValueError):
+        plan_plate(STOCK_CONCENTRATION, [450.0], WELL_VOLUME, 30.0, 50.0)  # 55 diluent: 50 + 5 or 2 x 27.5
+
+
+def test_write_worklist():
+    out = io.StringIO()
+    write_worklist(plan([40.0]), out)
+    assert out.getvalue().splitlines() == ["step,source,destination,volume,concentration",
+                                           "1,DILUENT,W1,48.000,0",
+                                           "2,DILUENT,W1,48.000,0",
+                                           "3,STOCK,W1,4.000,1000"]
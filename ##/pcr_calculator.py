@@ -1,3 +1,6 @@
+from pcr_recipe import Recipe
+
+
 class PCRCalculator:
     # Base volumes per reaction
     BASE_VOLUMES = {
@@ -19,19 +22,23 @@ class PCRCalculator:
     SAFETY_FACTOR = 1.1  # 10% extra volume for pipetting errors
     
     @staticmethod
-    def calculate_volumes(num_reactions):
+    def calculate_volumes(num_reactions, recipe=None):
         """
         Calculate PCR reaction volumes for given number of reactions.
         
         Args:
             num_reactions (float): Number of reactions to calculate for
+            recipe (Recipe): Recipe to use (see pcr_recipe.load_recipe); default is the built-in one
             
         Returns:
             dict: Component names as keys and calculated volumes as values
         """
-        volumes = {}
-        for component in PCRCalculator.COMPONENTS:
-            base_volume = PCRCalculator.BASE_VOLUMES[component]
-            total_volume = base_volume * float(num_reactions) * PCRCalculator.SAFETY_FACTOR
-            volumes[component] = total_volume
-        return volumes
\ No newline at end of file
+        # The recipe's (component, volume) pairs are compiled once; this is plain Python arithmetic
+        if recipe is None:
+            recipe = DEFAULT_RECIPE
+        return recipe.as_dict(num_reactions)
+
+
+# The built-in recipe above, compiled once
+DEFAULT_RECIPE = Recipe("2× Green Master Mix PCR", PCRCalculator.COMPONENTS,
+                        PCRCalculator.BASE_VOLUMES, PCRCalculator.SAFETY_FACTOR)
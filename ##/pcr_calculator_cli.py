@@ -1,22 +1,30 @@
 import argparse
-from pcr_calculator import PCRCalculator
+from pcr_calculator import DEFAULT_RECIPE, PCRCalculator
+from pcr_recipe import load_recipe
 
-def display_results(num_reactions):
+def display_results(num_reactions, recipe=DEFAULT_RECIPE):
     # Get volumes from calculator
-    volumes = PCRCalculator.calculate_volumes(num_reactions)
+    volumes = PCRCalculator.calculate_volumes(num_reactions, recipe)
     
     # Display results
-    print("\nResults (safety factor of 10% included):")
+    print(f"\nResults (safety factor of {recipe.safety_factor - 1:.0%} included):")
     print("-" * 40)
-    for component in PCRCalculator.COMPONENTS:
+    for component in recipe.components:
         print(f"{component}:\t{volumes[component]:.2f} µL")
 
 def main():
     # Set up argument parser
     parser = argparse.ArgumentParser(description='PCR Reaction Calculator')
     parser.add_argument('--value', type=float, help='Number of reactions')
+    parser.add_argument('--recipe', help='Recipe file (.toml or .json); default is the built-in recipe')
     
     args = parser.parse_args()
+    recipe = DEFAULT_RECIPE
+    if args.recipe:
+        try:
+            recipe = load_recipe(args.recipe)
+        except (OSError, ValueError) as e:
+            parser.error(f"could not load recipe: {e}")
     
     # If no argument provided, ask for input
     if args.value is None:
@@ -31,7 +39,7 @@ def main():
     else:
         num_reactions = args.value
     
-    display_results(num_reactions)
+    display_results(num_reactions, recipe)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,5 +1,5 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 from pcr_calculator import PCRCalculator
 
 class PCRCalculatorGUI:
@@ -36,14 +36,15 @@ class PCRCalculatorGUI:
     def calculate(self):
         try:
             num_reactions = float(self.num_reactions.get())
-            # Get volumes from calculator
-            volumes = PCRCalculator.calculate_volumes(num_reactions)
-            
-            # Update display
-            for component in self.components:
-                self.result_labels[component].config(text=f"{volumes[component]:.2f} µL")
-        except:
-            pass
+        except ValueError:
+            messagebox.showerror("Input error", "Please enter a valid number of reactions")
+            return
+        # Get volumes from calculator (microseconds, so no background worker is needed)
+        volumes = PCRCalculator.calculate_volumes(num_reactions)
+
+        # Update display
+        for component in self.components:
+            self.result_labels[component].config(text=f"{volumes[component]:.2f} µL")
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,173 @@
+"""
+Loadable PCR recipes, compiled once into per-reaction volumes.
+
+A recipe file (TOML or JSON) lists the per-reaction volume of every component:
+
+    name = "Green master mix"
+    safety_factor = 1.1
+
+    [components]
+    "2× Green Master Mix" = 7.5
+    "Primer Forward (10 µM)" = 0.5
+    ...
+
+(JSON: {"name": ..., "safety_factor": ..., "components": {...}}). `load_recipe`
+compiles it into a `Recipe`, which keeps the per-reaction volumes as a tuple,
+so volumes for one reaction count are plain Python arithmetic (no NumPy import
+for the calculator). Tables for many reaction counts or recipes are single
+NumPy products, imported only when such a table is built. Every path multiplies
+in the same order (volume x reactions x safety factor), so the numbers agree to
+the last bit. Parsed files are cached by path and modification time.
+
+Example:
+    recipe = load_recipe("recipes/green_master_mix.toml")
+    recipe.volumes(24)                    # Tuple, in recipe.components order
+    recipe.volume_table([8, 24, 96])      # (3, n_components) NumPy matrix
+    total_volumes([recipe, other], [24, 96])  # Reagents for the whole run
+"""
+import math
+import os
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+class Recipe:
+    """
+    A compiled recipe: component names, their per-reaction volumes (µL) and the safety factor.
+
+    Args:
+        name (str): Recipe name.
+        components (Sequence[str]): Component names, in display order.
+        base_volumes (Sequence[float] or dict): Per-reaction volume of every component.
+        safety_factor (float): Extra volume for pipetting losses (1.1 = 10%).
+    """
+
+    __slots__ = ("name", "components", "base_volumes", "safety_factor", "reaction_volume", "_pairs")
+
+    def __init__(self, name: str, components: Sequence[str], base_volumes, safety_factor: float = 1.0):
+        if isinstance(base_volumes, dict):
+            base_volumes = [base_volumes[component] for component in components]
+        base = tuple(float(volume) for volume in base_volumes)
+        if len(base) != len(components):
+            raise ValueError("There must be one volume per component.")
+        if len(set(components)) != len(components):
+            raise ValueError("Component names must be unique.")
+        if any(not volume >= 0 for volume in base) or not safety_factor > 0:
+            raise ValueError("Volumes must not be negative and the safety factor must be positive.")
+        self.name = name
+        self.components: Tuple[str, ...] = tuple(components)
+        self.base_volumes: Tuple[float, ...] = base
+        self.safety_factor = float(safety_factor)
+        self.reaction_volume = math.fsum(base)
+        self._pairs = tuple(zip(self.components, base))  # Precompiled for as_dict
+
+    def volumes(self, num_reactions: float) -> Tuple[float, ...]:
+        """Volume of every component for `num_reactions` reactions (safety factor included)."""
+        safety_factor = self.safety_factor
+        return tuple(volume * num_reactions * safety_factor for volume in self.base_volumes)
+
+    def volume_table(self, reaction_counts: Iterable[float]):
+        """(len(reaction_counts), n_components) NumPy matrix of volumes: one product for all counts."""
+        import numpy as np
+
+        counts = np.asarray(reaction_counts, dtype=float).ravel()
+        return (np.array(self.base_volumes) * counts[:, None]) * self.safety_factor
+
+    def as_dict(self, num_reactions: float) -> Dict[str, float]:
+        """Volumes by component name (the format of PCRCalculator.calculate_volumes)."""
+        safety_factor = self.safety_factor
+        return {component: volume * num_reactions * safety_factor for component, volume in self._pairs}
+
+    def __repr__(self) -> str:
+        return f"Recipe({self.name!r}, {len(self.components)} components, safety_factor={self.safety_factor})"
+
+
+def recipe_matrix(recipes: Sequence[Recipe]):
+    """
+    Stacks the recipes' per-reaction volumes into one (n_recipes, n_components) NumPy
+    matrix over the union of their components (0 where a recipe does not use a
+    component). Returns (component names, matrix).
+    """
+    import numpy as np
+
+    components: List[str] = []
+    column: Dict[str, int] = {}
+    for recipe in recipes:
+        for component in recipe.components:
+            if component not in column:
+                column[component] = len(components)
+                components.append(component)
+    matrix = np.zeros((len(recipes), len(components)))
+    for row, recipe in enumerate(recipes):
+        matrix[row, [column[component] for component in recipe.components]] = recipe.base_volumes
+    return components, matrix
+
+
+def total_volumes(recipes: Sequence[Recipe], reaction_counts: Sequence[float]) -> Dict[str, float]:
+    """Reagent totals for running every recipe the given number of times (summed over the recipes)."""
+    import numpy as np
+
+    if len(recipes) != len(reaction_counts):
+        raise ValueError("There must be one reaction count per recipe.")
+    components, matrix = recipe_matrix(recipes)
+    counts = np.asarray(reaction_counts, dtype=float)[:, None]
+    safety_factors = np.array([recipe.safety_factor for recipe in recipes])[:, None]
+    return dict(zip(components, ((matrix * counts) * safety_factors).sum(axis=0).tolist()))
+
+
+def parse_recipe(data: dict, default_name: str = "recipe") -> Recipe:
+    """Builds a Recipe from the parsed TOML/JSON structure."""
+    if not isinstance(data, dict):
+        raise ValueError("A recipe must be a table/object with a 'components' table.")
+    components = data.get("components")
+    if not isinstance(components, dict) or not components:
+        raise ValueError("A recipe needs a non-empty 'components' table of name = volume.")
+    try:
+        volumes = [float(volume) for volume in components.values()]
+        safety_factor = float(data.get("safety_factor", 1.0))
+    except (TypeError, ValueError):
+        raise ValueError("Recipe volumes and safety_factor must be numbers.")
+    return Recipe(str(data.get("name", default_name)), list(components), volumes, safety_factor)
+
+
+_CACHE: Dict[str, Tuple[int, int, Recipe]] = {}
+
+
+def load_recipe(path: str) -> Recipe:
+    """
+    Loads and compiles a .toml or .json recipe; unchanged files come from the cache.
+
+    Raises:
+        ValueError: For an unknown file type or an invalid recipe.
+        OSError: If the file cannot be read.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    cached = _CACHE.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, "rb") as f:
+        raw = f.read()
+    if extension == ".toml":
+        try:
+            import tomllib  # Python 3.11+; imported here as only TOML recipes need it
+        except ImportError:  # pragma: no cover
+            raise ValueError("TOML recipes need Python 3.11+ (tomllib); use a JSON recipe instead.")
+        try:
+            data = tomllib.loads(raw.decode("utf-8"))
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"Invalid TOML recipe: {e}")
+    elif extension == ".json":
+        import json  # Only JSON recipes need it (keeps the calculator's import light)
+
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON recipe: {e}")
+    else:
+        raise ValueError("Recipe files must end in .toml or .json.")
+
+    recipe = parse_recipe(data, default_name=os.path.splitext(os.path.basename(path))[0])
+    _CACHE[path] = (stat.st_mtime_ns, stat.st_size, recipe)
+    return recipe
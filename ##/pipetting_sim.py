@@ -0,0 +1,278 @@
+"""
+Monte Carlo simulation of pipetting errors for dilutions and PCR master mixes.
+
+Every transfer is done with the smallest pipette that holds it (larger
+volumes are split into several aspirations of the largest pipette). Each
+pipette has:
+
+- a systematic error (bias): drawn once per trial and pipette, so all
+  transfers with the same pipette in one trial are off in the same direction;
+- a random error: drawn for every aspiration.
+
+The defaults are half the ISO 8655-2 maximum permissible errors at nominal
+volume as standard deviations, growing with (nominal / volume) ** 0.5 at
+lower volumes. Everything is vectorized over trials x transfers and processed
+in cache-sized chunks of trials, so memory stays bounded. The trials are cut
+into fixed blocks with their own random streams, so a seed gives the same
+results for any `processes` (which spreads the blocks over a process pool).
+
+Example:
+    result = simulate_master_mix(24, trials=100_000, seed=1)
+    result["shortfall_probability"], result["required_safety_factor"]
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pcr_calculator import DEFAULT_RECIPE
+
+# (name, nominal volume µL, systematic sd as fraction, random sd as fraction) at nominal volume
+PIPETTES = [
+    ("P2", 2.0, 0.020, 0.010),
+    ("P10", 10.0, 0.006, 0.004),
+    ("P20", 20.0, 0.005, 0.0025),
+    ("P200", 200.0, 0.004, 0.0015),
+    ("P1000", 1000.0, 0.004, 0.0015),
+]
+
+CHUNK_ELEMENTS = 262_144  # Trials x transfers simulated at once (1 MB float32 arrays stay in cache)
+BLOCK_ELEMENTS = 16_000_000  # Trials x transfers per random stream (the unit split over processes)
+
+
+def _pipette_plan(volumes, pipettes):
+    """
+    Chooses a pipette for every transfer.
+
+    Returns:
+        (pipette index, number of aspirations, systematic sd (absolute, per transfer),
+        random sd (absolute, whole transfer)) arrays with the shape of `volumes`.
+    """
+    volumes = np.asarray(volumes, dtype=float)
+    nominal = np.array([p[1] for p in pipettes])
+    systematic = np.array([p[2] for p in pipettes])
+    random_sd = np.array([p[3] for p in pipettes])
+
+    index = np.minimum(np.searchsorted(nominal, volumes), len(pipettes) - 1)
+    aspirations = np.maximum(1, np.ceil(volumes / nominal[index] - 1e-12))
+    per_aspiration = volumes / aspirations
+    # Relative errors grow towards the low end of a pipette's range
+    scale = np.sqrt(nominal[index] / np.maximum(per_aspiration, 1e-12))
+    systematic_abs = volumes * systematic[index] * scale
+    random_abs = per_aspiration * random_sd[index] * scale * np.sqrt(aspirations)
+    return index, aspirations, systematic_abs, random_abs
+
+
+def _transfer_model(volumes, pipettes):
+    """
+    Float32 model of the transfers for _simulate_transfers: the random sd of every
+    transfer, and a (pipettes + 1, transfers) matrix mapping each trial's pipette
+    biases (plus a constant 1 for the nominal volumes) onto the transfers.
+    """
+    index, _, systematic_abs, random_abs = _pipette_plan(volumes, pipettes)
+    mixing = np.zeros((len(pipettes) + 1, volumes.size), dtype=np.float32)
+    mixing[index, np.arange(volumes.size)] = systematic_abs
+    mixing[-1] = volumes
+    return random_abs.astype(np.float32), mixing
+
+
+def _simulate_transfers(rng, n_trials, model):
+    """
+    Actual volumes for (n_trials, transfers): nominal + per-pipette bias + per-transfer noise.
+
+    The biases reach the transfers through one small matrix product instead of a
+    gather per pipette. Single precision halves the memory traffic; the errors are
+    far above its resolution.
+    """
+    random_sd, mixing = model
+    actual = rng.standard_normal((n_trials, random_sd.size), dtype=np.float32)
+    actual *= random_sd
+    bias = np.ones((n_trials, mixing.shape[0]), dtype=np.float32)
+    bias[:, :-1] = rng.standard_normal((n_trials, mixing.shape[0] - 1), dtype=np.float32)
+    actual += bias @ mixing
+    return actual
+
+
+def _split(trials, elements, width):
+    """Sizes of consecutive pieces of `trials` with about `elements` trials x transfers each."""
+    step = max(1, elements // max(width, 1))
+    return [min(step, trials - start) for start in range(0, trials, step)]
+
+
+def _run(worker, trials, width, seed, processes, args):
+    """
+    Runs worker(blocks, *args) over fixed blocks of trials, each a (size, SeedSequence) pair,
+    in one process or spread over a pool, and adds the per-block sums in block order.
+    The blocks do not depend on `processes`, so neither do the results.
+    """
+    sizes = _split(trials, BLOCK_ELEMENTS, width)
+    blocks = list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+    if not processes or processes <= 1 or len(blocks) == 1:
+        parts = worker(blocks, *args)
+    else:
+        groups = [blocks[i::processes] for i in range(processes)]
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(worker, groups, *[[arg] * processes for arg in args]))
+        parts = [None] * len(blocks)
+        for i, result in enumerate(results):
+            parts[i::processes] = result
+    # Sample arrays are concatenated, counts and sums are added
+    return {key: (np.concatenate([part[key] for part in parts]) if key == "samples"
+                  else sum(part[key] for part in parts)) for key in parts[0]}
+
+
+def _dilution_sums(blocks, c1, c2, v2, needed, tolerance, pipettes):
+    v1 = c2 * v2 / c1
+    added = v2 - v1
+    volumes = np.concatenate([v1, added])
+    model = _transfer_model(volumes, pipettes)
+    n = v1.size
+    scale = (c1 / c2).astype(np.float32)
+    parts = []
+    for trials, seed_sequence in blocks:
+        rng = np.random.default_rng(seed_sequence)
+        sums = {"n": 0, "sum": np.zeros(n), "sum_sq": np.zeros(n), "out_of_tolerance": np.zeros(n)}
+        if needed is not None:
+            sums["shortfall"] = np.zeros(n)
+        for size in _split(trials, CHUNK_ELEMENTS, volumes.size):
+            actual = _simulate_transfers(rng, size, model)
+            stock, solvent = actual[:, :n], actual[:, n:]
+            final_volume = np.add(stock, solvent, out=solvent)
+            if needed is not None:
+                sums["shortfall"] += np.count_nonzero(final_volume < needed, axis=0)
+            relative = np.divide(stock, final_volume, out=stock)
+            relative *= scale  # Final concentration / target
+            sums["n"] += size
+            sums["sum"] += relative.sum(axis=0, dtype=np.float64)
+            sums["sum_sq"] += np.einsum("ij,ij->j", relative, relative, dtype=np.float64)
+            relative -= 1.0
+            sums["out_of_tolerance"] += np.count_nonzero(np.abs(relative, out=relative) > tolerance, axis=0)
+        parts.append(sums)
+    return parts
+
+
+def simulate_dilution(c1, c2, v2, trials=100_000, needed_volume=None, tolerance=0.05,
+                      pipettes=PIPETTES, seed=None, processes=None):
+    """
+    Propagates pipetting errors through C1V1 = C2V2 dilutions (one per well).
+
+    Args:
+        c1 (float): Stock concentration.
+        c2, v2 (array-like): Target concentration and final volume of every well (broadcast).
+        trials (int): Number of Monte Carlo trials.
+        needed_volume (array-like): Volume the assay withdraws from each well; without
+            it there is no shortfall to report (the mean final volume is v2 itself).
+        tolerance (float): Allowed relative deviation of the final concentration.
+        pipettes (list): Pipette table like PIPETTES (sorted by nominal volume).
+        seed (int): Seed for reproducible results (the same for any number of processes).
+        processes (int): Split the trials over this many worker processes.
+
+    Returns:
+        dict: Per-well arrays: "cv" (final concentration CV), "bias" (mean relative
+        error), "out_of_tolerance_probability" and, with needed_volume,
+        "shortfall_probability" (final volume < needed_volume).
+
+    Raises:
+        ValueError: If C1 is not positive or a well needs more stock than its final volume.
+    """
+    c2, v2 = np.broadcast_arrays(np.atleast_1d(np.asarray(c2, dtype=float)),
+                                 np.atleast_1d(np.asarray(v2, dtype=float)))
+    if c1 <= 0:
+        raise ValueError("C1 must be positive.")
+    if np.any(c2 <= 0) or np.any(c2 > c1) or np.any(v2 <= 0):
+        raise ValueError("Targets must satisfy 0 < C2 <= C1 and V2 > 0.")
+    needed = None
+    if needed_volume is not None:
+        needed = np.broadcast_to(np.asarray(needed_volume, dtype=np.float32), v2.shape).ravel()
+
+    sums = _run(_dilution_sums, trials, 2 * v2.size, seed, processes,
+                (float(c1), c2.ravel(), v2.ravel(), needed, tolerance, pipettes))
+    mean = sums["sum"] / sums["n"]
+    variance = np.maximum(sums["sum_sq"] / sums["n"] - mean ** 2, 0.0)
+    shape = c2.shape
+    result = {
+        "cv": (np.sqrt(variance) / mean).reshape(shape),
+        "bias": (mean - 1.0).reshape(shape),
+        "out_of_tolerance_probability": (sums["out_of_tolerance"] / sums["n"]).reshape(shape),
+    }
+    if needed is not None:
+        result["shortfall_probability"] = (sums["shortfall"] / sums["n"]).reshape(shape)
+    return result
+
+
+def _master_mix_samples(blocks, component_volumes, aliquot, n_aliquots, dead_volume, safety_factor, pipettes):
+    model = _transfer_model(component_volumes, pipettes)
+    _, _, systematic_abs, random_abs = _pipette_plan(np.array([aliquot]), pipettes)
+    n = len(component_volumes)
+    nominal_fraction = component_volumes / component_volumes.sum()
+    parts = []
+    for trials, seed_sequence in blocks:
+        rng = np.random.default_rng(seed_sequence)
+        sums = {"n": 0, "shortfall": 0, "sum": np.zeros(n), "sum_sq": np.zeros(n)}
+        samples = []
+        for size in _split(trials, CHUNK_ELEMENTS, n + 1):
+            components = _simulate_transfers(rng, size, model)
+            mix = components.sum(axis=1)
+            # n_aliquots dispenses with one pipette: shared bias, independent noise (sum of normals)
+            bias = rng.standard_normal(size) * systematic_abs[0]
+            dispensed = n_aliquots * (aliquot + bias) + rng.standard_normal(size) * random_abs[0] * math.sqrt(n_aliquots)
+            required = dispensed + dead_volume
+
+            fraction = components / mix[:, None] / nominal_fraction
+            sums["n"] += size
+            sums["shortfall"] += int(np.count_nonzero(mix < required))
+            sums["sum"] += fraction.sum(axis=0)
+            sums["sum_sq"] += np.square(fraction).sum(axis=0)
+            # The mix scales with the safety factor, so each trial's smallest sufficient factor is direct
+            samples.append((safety_factor * required / mix).astype(np.float32))
+        sums["samples"] = np.concatenate(samples)
+        parts.append(sums)
+    return parts
+
+
+def simulate_master_mix(num_reactions, trials=100_000, safety_factor=None,
+                        dead_volume=0.0, target_probability=0.01, pipettes=PIPETTES,
+                        seed=None, processes=None, recipe=None):
+    """
+    Propagates pipetting errors through a PCRCalculator.calculate_volumes master mix.
+
+    The mix is pipetted from the per-component volumes (scaled to `safety_factor`),
+    then ceil(num_reactions) aliquots of one reaction volume are dispensed from it.
+
+    Args:
+        num_reactions (float): Number of reactions.
+        trials (int): Number of Monte Carlo trials.
+        safety_factor (float): Overage the mix is made with (default: the recipe's, 1.1 built in).
+        dead_volume (float): Volume (µL) left in the tube that cannot be dispensed.
+        target_probability (float): Acceptable shortfall probability for `required_safety_factor`.
+        pipettes (list): Pipette table like PIPETTES.
+        seed (int): Seed for reproducible results (the same for any number of processes).
+        processes (int): Split the trials over this many worker processes.
+        recipe (Recipe): Recipe to simulate (see pcr_recipe); default is the built-in one.
+
+    Returns:
+        dict: "shortfall_probability" (mix runs out before the last aliquot),
+        "required_safety_factor" (smallest factor meeting `target_probability`),
+        and "component_cv" {component: CV of its fraction in the mix}.
+
+    Raises:
+        ValueError: If num_reactions or the safety factor is not positive.
+    """
+    recipe = recipe or DEFAULT_RECIPE
+    if safety_factor is None:
+        safety_factor = recipe.safety_factor
+    if num_reactions <= 0 or safety_factor <= 0:
+        raise ValueError("Number of reactions and safety factor must be positive.")
+    components = recipe.components
+    component_volumes = np.array(recipe.base_volumes) * float(num_reactions) * safety_factor
+    aliquot = recipe.reaction_volume
+
+    sums = _run(_master_mix_samples, trials, len(component_volumes) + 1, seed, processes,
+                (component_volumes, aliquot, math.ceil(num_reactions), dead_volume, safety_factor, pipettes))
+    mean = sums["sum"] / sums["n"]
+    cv = np.sqrt(np.maximum(sums["sum_sq"] / sums["n"] - mean ** 2, 0.0)) / mean
+    return {
+        "shortfall_probability": sums["shortfall"] / sums["n"],
+        "required_safety_factor": float(np.quantile(sums["samples"], 1.0 - target_probability)),
+        "component_cv": dict(zip(components, cv.tolist())),
+    }
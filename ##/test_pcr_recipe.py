@@ -0,0 +1,89 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import pcr_recipe
+from pcr_calculator import DEFAULT_RECIPE, PCRCalculator
+from pcr_recipe import Recipe, load_recipe, parse_recipe, total_volumes
+
+RECIPE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recipes")
+
+
+def test_calculate_volumes_matches_previous_output():
+    """Test the recipe-backed calculator against the loop it replaced, bit for bit."""
+    for num_reactions in [0.25 * i for i in range(1, 400)] + [1000]:
+        expected = {component: PCRCalculator.BASE_VOLUMES[component] * num_reactions * PCRCalculator.SAFETY_FACTOR
+                    for component in PCRCalculator.COMPONENTS}
+        volumes = PCRCalculator.calculate_volumes(num_reactions)
+        assert list(volumes) == PCRCalculator.COMPONENTS
+        assert volumes == expected
+
+
+def test_load_toml_recipe_equals_built_in():
+    recipe = load_recipe(os.path.join(RECIPE_DIR, "green_master_mix.toml"))
+    assert recipe.name == DEFAULT_RECIPE.name
+    assert recipe.components == DEFAULT_RECIPE.components
+    assert recipe.as_dict(24) == PCRCalculator.calculate_volumes(24)
+    assert recipe.reaction_volume == 15.0
+
+
+def test_load_json_recipe_and_cache(tmp_path):
+    path = tmp_path / "mix.json"
+    path.write_text(json.dumps({"components": {"Mix": 10.0, "Water": 5.0}}))
+    recipe = load_recipe(str(path))
+    assert recipe.name == "mix" and recipe.safety_factor == 1.0
+    assert load_recipe(str(path)) is recipe  # Unchanged file: cached object
+
+    path.write_text(json.dumps({"name": "Bigger", "safety_factor": 1.2, "components": {"Mix": 12.0, "Water": 3.0}}))
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000_000))
+    reloaded = load_recipe(str(path))
+    assert reloaded is not recipe and reloaded.name == "Bigger"
+    assert reloaded.volumes(2) == pytest.approx([28.8, 7.2])
+    assert pcr_recipe._CACHE[str(path)][2] is reloaded
+
+
+@pytest.mark.parametrize("content, suffix", [
+    ("[1, 2, 3]", ".json"),
+    ("42", ".json"),
+    ('{"components": {}}', ".json"),
+    ('{"components": {"Mix": "a lot"}}', ".json"),
+    ("{not json", ".json"),
+    ("components = [", ".toml"),
+    ("Mix,10", ".csv"),
+])
+def test_invalid_recipe_files(tmp_path, content, suffix):
+    path = tmp_path / ("bad" + suffix)
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        load_recipe(str(path))
+
+
+def test_parse_recipe_rejects_non_tables():
+    for data in ([], "recipe", None):
+        with pytest.raises(ValueError):
+            parse_recipe(data)
+
+
+def test_volume_table_and_total_volumes():
+    recipe = Recipe("A", ["Mix", "Water"], {"Mix": 10.0, "Water": 5.0}, 1.1)
+    other = Recipe("B", ["Water", "Primer"], [2.0, 1.0])
+    np.testing.assert_array_equal(recipe.volume_table([1, 8, 24]),
+                                  [recipe.volumes(1), recipe.volumes(8), recipe.volumes(24)])
+    assert total_volumes([recipe], [24]) == recipe.as_dict(24)
+    totals = total_volumes([recipe, other], [8, 96])
+    assert list(totals) == ["Mix", "Water", "Primer"]
+    assert totals == pytest.approx({"Mix": 88.0, "Water": 44.0 + 192.0, "Primer": 96.0})
+    with pytest.raises(ValueError):
+        total_volumes([recipe], [1, 2])
+
+
+def test_calculator_import_does_not_load_numpy():
+    """Test that the scalar calculator stays pure Python; NumPy is only for the batch helpers."""
+    code = "import sys, pcr_calculator; pcr_calculator.PCRCalculator.calculate_volumes(3); print('numpy' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+import pipetting_sim
+from pipetting_sim import PIPETTES, _pipette_plan, simulate_dilution, simulate_master_mix
+
+
+def test_dilution_cv_matches_analytic_value():
+    """Test a 1:10 dilution (P10 stock, P200 solvent) against the first-order error propagation."""
+    c1, c2, v2 = 100.0, 10.0, 100.0
+    v1, added = 10.0, 90.0
+    _, _, systematic_abs, random_abs = _pipette_plan(np.array([v1, added]), PIPETTES)
+    sd = np.hypot(systematic_abs, random_abs)
+    # d ln(C) = dS (1/V1 - 1/V2) - dD / V2
+    expected = np.hypot(sd[0] * (1 / v1 - 1 / v2), sd[1] / v2)
+    result = simulate_dilution(c1, c2, v2, trials=200_000, seed=3)
+    assert result["cv"][0] == pytest.approx(expected, rel=0.02)
+    assert abs(result["bias"][0]) < 0.1 * expected
+    assert "shortfall_probability" not in result
+
+
+def test_dilution_shortfall_uses_needed_volume():
+    result = simulate_dilution(100.0, [10.0, 10.0], 100.0, trials=20_000, needed_volume=[90.0, 100.0], seed=1)
+    assert result["shortfall_probability"][0] == 0.0
+    assert 0.3 < result["shortfall_probability"][1] < 0.7
+
+
+def test_results_do_not_depend_on_processes(monkeypatch):
+    """Test that a seed gives identical results in one process and split over two."""
+    monkeypatch.setattr(pipetting_sim, "BLOCK_ELEMENTS", 20_000)
+    c2 = np.geomspace(0.5, 50.0, 12)
+    single = simulate_dilution(100.0, c2, 50.0, trials=5_000, needed_volume=49.0, seed=7)
+    split = simulate_dilution(100.0, c2, 50.0, trials=5_000, needed_volume=49.0, seed=7, processes=2)
+    assert single.keys() == split.keys()
+    for key in single:
+        np.testing.assert_array_equal(single[key], split[key])
+    assert simulate_master_mix(24, trials=30_000, seed=7) == simulate_master_mix(24, trials=30_000, seed=7, processes=2)
+
+
+def test_master_mix_safety_factor():
+    result = simulate_master_mix(24, trials=50_000, seed=1)
+    # The built-in 10% overage is far more than pipetting errors need
+    assert result["shortfall_probability"] == 0.0
+    assert 1.0 < result["required_safety_factor"] < 1.1
+    short = simulate_master_mix(24, trials=50_000, safety_factor=1.0, seed=1)
+    assert short["shortfall_probability"] > 0.1
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        simulate_dilution(0.0, 1.0, 10.0)
+    with pytest.raises(ValueError):
+        simulate_dilution(1.0, 2.0, 10.0)
+    with pytest.raises(ValueError):
+        simulate_master_mix(0)
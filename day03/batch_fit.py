@@ -0,0 +1,241 @@
+"""batch_fit.py
+
+Headless batch fitter for a directory of growth-curve files.
+
+Every file (two columns: Time, Concentration — the format the GUI's
+"Load Data from File" button accepts) is fitted with `growth_rate_fit`
+on a process pool, and results are streamed to a single CSV or JSON-lines
+output as soon as each file finishes.
+
+With --plate, every file is a wide plate-reader export (one row per time
+point, one column per well); all wells of a plate are fitted together with
+`growth_rate_fit_batch` and written as one result row per well.
+
+Usage:
+    python batch_fit.py <directory> [--output results.csv] [--workers 8] [--chunksize 16] [--plate]
+                        [--cache-dir DIR] [--data-cache]
+"""
+import argparse
+import csv
+import functools
+import glob
+import json
+import multiprocessing
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from calculator_logic import growth_rate_fit, growth_rate_fit_batch
+from data_loader import load_growth_data, load_growth_data_cached, load_plate_data
+from fit_cache import FitCache
+
+RESULT_FIELDS = ["file", "n_points", "k", "r_squared", "error"]
+PLATE_RESULT_FIELDS = ["file", "well", "n_points", "k", "r_squared", "error"]
+
+# One on-disk fit cache per process and cache directory
+_CACHES: Dict[str, FitCache] = {}
+
+
+def _call_fit(cache_dir: Optional[str], func, *args):
+    """Runs a fit function, through this process's on-disk fit cache for `cache_dir` if given."""
+    if cache_dir is None:
+        return func(*args)
+    if cache_dir not in _CACHES:
+        _CACHES[cache_dir] = FitCache(disk_dir=cache_dir)
+    return _CACHES[cache_dir].call(func, *args)
+
+
+def _load_checked(filepath: str, data_cache: bool = False):
+    """Loads a file as NumPy arrays, raising on the first bad line."""
+    if data_cache:
+        times, concentrations, report = load_growth_data_cached(filepath)
+    else:
+        times, concentrations, report = load_growth_data(filepath)
+    if not report.ok:
+        line_num, message = report.errors[0]
+        extra = f" ({len(report.errors)} bad lines)" if len(report.errors) > 1 else ""
+        raise ValueError(f"Line {line_num}: {message}{extra}")
+    return times, concentrations
+
+
+def read_growth_file(filepath: str, data_cache: bool = False) -> Tuple[List[float], List[float]]:
+    """Reads a two-column (Time, Concentration) file with the GUI's rules.
+
+    Columns may be separated by commas, tabs or spaces; empty lines and lines
+    starting with '#' are skipped. Parsing is done by `data_loader.load_growth_data`
+    (or the sidecar-cached `load_growth_data_cached` when `data_cache` is True).
+
+    Raises:
+        ValueError: On a malformed line, negative time or non-positive concentration
+            (the message names the first bad line and how many there were).
+    """
+    times, concentrations = _load_checked(filepath, data_cache)
+    return times.tolist(), concentrations.tolist()
+
+
+def fit_file(filepath: str, cache_dir: Optional[str] = None, data_cache: bool = False) -> Dict[str, object]:
+    """Loads and fits one file. Errors are reported in the result, never raised.
+
+    With `cache_dir`, fits of identical data are reused across runs (see fit_cache.py).
+    With `data_cache`, parsed files are reloaded from their binary sidecar (see data_loader.py).
+    """
+    result = {"file": filepath, "n_points": 0, "k": None, "r_squared": None, "error": ""}
+    try:
+        times, concentrations = _load_checked(filepath, data_cache)
+        result["n_points"] = len(times)
+        k, r_squared = _call_fit(cache_dir, growth_rate_fit, times, concentrations)
+        result["k"] = float(k)
+        result["r_squared"] = float(r_squared)
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def _fit_file_as_list(filepath: str, cache_dir: Optional[str] = None,
+                      data_cache: bool = False) -> List[Dict[str, object]]:
+    return [fit_file(filepath, cache_dir, data_cache)]
+
+
+def fit_plate_file(filepath: str, cache_dir: Optional[str] = None) -> List[Dict[str, object]]:
+    """Loads a wide plate-reader file and fits all wells in one batched pass.
+
+    Returns one result per well (same k and R-squared as `growth_rate_fit` on
+    that well's usable points). Errors are reported in the results, never raised.
+    With `cache_dir`, batch fits of identical plates are reused across runs.
+    """
+    try:
+        times, well_ids, values, _ = load_plate_data(filepath)
+        k, _, r_squared = _call_fit(cache_dir, growth_rate_fit_batch, times, values)
+    except Exception as e:
+        return [{"file": filepath, "well": "", "n_points": 0, "k": None, "r_squared": None, "error": str(e)}]
+
+    n_points = np.sum(np.isfinite(values) & (values > 0), axis=1)
+    results = []
+    for i, well in enumerate(well_ids):
+        fitted = bool(np.isfinite(k[i]))
+        results.append({
+            "file": filepath,
+            "well": well,
+            "n_points": int(n_points[i]),
+            "k": float(k[i]) if fitted else None,
+            "r_squared": float(r_squared[i]) if fitted else None,
+            "error": "" if fitted else "At least two positive points at different times are required for fitting.",
+        })
+    return results
+
+
+def find_files(directory: str, pattern: str) -> List[str]:
+    """Returns the sorted list of files in `directory` matching the glob `pattern`."""
+    return sorted(p for p in glob.glob(os.path.join(directory, pattern)) if os.path.isfile(p))
+
+
+def run_batch(files: List[str], out, output_format: str = "csv",
+              workers: Optional[int] = None, chunksize: int = 1,
+              cache_dir: Optional[str] = None, data_cache: bool = False, plate: bool = False) -> int:
+    """
+    Fits `files` on a process pool and streams each result to `out` as it finishes
+    (so output order is completion order, not input order).
+
+    Args:
+        files (List[str]): Files to fit.
+        out: Writable text stream.
+        output_format (str): "csv" or "jsonl".
+        workers (int): Number of worker processes (default: all CPUs). 1 runs in-process.
+        chunksize (int): Number of files handed to a worker at a time.
+        cache_dir (Optional[str]): Directory of the on-disk fit cache (None disables it).
+        data_cache (bool): Reload parsed files from binary sidecars written next to them
+            (not available with `plate`).
+        plate (bool): Files are wide plate-reader exports (one output row per well).
+
+    Returns:
+        int: Number of files (wells with `plate`) that failed to load or fit.
+
+    Raises:
+        ValueError: For an unknown output format, or `data_cache` with `plate`.
+    """
+    if output_format not in ("csv", "jsonl"):
+        raise ValueError("Output format must be 'csv' or 'jsonl'.")
+    if plate and data_cache:
+        raise ValueError("The binary data cache is not available for plate-reader files.")
+
+    writer = None
+    if output_format == "csv":
+        writer = csv.DictWriter(out, fieldnames=PLATE_RESULT_FIELDS if plate else RESULT_FIELDS)
+        writer.writeheader()
+
+    def emit(results):
+        nonlocal failures
+        for result in results:
+            if writer is not None:
+                writer.writerow(result)
+            else:
+                out.write(json.dumps(result) + "\n")
+            failures += bool(result["error"])
+
+    if plate:
+        fit = functools.partial(fit_plate_file, cache_dir=cache_dir)
+    else:
+        fit = functools.partial(_fit_file_as_list, cache_dir=cache_dir, data_cache=data_cache)
+    failures = 0
+    if workers == 1:
+        for results in map(fit, files):
+            emit(results)
+    else:
+        with multiprocessing.Pool(processes=workers) as pool:
+            for results in pool.imap_unordered(fit, files, chunksize=chunksize):
+                emit(results)
+    out.flush()
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fit every growth-curve file in a directory in parallel")
+    parser.add_argument("directory", help="Directory with two-column (Time, Concentration) files")
+    parser.add_argument("--pattern", default="*.csv", help="Glob pattern for data files (default: *.csv)")
+    parser.add_argument("--output", "-o", help="Output file (.csv or .jsonl); default: CSV to stdout")
+    parser.add_argument("--format", choices=["csv", "jsonl"],
+                        help="Output format (default: from the output extension, else csv)")
+    parser.add_argument("--workers", "-j", type=int, default=os.cpu_count(),
+                        help="Number of worker processes (default: all CPUs)")
+    parser.add_argument("--chunksize", type=int, default=16,
+                        help="Files handed to a worker at a time (default: 16)")
+    parser.add_argument("--cache-dir", help="Reuse fits of identical data across runs (on-disk cache)")
+    parser.add_argument("--plate", action="store_true",
+                        help="Files are wide plate-reader exports (time + one column per well)")
+    parser.add_argument("--data-cache", action="store_true",
+                        help="Keep hidden binary sidecars (.<name>.growth.npy/.json) next to the "
+                             "files and reuse them on the next run (not with --plate)")
+    args = parser.parse_args(argv)
+
+    if args.workers < 1 or args.chunksize < 1:
+        parser.error("--workers and --chunksize must be at least 1")
+    if args.plate and args.data_cache:
+        parser.error("--data-cache is not available with --plate")
+
+    files = find_files(args.directory, args.pattern)
+    if not files:
+        parser.error(f"no files matching {args.pattern!r} in {args.directory}")
+
+    output_format = args.format
+    if output_format is None:
+        output_format = "jsonl" if args.output and args.output.endswith((".jsonl", ".json")) else "csv"
+
+    if args.output:
+        with open(args.output, "w", newline="") as out:
+            failures = run_batch(files, out, output_format, args.workers, args.chunksize, args.cache_dir,
+                                 args.data_cache, args.plate)
+    else:
+        failures = run_batch(files, sys.stdout, output_format, args.workers, args.chunksize, args.cache_dir,
+                             args.data_cache, args.plate)
+
+    if args.plate:
+        print(f"Fitted {len(files)} plates, {failures} wells failed.", file=sys.stderr)
+    else:
+        print(f"Fitted {len(files) - failures}/{len(files)} files.", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
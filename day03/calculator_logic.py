@@ -1,8 +1,10 @@
 import math
-from typing import List, Tuple
-# Import the required function from SciPy for linear regression
-from scipy.stats import linregress
+from collections import deque
+from typing import List, Optional, Tuple
 import numpy as np
+from robust_fit import ransac, theil_sen
+# SciPy is only needed for p-values and is imported lazily in growth_rate_fit_stats,
+# so importing this module stays fast for command-line pipelines.
 
 def growth_rate(N_t: float, N_0: float, t: float) -> float:
     """
@@ -34,53 +36,848 @@ def growth_rate(N_t: float, N_0: float, t: float) -> float:
     
     return k
 
-def growth_rate_fit(time_points: List[float], concentration_points: List[float]) -> Tuple[float, float]:
+def growth_rate_batch(N_t, N_0, t) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Calculates the Specific Growth Rate (k) by performing linear regression on
-    multiple time and concentration points using SciPy.
-    
-    The fit is performed on log2(N) vs Time (t), where k is the slope.
-    
+    Vectorized version of `growth_rate` for whole plates / many time pairs.
+
+    The three inputs are broadcast against each other (scalars, lists or NumPy
+    arrays) and k is computed for every element in one NumPy pass.
+    Instead of raising on the first bad value, invalid elements are reported
+    in a boolean mask so one bad well does not abort the whole batch.
+
+    Formula: k = (log2(N_t) - log2(N_0)) / t
+
+    Args:
+        N_t (array-like): Population densities at finite time (t).
+        N_0 (array-like): Population densities at initial time (t=0).
+        t (array-like): Time intervals.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (k array, validity mask). Where the mask is
+        False (any parameter zero, negative or NaN), k is NaN.
+    """
+    # 1. Broadcast all inputs to a common float shape
+    N_t, N_0, t = np.broadcast_arrays(
+        np.asarray(N_t, dtype=float),
+        np.asarray(N_0, dtype=float),
+        np.asarray(t, dtype=float),
+    )
+
+    # 2. Same rule as growth_rate: all parameters must be positive (NaN fails too)
+    valid = (t > 0) & (N_t > 0) & (N_0 > 0)
+
+    # 3. Compute k everywhere in place (log2(N_t / N_0) costs one log per element
+    #    instead of two), silencing warnings from the invalid elements
+    k = np.empty(valid.shape)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        np.divide(N_t, N_0, out=k)
+        np.log2(k, out=k)
+        k /= t
+    k[~valid] = np.nan
+
+    return k, valid
+
+def _linregress(x, y) -> Tuple[float, float, float]:
+    """
+    NumPy-only closed form of `scipy.stats.linregress` (same formulas, same numbers).
+
+    Returns:
+        Tuple[float, float, float]: (slope, intercept, Pearson correlation coefficient r).
+
+    Raises:
+        ValueError: If all x values are identical (as scipy.stats.linregress does).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    xmean = np.mean(x)
+    ymean = np.mean(y)
+
+    # Average sums of square differences from the mean
+    ssxm, ssxym, _, ssym = np.cov(x, y, bias=1).flat
+    if ssxm == 0.0:
+        raise ValueError("Cannot calculate a linear regression if all x values are identical")
+
+    if ssym == 0.0:
+        r = np.nan if ssxym == 0 else 0.0
+    else:
+        # Clip numerical error so that -1 <= r <= 1
+        r = min(max(ssxym / np.sqrt(ssxm * ssym), -1.0), 1.0)
+
+    slope = ssxym / ssxm
+    intercept = ymean - slope * xmean
+    return slope, intercept, r
+
+FIT_METHODS = ("ols", "theil-sen", "ransac")
+
+class GrowthFit:
+    """
+    Full result of a log-linear growth fit: log2(N) = intercept + k * t.
+
+    Attributes:
+        k (float): Specific growth rate (slope, generations/time).
+        intercept (float): log2(N) of the fitted line at t = 0.
+        r_squared (float): R-squared of the fit.
+        n_points (int): Number of data points.
+        method (str): Fit method ("ols", "theil-sen" or "ransac").
+    """
+
+    __slots__ = ("k", "intercept", "r_squared", "n_points", "method")
+
+    def __init__(self, k: float, intercept: float, r_squared: float, n_points: int, method: str = "ols"):
+        self.k = float(k)
+        self.intercept = float(intercept)
+        self.r_squared = float(r_squared)
+        self.n_points = int(n_points)
+        self.method = method
+
+    def line(self, t):
+        """log2(N) of the fitted line at the given time(s)."""
+        return self.intercept + self.k * np.asarray(t, dtype=float)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, GrowthFit) and all(getattr(self, a) == getattr(other, a) for a in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (f"GrowthFit(k={self.k!r}, intercept={self.intercept!r}, r_squared={self.r_squared!r}, "
+                f"n_points={self.n_points}, method={self.method!r})")
+
+def growth_rate_fit_result(time_points: List[float], concentration_points: List[float],
+                           method: str = "ols") -> GrowthFit:
+    """
+    Same fit as `growth_rate_fit`, returning the full `GrowthFit` (including the
+    intercept needed to draw the fitted line) instead of only (k, R-squared).
+
     Args:
         time_points (List[float]): List of time measurements.
         concentration_points (List[float]): List of concentration (N) measurements.
-    
+        method (str): "ols", "theil-sen" or "ransac" (see `growth_rate_fit`).
+
     Returns:
-        Tuple[float, float]: (Specific Growth Rate (k), R-squared value of the fit).
-        
+        GrowthFit: k, intercept, R-squared, number of points and method.
+
     Raises:
-        ValueError: If input lists are invalid (length, non-positive values).
+        ValueError: If input lists are invalid (length, non-positive values) or the
+            method is unknown.
     """
-    
     # 1. Validation checks
+    if method not in FIT_METHODS:
+        raise ValueError(f"Method must be one of {', '.join(FIT_METHODS)}.")
+
     if len(time_points) != len(concentration_points):
         raise ValueError("Time and concentration lists must have the same length.")
     
     if len(time_points) < 2:
         raise ValueError("At least two data points are required for linear regression.")
 
-    if any(c <= 0 for c in concentration_points):
+    concentrations = np.asarray(concentration_points, dtype=float)
+    if not np.all(concentrations > 0):
         raise ValueError("All concentration points must be positive (>0) for log transformation.")
         
     # 2. Transform concentration data: log2(N)
-    log2_concentrations = np.log2(concentration_points)
+    log2_concentrations = np.log2(concentrations)
+    n = log2_concentrations.size
     
     # --- FIX: Handle the case where all log2_concentrations are identical (zero variance) ---
     if np.all(log2_concentrations == log2_concentrations[0]):
         # If the data is constant, the slope (k) is 0 and the fit is perfect (R^2 = 1.0)
-        # This prevents division by zero in linregress that yields NaN for R-value.
-        return 0.0, 1.0
+        # This prevents division by zero in the regression that yields NaN for R-value.
+        return GrowthFit(0.0, log2_concentrations[0], 1.0, n, method)
     # ---------------------------------------------------------------------------------------
 
-    # 3. Perform Linear Regression (SciPy)
+    if method != "ols":
+        k, intercept, r_squared = _robust_fit(np.asarray(time_points, dtype=float), log2_concentrations, method)
+        return GrowthFit(k, intercept, r_squared, n, method)
+
+    # 3. Perform Linear Regression (NumPy closed form, identical to scipy.stats.linregress)
     # The slope of log2(N) vs t is the growth rate (k)
     # r_value is the Pearson correlation coefficient
-    slope, intercept, r_value, p_value, std_err = linregress(time_points, log2_concentrations)
-    
-    # The growth rate k is the slope
-    k = slope
+    slope, intercept, r_value = _linregress(time_points, log2_concentrations)
     
     # R-squared is the square of the Pearson correlation coefficient
-    r_squared = r_value**2
+    return GrowthFit(slope, intercept, r_value**2, n, method)
+
+def growth_rate_fit(time_points: List[float], concentration_points: List[float],
+                    method: str = "ols") -> Tuple[float, float]:
+    """
+    Calculates the Specific Growth Rate (k) by performing linear regression on
+    multiple time and concentration points.
+    
+    The fit is performed on log2(N) vs Time (t), where k is the slope.
+    Use `growth_rate_fit_result` to also get the intercept.
+    
+    Args:
+        time_points (List[float]): List of time measurements.
+        concentration_points (List[float]): List of concentration (N) measurements.
+        method (str): "ols" (ordinary least squares, default), "theil-sen"
+            (median of pairwise slopes, robust to ~29% outliers such as bubbles
+            or condensation) or "ransac" (fallback for heavier contamination:
+            least squares on the consensus inliers). For the robust methods,
+            R-squared is 1 - SS_res / SS_tot of the robust line over the points
+            it uses (all points for Theil-Sen, the inliers for RANSAC).
     
-    return k, r_squared
\ No newline at end of file
+    Returns:
+        Tuple[float, float]: (Specific Growth Rate (k), R-squared value of the fit).
+        
+    Raises:
+        ValueError: If input lists are invalid (length, non-positive values) or the
+            method is unknown.
+    """
+    fit = growth_rate_fit_result(time_points, concentration_points, method)
+    return fit.k, fit.r_squared
+
+def _robust_fit(t: np.ndarray, y: np.ndarray, method: str) -> Tuple[float, float, float]:
+    """Theil-Sen or RANSAC line of log2(N) vs t: (k, intercept, R-squared over the points used)."""
+    if method == "theil-sen":
+        k, intercept = theil_sen(t, y)
+        used = np.ones(t.size, dtype=bool)
+    else:
+        k, intercept, used = ransac(t, y)
+
+    residuals = y[used] - (intercept + k * t[used])
+    ss_tot = np.sum((y[used] - y[used].mean()) ** 2)
+    r_squared = 1.0 if ss_tot == 0 else max(0.0, 1.0 - np.sum(residuals ** 2) / ss_tot)
+    return k, intercept, r_squared
+
+def growth_rate_fit_stats(time_points: List[float], concentration_points: List[float]) -> dict:
+    """
+    Same fit as `growth_rate_fit`, with the extra statistics of `scipy.stats.linregress`.
+
+    SciPy is imported on first use here (only the p-value needs it).
+
+    Args:
+        time_points (List[float]): List of time measurements.
+        concentration_points (List[float]): List of concentration (N) measurements.
+
+    Returns:
+        dict: With keys k, intercept, r_squared, p_value (two-sided test of k = 0),
+        stderr (of k) and intercept_stderr.
+
+    Raises:
+        ValueError: If input lists are invalid (length, non-positive values).
+    """
+    k, r_squared = growth_rate_fit(time_points, concentration_points)
+    t = np.asarray(time_points, dtype=float)
+    y = np.log2(concentration_points)
+    n = t.size
+
+    if np.all(y == y[0]):
+        # Zero-variance data: a perfect, flat fit
+        return {"k": 0.0, "intercept": float(y[0]), "r_squared": 1.0,
+                "p_value": 1.0, "stderr": 0.0, "intercept_stderr": 0.0}
+
+    slope, intercept, r = _linregress(t, y)
+    if n == 2:
+        p_value, stderr, intercept_stderr = 0.0, 0.0, 0.0
+    else:
+        from scipy import stats  # Lazy import: SciPy is slow to load
+
+        df = n - 2
+        ssxm, _, _, ssym = np.cov(t, y, bias=1).flat
+        tiny = 1.0e-20
+        t_stat = r * np.sqrt(df / ((1.0 - r + tiny) * (1.0 + r + tiny)))
+        p_value = 2 * stats.t.sf(abs(t_stat), df)
+        stderr = np.sqrt((1 - r ** 2) * ssym / ssxm / df)
+        intercept_stderr = stderr * np.sqrt(ssxm + np.mean(t) ** 2)
+
+    return {
+        "k": float(slope),
+        "intercept": float(intercept),
+        "r_squared": float(r_squared),
+        "p_value": float(p_value),
+        "stderr": float(stderr),
+        "intercept_stderr": float(intercept_stderr),
+    }
+
+def growth_rate_fit_batch(time_points, concentration_matrix) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fits many growth curves at once (e.g. every well of a plate) with one
+    closed-form least-squares pass over log2(N) vs Time (t).
+
+    This gives the same k and R-squared as calling `growth_rate_fit` per row,
+    but without the per-curve SciPy call and list-to-array conversion.
+
+    Args:
+        time_points (array-like): Either a shared 1-D time axis of length T,
+            or a 2-D (curves x T) array with a time axis per curve.
+        concentration_matrix (array-like): 2-D (curves x T) concentrations (N).
+            NaN marks a missing sample; non-positive values are also treated as
+            missing because they cannot be log-transformed.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (k, intercept, R-squared) arrays,
+        one value per curve. Curves with fewer than two usable points, or whose
+        usable points all share the same time, get NaN.
+
+    Raises:
+        ValueError: If the time axis does not match the concentration matrix.
+    """
+    # 1. Validation checks
+    concentrations = np.asarray(concentration_matrix, dtype=float)
+    if concentrations.ndim != 2:
+        raise ValueError("Concentration matrix must be 2-D (curves x time points).")
+
+    times = np.asarray(time_points, dtype=float)
+    if times.ndim == 1:
+        times = times[np.newaxis, :]
+    if times.ndim != 2 or times.shape[-1] != concentrations.shape[1] or times.shape[0] not in (1, concentrations.shape[0]):
+        raise ValueError("Time axis must have one entry per time point (shared 1-D or per-curve 2-D).")
+    times = np.broadcast_to(times, concentrations.shape)
+
+    # 2. Mask missing samples and transform concentration data: log2(N)
+    usable = ~np.isnan(times) & ~np.isnan(concentrations) & (concentrations > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log2_concentrations = np.where(usable, np.log2(np.where(usable, concentrations, 1.0)), 0.0)
+    times = np.where(usable, times, 0.0)
+    n = usable.sum(axis=1)
+
+    # 3. Centered sums of squares per row (numerically stable closed form)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_t = times.sum(axis=1) / n
+        mean_y = log2_concentrations.sum(axis=1) / n
+        dt = np.where(usable, times - mean_t[:, np.newaxis], 0.0)
+        dy = np.where(usable, log2_concentrations - mean_y[:, np.newaxis], 0.0)
+        s_tt = np.einsum('ij,ij->i', dt, dt)
+        s_ty = np.einsum('ij,ij->i', dt, dy)
+        s_yy = np.einsum('ij,ij->i', dy, dy)
+
+        k = s_ty / s_tt
+        r_squared = s_ty ** 2 / (s_tt * s_yy)
+
+    # 4. Zero-variance shortcut per row: constant data means k = 0 and R^2 = 1.0
+    #    (matching growth_rate_fit). Rows with too few points or no time spread fail.
+    y_min = np.where(usable, log2_concentrations, np.inf).min(axis=1)
+    y_max = np.where(usable, log2_concentrations, -np.inf).max(axis=1)
+    constant = (n >= 2) & (y_min == y_max)
+    k = np.where(constant, 0.0, k)
+    r_squared = np.where(constant, 1.0, r_squared)
+
+    fittable = (n >= 2) & ((s_tt > 0) | constant)
+    k = np.where(fittable, k, np.nan)
+    r_squared = np.where(fittable, r_squared, np.nan)
+    intercept = mean_y - k * mean_t
+
+    return k, intercept, r_squared
+
+def _bootstrap_slopes(t: np.ndarray, y: np.ndarray, n_resamples: int, method: str,
+                      seed) -> np.ndarray:
+    """
+    Draws all bootstrap resamples of one curve as a single (n_resamples x n) index
+    matrix and solves every resampled regression in one batched closed-form pass.
+    """
+    rng = np.random.default_rng(seed)
+    n = t.size
+    idx = rng.integers(0, n, size=(n_resamples, n))
+
+    if method == "pairs":
+        # Resample (t, log2(N)) pairs together
+        t_star = t[idx]
+        y_star = y[idx]
+        dt = t_star - t_star.mean(axis=1, keepdims=True)
+        dy = y_star - y_star.mean(axis=1, keepdims=True)
+        s_tt = np.einsum('ij,ij->i', dt, dt)
+        s_ty = np.einsum('ij,ij->i', dt, dy)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Resamples that drew a single time point have no slope (NaN)
+            return np.where(s_tt > 0, s_ty / s_tt, np.nan)
+
+    # Residual resampling: the design (t) stays fixed, so every slope is one
+    # matrix-vector product with the centered time axis.
+    dt = t - t.mean()
+    s_tt = dt @ dt
+    slope = (dt @ (y - y.mean())) / s_tt
+    fitted = y.mean() + slope * dt
+    residuals = y - fitted
+    y_star = fitted + residuals[idx]
+    return (y_star @ dt) / s_tt
+
+def _bootstrap_curve(args) -> Tuple[float, float]:
+    """Worker for one curve: returns the (lower, upper) percentile interval of k."""
+    t, y, n_resamples, method, confidence, seed = args
+    slopes = _bootstrap_slopes(t, y, n_resamples, method, seed)
+    alpha = (1.0 - confidence) / 2.0
+    lower, upper = np.nanquantile(slopes, [alpha, 1.0 - alpha])
+    return float(lower), float(upper)
+
+def growth_rate_bootstrap_ci(time_points, concentration_points, n_resamples: int = 10000,
+                             confidence: float = 0.95, method: str = "pairs",
+                             seed: Optional[int] = None, workers: Optional[int] = None) -> dict:
+    """
+    Bootstrap confidence interval for the Specific Growth Rate (k) of `growth_rate_fit`.
+
+    All resamples of a curve are drawn as one index matrix and solved in a single
+    batched regression (no Python loop over resamples), so 10,000 resamples of a
+    50-point curve take milliseconds.
+
+    Args:
+        time_points (List[float]): List of time measurements.
+        concentration_points (array-like): Concentrations (N), 1-D for a single curve
+            or 2-D (curves x time points) sharing `time_points`.
+        n_resamples (int): Number of bootstrap resamples (B).
+        confidence (float): Confidence level of the interval, e.g. 0.95.
+        method (str): "pairs" resamples (t, N) points; "residual" keeps the time
+            points and resamples the residuals of the log2 fit.
+        seed (Optional[int]): Seed for reproducible intervals.
+        workers (Optional[int]): If set (> 1), curves are spread over a process pool
+            of this size. Useful for very large B x curves workloads.
+
+    Returns:
+        dict: With keys k (point estimate from growth_rate_fit), lower and upper.
+        Values are floats for a single curve and arrays for 2-D input.
+
+    Raises:
+        ValueError: If inputs are invalid (length, non-positive values, options).
+    """
+    # 1. Validation checks
+    t = np.asarray(time_points, dtype=float)
+    conc = np.asarray(concentration_points, dtype=float)
+    single_curve = conc.ndim == 1
+    conc = np.atleast_2d(conc)
+    if t.ndim != 1 or conc.ndim != 2 or conc.shape[1] != t.size:
+        raise ValueError("Time and concentration lists must have the same length.")
+    if t.size < 3:
+        raise ValueError("At least three data points are required for bootstrap confidence intervals.")
+    if not np.all(conc > 0):
+        raise ValueError("All concentration points must be positive (>0) for log transformation.")
+    if method not in ("pairs", "residual"):
+        raise ValueError("Method must be 'pairs' or 'residual'.")
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence must be between 0 and 1.")
+    if n_resamples < 1:
+        raise ValueError("At least one bootstrap resample is required.")
+
+    # 2. Point estimates and one independent random stream per curve
+    log2_concentrations = np.log2(conc)
+    k = np.array([growth_rate_fit(t, row)[0] for row in conc])
+    seeds = np.random.SeedSequence(seed).spawn(conc.shape[0])
+    tasks = [(t, y, n_resamples, method, confidence, s) for y, s in zip(log2_concentrations, seeds)]
+
+    # 3. Batched bootstrap per curve, optionally across a process pool
+    if workers is not None and workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            intervals = list(pool.map(_bootstrap_curve, tasks))
+    else:
+        intervals = [_bootstrap_curve(task) for task in tasks]
+
+    lower, upper = np.array(intervals).T
+    if single_curve:
+        return {"k": float(k[0]), "lower": float(lower[0]), "upper": float(upper[0])}
+    return {"k": k, "lower": lower, "upper": upper}
+
+def max_growth_rate(times, concentrations, window: int) -> dict:
+    """
+    Finds the exponential phase of a growth curve: the run of `window`
+    consecutive points with the highest fitted growth rate (k).
+
+    Real curves have lag and stationary phases, so fitting all points with
+    `growth_rate_fit` understates k. Every window is scored from cumulative sums
+    of (t, log2(N)), so the whole scan is O(n) instead of one regression per window.
+
+    Args:
+        times (array-like): Time measurements, either shared 1-D (length T) or
+            2-D (curves x T).
+        concentrations (array-like): Concentrations (N), 1-D for a single curve
+            or 2-D (curves x T) to scan many curves in one batch.
+        window (int): Number of consecutive points per window (>= 2).
+
+    Returns:
+        dict: For the best window, with keys
+            - start (int): index of the first point of the window (in time order)
+            - stop (int): index one past the last point of the window
+            - k (float): Specific Growth Rate of the window
+            - intercept (float): intercept of log2(N) = intercept + k * t
+            - r_squared (float): R-squared value of the window fit
+            - lag_time (float): time where the fitted line crosses the initial
+              log2(N) level (NaN if k <= 0)
+        For 2-D input every value is an array with one entry per curve.
+
+    Raises:
+        ValueError: If inputs are invalid (shapes, window size, non-positive values).
+    """
+    # 1. Validation checks
+    conc = np.asarray(concentrations, dtype=float)
+    single_curve = conc.ndim == 1
+    conc = np.atleast_2d(conc)
+    t = np.asarray(times, dtype=float)
+    if t.ndim == 1:
+        t = t[np.newaxis, :]
+    if conc.ndim != 2 or t.ndim != 2 or t.shape[1] != conc.shape[1] or t.shape[0] not in (1, conc.shape[0]):
+        raise ValueError("Time and concentration lists must have the same length.")
+    if window < 2:
+        raise ValueError("Window must hold at least two data points.")
+    if conc.shape[1] < window:
+        raise ValueError("Window is longer than the number of data points.")
+    if not np.all(conc > 0):
+        raise ValueError("All concentration points must be positive (>0) for log transformation.")
+    t = np.broadcast_to(t, conc.shape)
+
+    # 2. Sort each curve by time and transform concentration data: log2(N)
+    order = np.argsort(t, axis=1, kind='stable')
+    t = np.take_along_axis(t, order, axis=1)
+    y = np.take_along_axis(np.log2(conc), order, axis=1)
+
+    # 3. Windowed sums from cumulative sums. Data is centered per curve first so
+    #    the raw sums of squares do not lose precision to cancellation.
+    t_mean = t.mean(axis=1, keepdims=True)
+    y_mean = y.mean(axis=1, keepdims=True)
+    tc = t - t_mean
+    yc = y - y_mean
+
+    def window_sums(a):
+        c = np.zeros((a.shape[0], a.shape[1] + 1))
+        np.cumsum(a, axis=1, out=c[:, 1:])
+        return c[:, window:] - c[:, :-window]
+
+    sum_t = window_sums(tc)
+    sum_y = window_sums(yc)
+    s_tt = window_sums(tc * tc) - sum_t ** 2 / window
+    s_ty = window_sums(tc * yc) - sum_t * sum_y / window
+    s_yy = window_sums(yc * yc) - sum_y ** 2 / window
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = np.where(s_tt > 0, s_ty / s_tt, np.nan)
+        r_squared = s_ty ** 2 / (s_tt * s_yy)
+
+    # Zero-variance windows (constant log2(N)): k = 0 and R^2 = 1.0, as in growth_rate_fit.
+    # The tolerance absorbs rounding left over from the cumulative-sum differences.
+    scale = window_sums(yc * yc) + sum_y ** 2 / window + window
+    constant = s_yy <= 1e-12 * scale
+    k = np.where(constant, 0.0, k)
+    r_squared = np.clip(np.where(constant, 1.0, r_squared), 0.0, 1.0)
+
+    # 4. Pick the best window per curve and derive intercept and lag time
+    rows = np.arange(conc.shape[0])
+    best = np.argmax(np.where(np.isnan(k), -np.inf, k), axis=1)
+    best_k = k[rows, best]
+    intercept = (sum_y[rows, best] / window + y_mean[:, 0]) - best_k * (sum_t[rows, best] / window + t_mean[:, 0])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lag_time = np.where(best_k > 0, (y[:, 0] - intercept) / best_k, np.nan)
+
+    result = {
+        "start": best,
+        "stop": best + window,
+        "k": best_k,
+        "intercept": intercept,
+        "r_squared": r_squared[rows, best],
+        "lag_time": lag_time,
+    }
+    if single_curve:
+        result = {key: value[0].item() for key, value in result.items()}
+    return result
+
+def _segment_sums(t: np.ndarray, y: np.ndarray):
+    """Prefix sums of centered (t, y) used to fit any segment [a, b) in O(1)."""
+    tc = t - t.mean()
+    yc = y - y.mean()
+    prefix = np.zeros((5, t.size + 1))
+    for row, values in enumerate((tc, yc, tc * tc, tc * yc, yc * yc)):
+        np.cumsum(values, out=prefix[row, 1:])
+    return prefix, t.mean(), y.mean()
+
+def _segment_fit(prefix: np.ndarray, a, b):
+    """Least-squares line of log2(N) vs t on segments [a, b): (k, centered intercept, R^2, RSS)."""
+    a, b = np.broadcast_arrays(a, b)
+    n = b - a
+    sum_t, sum_y, sum_tt, sum_ty, sum_yy = prefix[:, b] - prefix[:, a]
+    s_tt = sum_tt - sum_t ** 2 / n
+    s_ty = sum_ty - sum_t * sum_y / n
+    s_yy = np.maximum(sum_yy - sum_y ** 2 / n, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = np.where(s_tt > 0, s_ty / s_tt, 0.0)
+        rss = np.maximum(s_yy - k * s_ty, 0.0)
+        r_squared = np.where(s_yy > 0, 1.0 - rss / s_yy, 1.0)
+    intercept = (sum_y - k * sum_t) / n
+    return k, intercept, r_squared, rss
+
+def segment_growth_phases(times, concentrations, penalty: Optional[float] = None,
+                          min_size: int = 3, max_candidates: int = 2000) -> dict:
+    """
+    Splits a growth curve into phases (e.g. lag / exponential / stationary) by a
+    piecewise-linear fit of log2(N) vs Time (t), and reports lag time, the
+    maximum growth rate (mu_max) and the carrying capacity.
+
+    Changepoints are found with PELT (Pruned Exact Linear Time): an exact optimal
+    partitioning that minimizes the total residual sum of squares plus `penalty`
+    per segment, pruning candidates that can never be optimal again. Each segment
+    is fitted in O(1) from prefix sums. Because growth curves have very few phases,
+    pruning alone cannot keep the candidate set small, so for curves longer than
+    `max_candidates` the search runs on an evenly spaced grid of candidate
+    boundaries and every boundary found is then refined at full resolution.
+
+    Args:
+        times (List[float]): List of time measurements.
+        concentrations (List[float]): List of concentration (N) measurements.
+        penalty (Optional[float]): Cost of adding a segment. Defaults to
+            6 * sigma^2 * ln(n), with the noise level sigma estimated from the data.
+        min_size (int): Minimum number of points per segment (>= 2).
+        max_candidates (int): Maximum number of candidate boundaries for the exact search.
+
+    Returns:
+        dict: With keys
+            - segments (list of dict): per phase, start/stop indices (in time order),
+              t_start, t_end, k, intercept and r_squared
+            - mu_max (float): highest segment growth rate (exponential phase k)
+            - lag_time (float): time where the exponential-phase line crosses the
+              initial log2(N) level (NaN if mu_max <= 0)
+            - carrying_capacity (float): highest fitted concentration (N) of the curve
+
+    Raises:
+        ValueError: If inputs are invalid (length, non-positive values, min_size).
+    """
+    # 1. Validation checks
+    t = np.asarray(times, dtype=float)
+    conc = np.asarray(concentrations, dtype=float)
+    if t.ndim != 1 or t.shape != conc.shape:
+        raise ValueError("Time and concentration lists must have the same length.")
+    if min_size < 2:
+        raise ValueError("Segments must hold at least two data points (min_size >= 2).")
+    if t.size < min_size:
+        raise ValueError("Not enough data points for a single segment.")
+    if not np.all(conc > 0):
+        raise ValueError("All concentration points must be positive (>0) for log transformation.")
+
+    # 2. Sort by time and transform concentration data: log2(N)
+    order = np.argsort(t, kind='stable')
+    t = t[order]
+    y = np.log2(conc[order])
+    n = t.size
+    prefix, t_mean, y_mean = _segment_sums(t, y)
+
+    if penalty is None:
+        # Noise level from second differences (robust MAD estimate), BIC-style penalty
+        # for the three parameters (slope, intercept, boundary) of every extra segment
+        second_diff = np.diff(y, 2)
+        sigma = 1.4826 * np.median(np.abs(second_diff - np.median(second_diff))) / np.sqrt(6) if n > 2 else 0.0
+        penalty = 6.0 * max(sigma ** 2, 1e-12) * np.log(n)
+
+    # 3. PELT over the candidate boundaries
+    step = max(1, int(np.ceil(n / max_candidates)))
+    grid = np.unique(np.concatenate([np.arange(0, n, step), [n]]))
+    best_cost = np.full(grid.size, np.inf)
+    best_cost[0] = -penalty
+    previous = np.zeros(grid.size, dtype=int)
+    candidates = np.array([0])
+    for j in range(1, grid.size):
+        end = grid[j]
+        long_enough = end - grid[candidates] >= min_size
+        usable = candidates[long_enough]
+        if usable.size:
+            rss = _segment_fit(prefix, grid[usable], end)[3]
+            total = best_cost[usable] + rss
+            i = np.argmin(total)
+            best_cost[j] = total[i] + penalty
+            previous[j] = usable[i]
+            # Pruning: a start that is already worse than the optimum can never win later
+            keep = np.ones(candidates.size, dtype=bool)
+            keep[long_enough] = total <= best_cost[j]
+            candidates = candidates[keep]
+        candidates = np.append(candidates, j)
+
+    boundaries = [n]
+    j = grid.size - 1
+    while j > 0:
+        j = previous[j]
+        boundaries.append(grid[j])
+    boundaries = boundaries[::-1]
+
+    # 4. Refine each boundary at full resolution between its (fixed) neighbours
+    if step > 1:
+        for i in range(1, len(boundaries) - 1):
+            left, right = boundaries[i - 1], boundaries[i + 1]
+            positions = np.arange(max(left + min_size, boundaries[i] - step),
+                                  min(right - min_size, boundaries[i] + step) + 1)
+            if positions.size:
+                cost = _segment_fit(prefix, left, positions)[3] + _segment_fit(prefix, positions, right)[3]
+                boundaries[i] = int(positions[np.argmin(cost)])
+
+    # 5. Describe every phase and derive lag, mu_max and carrying capacity
+    starts = np.array(boundaries[:-1])
+    stops = np.array(boundaries[1:])
+    k, intercept_c, r_squared, _ = _segment_fit(prefix, starts, stops)
+    intercept = intercept_c + y_mean - k * t_mean
+    segments = [
+        {
+            "start": int(a),
+            "stop": int(b),
+            "t_start": float(t[a]),
+            "t_end": float(t[b - 1]),
+            "k": float(k_i),
+            "intercept": float(b_i),
+            "r_squared": float(r2_i),
+        }
+        for a, b, k_i, b_i, r2_i in zip(starts, stops, k, intercept, r_squared)
+    ]
+
+    exp_phase = int(np.argmax(k))
+    mu_max = float(k[exp_phase])
+    lag_time = (y[0] - intercept[exp_phase]) / mu_max if mu_max > 0 else float('nan')
+    fitted_ends = np.concatenate([intercept + k * t[starts], intercept + k * t[stops - 1]])
+
+    return {
+        "segments": segments,
+        "mu_max": mu_max,
+        "lag_time": float(lag_time),
+        "carrying_capacity": float(2 ** fitted_ends.max()),
+    }
+
+class GrowthRateAccumulator:
+    """
+    Incremental version of `growth_rate_fit` for live feeds (e.g. a bioreactor
+    pushing an OD reading every few seconds).
+
+    Keeps running means and co-moments of (t, log2(N)) using Welford-style
+    updates, so adding a point and reading k / R-squared are O(1) no matter how
+    long the run gets. With `window` set, only the most recent `window` points
+    are kept and the oldest point is evicted (downdated) on every new reading.
+
+    Args:
+        window (Optional[int]): Maximum number of points to keep. None keeps all.
+
+    Raises:
+        ValueError: If window is smaller than 2.
+    """
+
+    def __init__(self, window: Optional[int] = None):
+        if window is not None and window < 2:
+            raise ValueError("Window must hold at least two data points.")
+        self.window = window
+        self._points = deque() if window is not None else None
+        self.reset()
+
+    def reset(self) -> None:
+        """Forgets all points."""
+        self.n = 0
+        self._mean_t = 0.0
+        self._mean_y = 0.0
+        self._s_tt = 0.0
+        self._s_yy = 0.0
+        self._s_ty = 0.0
+        if self._points is not None:
+            self._points.clear()
+
+    def add(self, t: float, N: float) -> None:
+        """
+        Adds one (time, concentration) reading.
+
+        Raises:
+            ValueError: If the concentration is not positive (>0).
+        """
+        if N <= 0:
+            raise ValueError("All concentration points must be positive (>0) for log transformation.")
+        y = math.log2(N)
+
+        if self._points is not None:
+            if len(self._points) == self.window:
+                self._downdate(*self._points.popleft())
+            self._points.append((t, y))
+
+        # Welford update of the means and centered co-moments
+        self.n += 1
+        dt = t - self._mean_t
+        dy = y - self._mean_y
+        self._mean_t += dt / self.n
+        self._mean_y += dy / self.n
+        self._s_tt += dt * (t - self._mean_t)
+        self._s_yy += dy * (y - self._mean_y)
+        self._s_ty += dt * (y - self._mean_y)
+
+    def recompute(self, times, concentrations) -> None:
+        """
+        Rebuilds the statistics exactly (two-pass, vectorized) from the full data,
+        discarding the rounding error that many add/remove updates accumulate.
+        With `window` set, only the last `window` points are kept.
+
+        Raises:
+            ValueError: If the lists differ in length or a concentration is not positive.
+        """
+        t = np.asarray(times, dtype=float).ravel()
+        concentrations = np.asarray(concentrations, dtype=float).ravel()
+        if t.size != concentrations.size:
+            raise ValueError("Time and concentration lists must have the same length.")
+        if not np.all(concentrations > 0):
+            raise ValueError("All concentration points must be positive (>0) for log transformation.")
+        if self.window is not None:
+            t, concentrations = t[-self.window:], concentrations[-self.window:]
+        y = np.log2(concentrations)
+
+        self.reset()
+        if self._points is not None:
+            self._points.extend(zip(t.tolist(), y.tolist()))
+        if t.size == 0:
+            return
+        self.n = int(t.size)
+        self._mean_t = float(t.mean())
+        self._mean_y = float(y.mean())
+        dt = t - self._mean_t
+        dy = y - self._mean_y
+        self._s_tt = float(dt @ dt)
+        self._s_yy = float(dy @ dy)
+        self._s_ty = float(dt @ dy)
+
+    def remove(self, t: float, N: float) -> None:
+        """
+        Removes one previously added (time, concentration) reading.
+
+        Raises:
+            ValueError: If there are no points, the concentration is not positive,
+                or (with `window` set) the point is not in the window.
+        """
+        if self.n == 0:
+            raise ValueError("No data points to remove.")
+        if N <= 0:
+            raise ValueError("All concentration points must be positive (>0) for log transformation.")
+        y = math.log2(N)
+        if self._points is not None:
+            # Taken out of the window too, so it is not evicted (downdated) a second time later
+            try:
+                self._points.remove((t, y))
+            except ValueError:
+                raise ValueError("Data point is not in the current window.")
+        self._downdate(t, y)
+
+    def _downdate(self, t: float, y: float) -> None:
+        """Reverses a Welford update for an already log-transformed point."""
+        if self.n == 1:
+            self.n = 0
+            self._mean_t = self._mean_y = 0.0
+            self._s_tt = self._s_yy = self._s_ty = 0.0
+            return
+        self.n -= 1
+        dt = t - self._mean_t
+        dy = y - self._mean_y
+        self._mean_t -= dt / self.n
+        self._mean_y -= dy / self.n
+        # Clamp tiny negative values left over from floating-point cancellation
+        self._s_tt = max(self._s_tt - dt * (t - self._mean_t), 0.0)
+        self._s_yy = max(self._s_yy - dy * (y - self._mean_y), 0.0)
+        self._s_ty -= dt * (y - self._mean_y)
+
+    def result(self) -> Tuple[float, float]:
+        """
+        Returns the current fit with the same semantics as `growth_rate_fit`.
+
+        Returns:
+            Tuple[float, float]: (Specific Growth Rate (k), R-squared value of the fit).
+
+        Raises:
+            ValueError: If fewer than two points are held.
+        """
+        if self.n < 2:
+            raise ValueError("At least two data points are required for linear regression.")
+
+        # Zero variance in log2(N): slope 0 and a perfect fit, as in growth_rate_fit
+        if self._s_yy == 0.0:
+            return 0.0, 1.0
+        if self._s_tt == 0.0:
+            raise ValueError("Time points must not all be identical.")
+
+        k = self._s_ty / self._s_tt
+        r_squared = self._s_ty ** 2 / (self._s_tt * self._s_yy)
+        return k, r_squared
+
+    @property
+    def intercept(self) -> float:
+        """Intercept of the fitted line log2(N) = intercept + k * t."""
+        k, _ = self.result()
+        return self._mean_y - k * self._mean_t
+
@@ -0,0 +1,493 @@
+"""data_loader.py
+
+Shared loader for two-column growth data files (Time, Concentration), used by
+the GUI and the command-line tools.
+
+The file is parsed in large blocks with NumPy's C parser instead of line by
+line. Bad lines never interrupt the load: they are skipped and collected in a
+single `LoadReport`, so a 10^6-line instrument export with a few broken rows
+produces one summary instead of one message box per line.
+
+File format (same rules as the GUI always used):
+- columns separated by commas, tabs or spaces (extra columns are ignored)
+- empty lines and lines starting with '#' are skipped
+- Time must be >= 0 and Concentration must be > 0
+
+`load_plate_data` reads wide plate-reader exports instead: one row per time
+point, one column per well (A1 ... P24), into a (wells x time) matrix that
+`calculator_logic.growth_rate_fit_batch` fits in a single pass.
+
+`load_growth_data_cached` keeps a binary sidecar of the parsed columns next to
+the source file (`.<name>.growth.npy` plus a small `.json` with the source path,
+size and mtime). Reopening an unchanged file memory-maps the sidecar instead of
+parsing the text again; a changed source is detected and the cache rebuilt.
+"""
+import hashlib
+import io
+import itertools
+import json
+import os
+import re
+import tempfile
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Detailed instructions for the user about the file format
+FILE_FORMAT_INSTRUCTIONS = (
+    "The file must contain two columns: Time (Column 1) and Concentration (Column 2).\n"
+    "Data must be separated by commas, tabs, or spaces.\n"
+    "Time must be >= 0. Concentration must be > 0 (for log calculation).\n"
+    "Example format:\n"
+    "0, 0.1\n"
+    "1.5, 0.25\n"
+)
+
+MISSING_DATA = "Missing data (Time, Concentration)."
+NOT_A_NUMBER = "Data must be valid numbers."
+OUT_OF_RANGE = "Time must be non-negative (>=0) and Concentration must be positive (>0)."
+
+# Commas and tabs become spaces so NumPy can split on whitespace
+_DELIMITERS = bytes.maketrans(b",\t", b"  ")
+
+# Files are parsed in blocks of about this many bytes (bounded memory)
+DEFAULT_BLOCK_BYTES = 64 * 1024 * 1024
+
+# A block that fails the fast parser is split into this many pieces, each parsed
+# fast again, until the failing pieces are small enough for the line-by-line parser
+_SPLIT_PIECES = 8
+_SLOW_PARSE_BYTES = 16 * 1024
+
+# Wide plate-reader files are read this many rows at a time
+DEFAULT_CHUNK_ROWS = 4096
+
+# Column headers that name a well (A1 ... P24, optionally zero-padded: A01)
+WELL_ID_PATTERN = r"^[A-Pa-p](0?[1-9]|1[0-9]|2[0-4])$"
+
+BAD_TIME = "Time must be a valid non-negative number."
+MISSING_WELLS = "Missing or non-numeric well values (read as missing)."
+
+# Bumped whenever the sidecar layout or the parsing rules change
+CACHE_VERSION = 1
+
+
+class LoadReport:
+    """
+    Diagnostics collected while loading one file.
+
+    Attributes:
+        source (str): Path (or description) of the loaded data.
+        n_points (int): Number of valid data points loaded.
+        errors (List[Tuple[int, str]]): (line number, message) for every skipped line.
+    """
+
+    def __init__(self, source: str = ""):
+        self.source = source
+        self.n_points = 0
+        self.errors: List[Tuple[int, str]] = []
+        self.from_cache = False
+
+    @property
+    def ok(self) -> bool:
+        """True if no line had to be skipped."""
+        return not self.errors
+
+    def add(self, line_num: int, message: str) -> None:
+        self.errors.append((line_num, message))
+
+    def summary(self, max_lines: int = 10) -> str:
+        """Human-readable report: counts plus the first `max_lines` diagnostics."""
+        text = f"{self.n_points} data points loaded, {len(self.errors)} lines skipped."
+        if self.errors:
+            shown = [f"Line {line_num}: {message}" for line_num, message in self.errors[:max_lines]]
+            if len(self.errors) > max_lines:
+                shown.append(f"... and {len(self.errors) - max_lines} more.")
+            text += "\n" + "\n".join(shown)
+        return text
+
+    def __repr__(self) -> str:
+        return f"LoadReport(source={self.source!r}, n_points={self.n_points}, errors={len(self.errors)})"
+
+
+def _data_lines(block: bytes, first_line: int):
+    """Yields (line number, fields) for the non-empty, non-comment lines of a block."""
+    for offset, line in enumerate(block.split(b"\n")):
+        line = line.strip()
+        if line and not line.startswith(b"#"):
+            yield first_line + offset, line.split()
+
+
+def _parse_block_slow(block: bytes, first_line: int, report: LoadReport) -> np.ndarray:
+    """Line-by-line fallback for a block with malformed lines; collects every bad line."""
+    rows = []
+    for line_num, fields in _data_lines(block, first_line):
+        if len(fields) < 2:
+            report.add(line_num, MISSING_DATA)
+            continue
+        try:
+            rows.append((line_num, float(fields[0]), float(fields[1])))
+        except ValueError:
+            report.add(line_num, NOT_A_NUMBER)
+    return np.array(rows, dtype=float).reshape(-1, 3)
+
+
+def _split_lines(block: bytes, pieces: int):
+    """Splits a block at line boundaries into about `pieces` parts of similar size."""
+    parts, start = [], 0
+    for i in range(1, pieces):
+        cut = block.find(b"\n", max(start, len(block) * i // pieces)) + 1
+        if cut <= start:
+            break
+        parts.append(block[start:cut])
+        start = cut
+    parts.append(block[start:])
+    return [part for part in parts if part]
+
+
+def _parse_block(block: bytes, first_line: int, report: LoadReport) -> np.ndarray:
+    """
+    Parses one block of normalized text into (line number, time, concentration) rows.
+
+    Line numbers are only worked out when a row is rejected, so the fast path is
+    a single call into NumPy's C parser. A block with malformed lines is split and
+    its pieces parsed fast again, so only the small pieces around the bad lines go
+    through the line-by-line parser.
+    """
+    try:
+        with np.errstate(all="ignore"):
+            values = np.loadtxt(io.StringIO(block.decode()), comments="#", usecols=(0, 1),
+                                ndmin=2, dtype=float)
+        line_nums = np.full(values.shape[0], np.nan)
+        return np.column_stack([line_nums, values])
+    except (ValueError, UnicodeDecodeError):
+        pass
+    pieces = _split_lines(block, _SPLIT_PIECES) if len(block) > _SLOW_PARSE_BYTES else [block]
+    if len(pieces) == 1:
+        return _parse_block_slow(block, first_line, report)
+    rows = []
+    for piece in pieces:
+        rows.append(_parse_block(piece, first_line, report))
+        first_line += piece.count(b"\n")
+    return np.concatenate(rows)
+
+
+def _fill_line_numbers(rows: np.ndarray, block: bytes, first_line: int, report: LoadReport) -> None:
+    """
+    Fills the line-number column of rows parsed on the fast path: the rows are the
+    block's data lines in order, minus the lines the parser rejected.
+    """
+    if rows.size and np.isnan(rows[:, 0]).any():
+        last_line = first_line + block.count(b"\n")
+        rejected = {line_num for line_num, _ in report.errors if first_line <= line_num <= last_line}
+        rows[:, 0] = [line_num for line_num, _ in _data_lines(block, first_line) if line_num not in rejected]
+
+
+def load_growth_data(filepath: str, block_bytes: int = DEFAULT_BLOCK_BYTES,
+                     progress: Optional[Callable[[float], None]] = None) -> Tuple[np.ndarray, np.ndarray, LoadReport]:
+    """
+    Loads a two-column (Time, Concentration) file into NumPy arrays.
+
+    Args:
+        filepath (str): Path of a .csv/.txt file.
+        block_bytes (int): Approximate size of the blocks parsed at once.
+        progress (Optional[Callable[[float], None]]): Called with the fraction of
+            the file parsed after every block (it may raise to abort the load).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, LoadReport]: (times, concentrations, report),
+        sorted by time. Skipped lines are listed in the report.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    report = LoadReport(str(filepath))
+    parts = []
+    line_num = 1
+    total_bytes = max(os.path.getsize(filepath), 1)
+    with open(filepath, "rb") as f:
+        remainder = b""
+        while True:
+            chunk = f.read(block_bytes)
+            block = remainder + chunk
+            if chunk:
+                # Keep the trailing partial line for the next block
+                cut = block.rfind(b"\n") + 1
+                block, remainder = block[:cut], block[cut:]
+            else:
+                remainder = b""
+            if block:
+                normalized = block.replace(b"\r", b"").translate(_DELIMITERS)
+                rows = _parse_block(normalized, line_num, report)
+
+                # Vectorized range checks (NaN and inf fail too)
+                bad = ~(np.isfinite(rows[:, 1]) & np.isfinite(rows[:, 2]) &
+                        (rows[:, 1] >= 0) & (rows[:, 2] > 0))
+                if bad.any():
+                    _fill_line_numbers(rows, normalized, line_num, report)
+                    for bad_line in rows[bad, 0]:
+                        report.add(int(bad_line), OUT_OF_RANGE)
+                    rows = rows[~bad]
+                parts.append(rows[:, 1:])
+                line_num += block.count(b"\n")
+                if progress is not None:
+                    progress(min(f.tell() / total_bytes, 1.0))
+            if not chunk:
+                break
+
+    data = np.concatenate(parts) if parts else np.empty((0, 2))
+    report.errors.sort()
+    order = np.argsort(data[:, 0], kind="stable")
+    times = np.ascontiguousarray(data[order, 0])
+    concentrations = np.ascontiguousarray(data[order, 1])
+    report.n_points = times.size
+    return times, concentrations, report
+
+
+def cache_paths(filepath: str, cache_dir: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Returns the (data .npy, metadata .json) sidecar paths for a source file.
+
+    Sidecars are hidden files next to the source; with `cache_dir` they go there
+    instead, named by a hash of the absolute source path.
+    """
+    source = os.path.abspath(filepath)
+    if cache_dir is None:
+        directory, name = os.path.split(source)
+        stem = os.path.join(directory, f".{name}.growth")
+    else:
+        digest = hashlib.blake2b(source.encode(), digest_size=10).hexdigest()
+        stem = os.path.join(cache_dir, f"{os.path.basename(source)}.{digest}.growth")
+    return stem + ".npy", stem + ".json"
+
+
+def _source_signature(filepath: str) -> dict:
+    stat = os.stat(filepath)
+    return {"version": CACHE_VERSION, "source": os.path.abspath(filepath),
+            "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _read_cache(filepath: str, data_path: str, meta_path: str):
+    """Returns (times, concentrations, report) from a fresh sidecar, or None if missing or stale."""
+    try:
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        if meta.get("signature") != _source_signature(filepath):
+            return None
+        columns = np.load(data_path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if columns.shape != (2, meta.get("n_points")):
+        return None
+
+    report = LoadReport(str(filepath))
+    report.errors = [(int(line_num), message) for line_num, message in meta.get("errors", [])]
+    report.n_points = columns.shape[1]
+    report.from_cache = True
+    # Rows of the C-ordered (2, n) array are contiguous, zero-copy views
+    return columns[0], columns[1], report
+
+
+def _write_atomic(path: str, write) -> None:
+    """Writes a file through a temporary file so readers never see half of it."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_cache(signature: dict, data_path: str, meta_path: str, times: np.ndarray,
+                 concentrations: np.ndarray, report: LoadReport) -> None:
+    meta = {"signature": signature, "n_points": int(times.size), "errors": report.errors}
+    # Data first, metadata last: the .json only appears once the .npy is complete
+    _write_atomic(data_path, lambda f: np.save(f, np.stack([times, concentrations])))
+    _write_atomic(meta_path, lambda f: f.write(json.dumps(meta).encode()))
+
+
+def load_growth_data_cached(filepath: str, cache_dir: Optional[str] = None,
+                            block_bytes: int = DEFAULT_BLOCK_BYTES,
+                            progress: Optional[Callable[[float], None]] = None) -> Tuple[np.ndarray, np.ndarray, LoadReport]:
+    """
+    Like `load_growth_data`, but consults a binary sidecar cache first.
+
+    A sidecar is fresh when the source path, size and mtime recorded in it match
+    the file on disk; it is then memory-mapped (read-only arrays, no parsing and
+    no copy). Otherwise the file is parsed and the sidecar (re)written. If the
+    sidecar cannot be written (e.g. read-only directory), the parsed data is
+    returned anyway.
+
+    Args:
+        filepath (str): Path of a .csv/.txt file.
+        cache_dir (Optional[str]): Directory for the sidecars (default: next to the source).
+        block_bytes (int): Approximate size of the blocks parsed at once.
+        progress (Optional[Callable[[float], None]]): Parse progress callback
+            (see `load_growth_data`); not called for a cache hit.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, LoadReport]: (times, concentrations, report),
+        sorted by time. `report.from_cache` tells whether the sidecar was used.
+
+    Raises:
+        OSError: If the source file cannot be read.
+    """
+    data_path, meta_path = cache_paths(filepath, cache_dir)
+    cached = _read_cache(filepath, data_path, meta_path)
+    if cached is not None:
+        return cached
+
+    signature = _source_signature(filepath)
+    times, concentrations, report = load_growth_data(filepath, block_bytes, progress)
+    if _source_signature(filepath) == signature:  # Do not cache a file that changed while parsing
+        try:
+            if cache_dir is not None:
+                os.makedirs(cache_dir, exist_ok=True)
+            _write_cache(signature, data_path, meta_path, times, concentrations, report)
+        except OSError:
+            pass
+    return times, concentrations, report
+
+
+def _split_fields(line: str, delimiter: Optional[str]) -> List[str]:
+    return [field.strip() for field in line.split(delimiter)]
+
+
+def _plate_header(lines, well_pattern: str):
+    """Finds the header row; returns (delimiter, time column, well columns, well ids, line number)."""
+    for line_num, line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        delimiter = "\t" if "\t" in stripped else ("," if "," in stripped else None)
+        header = _split_fields(stripped, delimiter)
+        wells = [i for i, name in enumerate(header) if re.match(well_pattern, name)]
+        if not wells:
+            # No recognizable well names: every column after the time column is a well
+            wells = list(range(1, len(header)))
+        if not wells or wells[0] == 0:
+            raise ValueError(f"Line {line_num}: Header must start with a time column followed by well columns.")
+        return delimiter, 0, wells, [header[i] for i in wells], line_num
+    raise ValueError("The file does not contain a header row.")
+
+
+def _parse_plate_rows(rows, delimiter, columns, report: LoadReport) -> np.ndarray:
+    """
+    Parses (line number, text) rows into a (rows x columns) float array.
+
+    The whole chunk goes through NumPy's C parser; only a chunk with empty or
+    non-numeric cells falls back to a per-line parse, where bad cells become NaN.
+    """
+    try:
+        return np.loadtxt([text for _, text in rows], delimiter=delimiter, usecols=columns,
+                          ndmin=2, dtype=float, comments=None)
+    except ValueError:
+        pass
+
+    values = np.full((len(rows), len(columns)), np.nan)
+    for r, (line_num, text) in enumerate(rows):
+        fields = _split_fields(text, delimiter)
+        complete = True
+        for c, column in enumerate(columns):
+            try:
+                values[r, c] = float(fields[column])
+            except (IndexError, ValueError):
+                complete = False
+        if not complete and np.isfinite(values[r, 0]):
+            report.add(line_num, MISSING_WELLS)
+    return values
+
+
+def iter_plate_chunks(filepath: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                      well_pattern: str = WELL_ID_PATTERN,
+                      report: Optional[LoadReport] = None) -> Iterator[Tuple[List[str], np.ndarray, np.ndarray]]:
+    """
+    Streams a wide plate-reader file (one row per time point, one column per well).
+
+    The first non-comment line is the header: the first column is time, and
+    columns named like wells (A1 ... P24) are read; other columns (e.g. a
+    temperature column) are ignored. If no header matches `well_pattern`, every
+    column after the time column is taken as a well. Columns may be separated by
+    tabs, commas or spaces.
+
+    Args:
+        filepath (str): Path of the exported file.
+        chunk_rows (int): Number of time points parsed per chunk.
+        well_pattern (str): Regular expression for well column names.
+        report (Optional[LoadReport]): Collects skipped rows and missing cells.
+
+    Yields:
+        Tuple[List[str], np.ndarray, np.ndarray]: (well ids, times of the chunk,
+        (chunk rows x wells) values). Missing cells are NaN.
+
+    Raises:
+        ValueError: If there is no usable header row.
+        OSError: If the file cannot be read.
+    """
+    if chunk_rows < 1:
+        raise ValueError("Chunk size must be at least 1 row.")
+    if report is None:
+        report = LoadReport(str(filepath))
+    with open(filepath, "r", newline=None) as f:
+        lines = enumerate(f, 1)
+        delimiter, time_column, wells, well_ids, _ = _plate_header(lines, well_pattern)
+        columns = [time_column] + wells
+
+        while True:
+            chunk = list(itertools.islice(lines, chunk_rows))
+            if not chunk:
+                break
+            rows = [(line_num, line.rstrip("\r\n")) for line_num, line in chunk
+                    if line.strip() and not line.lstrip().startswith("#")]
+            if not rows:
+                continue
+            values = _parse_plate_rows(rows, delimiter, columns, report)
+
+            times = values[:, 0]
+            good = np.isfinite(times) & (times >= 0)
+            if not good.all():
+                for r in np.flatnonzero(~good):
+                    report.add(rows[r][0], BAD_TIME)
+            report.n_points += int(good.sum())
+            yield well_ids, times[good], values[good, 1:]
+
+
+def load_plate_data(filepath: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                    well_pattern: str = WELL_ID_PATTERN) -> Tuple[np.ndarray, List[str], np.ndarray, LoadReport]:
+    """
+    Loads a wide plate-reader file into a (wells x time) matrix.
+
+    Args:
+        filepath (str): Path of the exported file.
+        chunk_rows (int): Number of time points parsed per chunk.
+        well_pattern (str): Regular expression for well column names.
+
+    Returns:
+        Tuple[np.ndarray, List[str], np.ndarray, LoadReport]: (times, well ids,
+        values, report). `times` is sorted; `values[i]` is the curve of well
+        `well_ids[i]`, with NaN for missing cells. It can be passed directly to
+        `growth_rate_fit_batch(times, values)`.
+
+    Raises:
+        ValueError: If there is no usable header row.
+        OSError: If the file cannot be read.
+    """
+    report = LoadReport(str(filepath))
+    well_ids: List[str] = []
+    time_parts, value_parts = [], []
+    chunks = iter_plate_chunks(filepath, chunk_rows, well_pattern, report)
+    for well_ids, times, values in chunks:
+        time_parts.append(times)
+        value_parts.append(values)
+    if not well_ids:
+        # Header only: recover the well ids from the header
+        with open(filepath, "r") as f:
+            _, _, _, well_ids, _ = _plate_header(enumerate(f, 1), well_pattern)
+
+    times = np.concatenate(time_parts) if time_parts else np.empty(0)
+    values = np.concatenate(value_parts) if value_parts else np.empty((0, len(well_ids)))
+    order = np.argsort(times, kind="stable")
+    report.errors.sort()
+    return times[order], well_ids, np.ascontiguousarray(values[order].T), report
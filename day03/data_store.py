@@ -0,0 +1,200 @@
+"""data_store.py
+
+Columnar, time-sorted store for the (Time, Concentration) points of the growth GUI.
+
+Points live in parallel NumPy arrays (times, concentrations, row ids) kept
+sorted by time, so the fit and plot code can take zero-copy views instead of
+rebuilding lists. Every point gets a stable integer row id when it is added;
+the GUI uses it as the Treeview item id, so removing a selected row is a
+lookup by id rather than a scan with float-tolerance matching.
+
+Positions are found by binary search (O(log n)); inserting or deleting then
+shifts the tail of the arrays with a single memmove, and the arrays grow
+geometrically, so adding points one at a time stays cheap.
+
+The store also keeps the regression sufficient statistics of its points in a
+`GrowthRateAccumulator` (`fit_stats`): adding a point updates them, removing
+one downdates them, so k and R-squared of the whole dataset are available in
+O(1) after every edit. They are rebuilt exactly from the arrays every
+`recompute_every` edits (and always for small datasets) to bound
+floating-point drift.
+"""
+from typing import Tuple
+
+import numpy as np
+
+from calculator_logic import GrowthRateAccumulator
+
+# Datasets up to this size get exact statistics after every edit (it costs microseconds)
+EXACT_STATS_POINTS = 64
+
+
+class GrowthDataStore:
+    """
+    Time-sorted columnar store with stable row ids.
+
+    Points with equal times keep their insertion order (like a stable sort).
+
+    Args:
+        capacity (int): Initial number of points that fit without reallocating.
+        recompute_every (int): Number of add/remove updates after which `fit_stats`
+            is rebuilt exactly from the arrays.
+
+    Attributes:
+        fit_stats (GrowthRateAccumulator): Live fit of all points (`fit_stats.result()`
+            gives (k, R-squared) like `growth_rate_fit`).
+    """
+
+    def __init__(self, capacity: int = 64, recompute_every: int = 1000):
+        self.recompute_every = recompute_every
+        self.fit_stats = GrowthRateAccumulator()
+        self._updates = 0
+        self._n = 0
+        self._next_id = 0
+        self._id_base = 0  # Ids below this were dropped by replace()/clear()
+        self._times = np.empty(capacity)
+        self._concentrations = np.empty(capacity)
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._time_of_id = np.full(capacity, np.nan)  # Row id - base -> time (NaN once removed)
+
+    def __len__(self) -> int:
+        return self._n
+
+    @staticmethod
+    def _read_only(view: np.ndarray) -> np.ndarray:
+        view.flags.writeable = False
+        return view
+
+    @property
+    def times(self) -> np.ndarray:
+        """Read-only view of the sorted times (invalidated by the next add/remove)."""
+        return self._read_only(self._times[:self._n])
+
+    @property
+    def concentrations(self) -> np.ndarray:
+        """Read-only view of the concentrations, in time order."""
+        return self._read_only(self._concentrations[:self._n])
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Read-only view of the row ids, in time order."""
+        return self._read_only(self._ids[:self._n])
+
+    def _reserve(self, n_points: int, n_ids: int) -> None:
+        """Grows the arrays geometrically so `n_points` rows and `n_ids` ids fit."""
+        if n_points > self._times.size:
+            capacity = max(n_points, 2 * self._times.size)
+            for name in ("_times", "_concentrations", "_ids"):
+                old = getattr(self, name)
+                new = np.empty(capacity, dtype=old.dtype)
+                new[:self._n] = old[:self._n]
+                setattr(self, name, new)
+        n_ids -= self._id_base
+        if n_ids > self._time_of_id.size:
+            new = np.full(max(n_ids, 2 * self._time_of_id.size), np.nan)
+            used = self._next_id - self._id_base
+            new[:used] = self._time_of_id[:used]
+            self._time_of_id = new
+
+    def _after_update(self) -> None:
+        """Bounds the drift of the live statistics with an occasional exact rebuild."""
+        self._updates += 1
+        if self._updates >= self.recompute_every or self._n <= EXACT_STATS_POINTS:
+            self.recompute_stats()
+
+    def recompute_stats(self) -> None:
+        """Rebuilds `fit_stats` exactly from the current points."""
+        self.fit_stats.recompute(self._times[:self._n], self._concentrations[:self._n])
+        self._updates = 0
+
+    def add(self, t: float, c: float) -> int:
+        """
+        Inserts one point at its sorted position and returns its new row id.
+
+        Raises:
+            ValueError: If the concentration is not positive (>0).
+        """
+        self.fit_stats.add(t, c)
+        self._reserve(self._n + 1, self._next_id + 1)
+        pos = int(np.searchsorted(self._times[:self._n], t, side='right'))
+        row_id = self._next_id
+        for array, value in ((self._times, t), (self._concentrations, c), (self._ids, row_id)):
+            array[pos + 1:self._n + 1] = array[pos:self._n]
+            array[pos] = value
+        self._time_of_id[row_id - self._id_base] = t
+        self._n += 1
+        self._next_id += 1
+        self._after_update()
+        return row_id
+
+    def position(self, row_id: int) -> int:
+        """
+        Current sorted position of a row.
+
+        Raises:
+            KeyError: If the row id is unknown or was removed.
+        """
+        if not self._id_base <= row_id < self._next_id or np.isnan(self._time_of_id[row_id - self._id_base]):
+            raise KeyError(f"Unknown row id {row_id}.")
+        t = self._time_of_id[row_id - self._id_base]
+        times = self._times[:self._n]
+        lo = int(np.searchsorted(times, t, side='left'))
+        hi = int(np.searchsorted(times, t, side='right'))
+        return lo + int(np.flatnonzero(self._ids[lo:hi] == row_id)[0])
+
+    def get(self, row_id: int) -> Tuple[float, float]:
+        """Returns the (time, concentration) of a row."""
+        pos = self.position(row_id)
+        return float(self._times[pos]), float(self._concentrations[pos])
+
+    def remove(self, row_id: int) -> Tuple[float, float]:
+        """
+        Removes a row and returns its (time, concentration).
+
+        Raises:
+            KeyError: If the row id is unknown or was removed.
+        """
+        pos = self.position(row_id)
+        point = float(self._times[pos]), float(self._concentrations[pos])
+        for array in (self._times, self._concentrations, self._ids):
+            array[pos:self._n - 1] = array[pos + 1:self._n]
+        self._time_of_id[row_id - self._id_base] = np.nan
+        self._n -= 1
+        self.fit_stats.remove(*point)
+        self._after_update()
+        return point
+
+    def replace(self, times, concentrations) -> np.ndarray:
+        """
+        Replaces all points (e.g. after loading a file) and returns the new row ids
+        in sorted order. Old row ids become invalid.
+
+        Raises:
+            ValueError: If the arrays have different lengths or a concentration is not positive.
+        """
+        times = np.asarray(times, dtype=float).ravel()
+        concentrations = np.asarray(concentrations, dtype=float).ravel()
+        if times.size != concentrations.size:
+            raise ValueError("Time and concentration lists must have the same length.")
+        if not np.all(concentrations > 0):
+            raise ValueError("All concentration points must be positive (>0) for log transformation.")
+        order = np.argsort(times, kind='stable')
+        self.clear()
+        first_id = self._next_id
+        self._reserve(times.size, first_id + times.size)
+        self._times[:times.size] = times[order]
+        self._concentrations[:times.size] = concentrations[order]
+        self._ids[:times.size] = first_id + np.arange(times.size)
+        self._time_of_id[:times.size] = self._times[:times.size]
+        self._n = times.size
+        self._next_id = first_id + times.size
+        self.recompute_stats()
+        return self.ids
+
+    def clear(self) -> None:
+        """Removes all points (row ids are never reused)."""
+        self._time_of_id[:] = np.nan
+        self._id_base = self._next_id
+        self._n = 0
+        self.fit_stats.reset()
+        self._updates = 0
@@ -0,0 +1,195 @@
+"""fit_cache.py
+
+Opt-in memoization for the fit functions (growth_rate_fit, growth_rate_fit_batch,
+max_growth_rate, fit_growth_model, ...).
+
+Results are keyed by a fast content hash (BLAKE2b) of the input arrays and the
+options, so re-loading the same file or re-fitting the same points skips the
+math. The in-memory tier is an LRU bounded by entry count and by bytes; an
+optional on-disk tier shares results across processes and repeat runs.
+
+Example:
+    cache = FitCache(max_entries=1024, disk_dir=".fit_cache")
+    fit = cache.memoize(growth_rate_fit)
+    k, r_squared = fit(times, concentrations)
+    print(cache.hits, cache.misses)
+"""
+import copy
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+
+CACHE_VERSION = 1  # Bump when fit results change without the fit function's own code changing
+
+
+def _feed(hasher, value) -> None:
+    """Adds one argument to the hash (arrays by dtype, shape and raw bytes)."""
+    if isinstance(value, (np.ndarray, list, tuple)):
+        try:
+            array = np.ascontiguousarray(value)
+        except ValueError:
+            array = None  # Ragged sequence
+        if array is not None and array.dtype != object:
+            hasher.update(f"array:{array.dtype.str}:{array.shape}:".encode())
+            hasher.update(array.tobytes())
+            return
+    hasher.update(f"{type(value).__name__}:{value!r};".encode())
+
+
+def _code_salt(func: Callable) -> bytes:
+    """Bytecode and constants of the function, so edited fit code does not hit stale disk entries."""
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return b""
+    return code.co_code + repr(code.co_consts).encode()
+
+
+def _result_size(result) -> int:
+    """Approximate memory footprint of a fit result in bytes."""
+    try:
+        return len(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+class FitCache:
+    """
+    Content-addressed LRU cache for fit results.
+
+    Args:
+        max_entries (int): Maximum number of results kept in memory.
+        max_bytes (int): Maximum total (pickled) size of the results kept in memory.
+        disk_dir (Optional[str]): Directory for the on-disk tier. None disables it.
+
+    Attributes:
+        hits (int): Lookups answered from memory or disk.
+        misses (int): Lookups that had to run the fit.
+        disk_hits (int): Subset of hits answered from the on-disk tier.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 disk_dir: Optional[str] = None):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("Cache limits must be positive.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+        self._entries = OrderedDict()  # key -> (result, size)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(func: Callable, args: tuple, kwargs: dict) -> str:
+        """
+        Hash of CACHE_VERSION, the function's name and code, positional arguments and
+        sorted keyword options.
+        """
+        hasher = hashlib.blake2b(digest_size=20)
+        hasher.update(f"v{CACHE_VERSION}|{func.__module__}.{func.__qualname__}|".encode())
+        hasher.update(_code_salt(func))
+        for value in args:
+            _feed(hasher, value)
+        for name in sorted(kwargs):
+            hasher.update(f"{name}=".encode())
+            _feed(hasher, kwargs[name])
+        return hasher.hexdigest()
+
+    def clear(self, disk: bool = False) -> None:
+        """Empties the memory tier (and the disk tier if `disk` is True)."""
+        self._entries.clear()
+        self.current_bytes = 0
+        if disk and self.disk_dir is not None:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def _remember(self, key: str, result) -> None:
+        """Stores a result in memory and evicts least recently used entries over the limits."""
+        size = _result_size(result)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (result, size)
+        self.current_bytes += size
+        while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key + ".pkl")
+
+    def _load_from_disk(self, key: str):
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                return True, pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False, None
+
+    def _save_to_disk(self, key: str, result) -> None:
+        # Write to a temporary file first so other processes never read half a file
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._disk_path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def call(self, func: Callable, *args, **kwargs):
+        """Returns func(*args, **kwargs), from the cache when the same inputs were seen before."""
+        key = self.make_key(func, args, kwargs)
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self._entries[key][0])
+
+        if self.disk_dir is not None:
+            found, result = self._load_from_disk(key)
+            if found:
+                self.hits += 1
+                self.disk_hits += 1
+                self._remember(key, result)
+                return copy.deepcopy(result)
+
+        self.misses += 1
+        result = func(*args, **kwargs)  # Errors propagate and are not cached
+        self._remember(key, result)
+        if self.disk_dir is not None:
+            self._save_to_disk(key, result)
+        return copy.deepcopy(result)
+
+    def memoize(self, func: Callable) -> Callable:
+        """Wraps `func` so every call goes through this cache."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+        wrapper.cache = self
+        return wrapper
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current memory use."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+        }
@@ -0,0 +1,172 @@
+"""fit_plot.py
+
+Fast redrawing of the growth-curve plot in the GUI.
+
+- `lttb` reduces a long series to a few thousand points with the
+  Largest-Triangle-Three-Buckets downsampler, which keeps peaks, dips and the
+  overall shape (unlike taking every n-th point).
+- `FitPlot` creates the axes and Line2D artists once and afterwards only calls
+  `set_data` on them. When the axis limits do not change, the new lines are
+  blitted onto a cached background instead of redrawing the whole figure.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Series longer than this are downsampled before drawing
+MAX_PLOT_POINTS = 2000
+
+
+def lttb(x, y, n_out: int = MAX_PLOT_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets downsampling of a series sorted by x.
+
+    The first and last points are kept; every bucket in between contributes the
+    point forming the largest triangle with its neighbours. The classic
+    algorithm walks the buckets one by one (each anchor is the point chosen in
+    the previous bucket); here all buckets are scored at once in two vectorized
+    passes: the first uses the previous bucket's mean as the anchor, the second
+    the point chosen for the previous bucket in the first pass.
+
+    Args:
+        x (array-like): x values (sorted ascending).
+        y (array-like): y values.
+        n_out (int): Number of points to keep (at least 3).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The kept (x, y) points (inputs are returned
+        unchanged if they already have at most `n_out` points).
+
+    Raises:
+        ValueError: If `n_out` is below 3 or the inputs differ in length.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.shape != y.shape:
+        raise ValueError("Time and concentration lists must have the same length.")
+    if n_out < 3:
+        raise ValueError("At least three output points are required for downsampling.")
+    n = x.size
+    if n <= n_out:
+        return x, y
+
+    # 1. Buckets of (almost) equal size between the fixed first and last point
+    n_buckets = n_out - 2
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+    starts, stops = edges[:-1], edges[1:]
+    sizes = stops - starts
+    width = int(sizes.max())
+    index = starts[:, np.newaxis] + np.arange(width)
+    inside = np.arange(width) < sizes[:, np.newaxis]
+    index = np.where(inside, index, starts[:, np.newaxis])
+    bx, by = x[index], y[index]
+
+    mean_x = np.add.reduceat(x[1:n - 1], starts - 1) / sizes
+    mean_y = np.add.reduceat(y[1:n - 1], starts - 1) / sizes
+    # Right neighbour of each bucket: the next bucket's mean (the last point for the last bucket)
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    def choose(anchor_x, anchor_y):
+        # Twice the triangle area (anchor, candidate, next mean)
+        area = np.abs((anchor_x - next_x)[:, np.newaxis] * (by - anchor_y[:, np.newaxis])
+                      - (anchor_x[:, np.newaxis] - bx) * (next_y - anchor_y)[:, np.newaxis])
+        area[~inside] = -1.0
+        return index[np.arange(n_buckets), np.argmax(area, axis=1)]
+
+    # 2. First pass anchored on the previous bucket's mean, second on its chosen point
+    chosen = choose(np.append(x[0], mean_x[:-1]), np.append(y[0], mean_y[:-1]))
+    chosen = choose(np.append(x[0], x[chosen[:-1]]), np.append(y[0], y[chosen[:-1]]))
+
+    keep = np.concatenate(([0], chosen, [n - 1]))
+    return x[keep], y[keep]
+
+
+class FitPlot:
+    """
+    Growth-curve plot (log2(N) points and the fitted line) that reuses its artists.
+
+    Args:
+        fig: Matplotlib Figure to draw into (it is cleared once).
+        canvas: The figure's canvas (e.g. FigureCanvasTkAgg).
+        max_points (int): Points are downsampled with `lttb` above this count.
+    """
+
+    def __init__(self, fig, canvas, max_points: int = MAX_PLOT_POINTS):
+        self.fig = fig
+        self.canvas = canvas
+        self.max_points = max_points
+        fig.clear()
+        self.ax = fig.add_subplot(111)
+        self.ax.set_title("Growth Curve Linear Fit")
+        self.ax.set_xlabel("Time")
+        self.ax.set_ylabel("Log₂ Concentration (log₂(N))")
+        self.ax.grid(True, linestyle='--', alpha=0.6)
+
+        # Artists that change on every fit are animated: they are drawn by blitting,
+        # not as part of the cached background
+        (self.points_line,) = self.ax.plot([], [], 'o', label='Data Points (log2(N))', animated=True)
+        (self.fit_line,) = self.ax.plot([], [], 'r-', label='Linear Fit', animated=True)
+        self.k_text = self.ax.text(0.02, 0.95, 'Click "Calculate & Plot" to see results.',
+                                   transform=self.ax.transAxes, va='top', animated=True)
+        self.ax.legend(loc='lower right')
+
+        self._background = None
+        self._limits: Optional[tuple] = None
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event) -> None:
+        """After a full draw (first show, resize, new limits): cache the background, add the animated artists."""
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self) -> None:
+        for artist in (self.points_line, self.fit_line, self.k_text):
+            self.ax.draw_artist(artist)
+
+    def prepare(self, times, log2_concentrations, fit) -> dict:
+        """
+        Computes everything to draw for a fit (downsampled points, fitted line, data extent).
+
+        Pure NumPy, so it can run on a worker thread.
+        """
+        x, y = lttb(times, log2_concentrations, self.max_points)
+        x_fit = np.array([x[0], x[-1]])
+        y_fit = fit.line(x_fit)
+        data_box = (x[0], x[-1], min(y.min(), y_fit.min()), max(y.max(), y_fit.max()))
+        return {"x": x, "y": y, "x_fit": x_fit, "y_fit": y_fit, "data_box": data_box, "k": fit.k}
+
+    def _limits_for(self, data_box: tuple) -> tuple:
+        """
+        Keeps the current axis limits while the data still fills them reasonably
+        (so the plot can be blitted), otherwise returns new padded limits.
+        """
+        x_low, x_high, y_low, y_high = data_box
+        if self._limits is not None:
+            left, right, bottom, top = self._limits
+            fits = left <= x_low and x_high <= right and bottom <= y_low and y_high <= top
+            fills = (x_high - x_low) >= 0.5 * (right - left) and (y_high - y_low) >= 0.5 * (top - bottom)
+            if fits and fills:
+                return self._limits
+        x_pad = 0.05 * (x_high - x_low) or 0.5
+        y_pad = 0.05 * (y_high - y_low) or 0.5
+        return (x_low - x_pad, x_high + x_pad, y_low - y_pad, y_high + y_pad)
+
+    def show(self, prepared: dict, unit_time: str) -> None:
+        """Updates the artists with `set_data` and blits them (full redraw only if limits or units changed)."""
+        self.points_line.set_data(prepared["x"], prepared["y"])
+        self.fit_line.set_data(prepared["x_fit"], prepared["y_fit"])
+        self.k_text.set_text(f"k = {prepared['k']:.4f} gen/{unit_time}")
+
+        xlabel = f"Time ({unit_time})"
+        limits = self._limits_for(prepared["data_box"])
+        if self._background is None or limits != self._limits or self.ax.get_xlabel() != xlabel:
+            self._limits = limits
+            self.ax.set_xlim(limits[0], limits[1])
+            self.ax.set_ylim(limits[2], limits[3])
+            self.ax.set_xlabel(xlabel)
+            self.canvas.draw()  # Triggers _on_draw, which draws the animated artists
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+        self.canvas.blit(self.fig.bbox)
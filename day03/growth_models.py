@@ -0,0 +1,233 @@
+"""growth_models.py
+
+Sigmoidal growth models (logistic, Gompertz, Baranyi) fitted to whole plates
+at once.
+
+The log-linear model of `calculator_logic.growth_rate_fit` only holds in the
+exponential phase. The models here describe the full curve in log2 units,
+y(t) = log2(N(t)), with four parameters per curve:
+
+    y0  - initial level, log2(N0)
+    A   - total increase of log2(N) (asymptote = y0 + A)
+    mu  - maximum specific growth rate, in generations/time like k
+    lam - lag time
+
+Logistic and Gompertz use the reparameterized forms of Zwietering et al. (1990);
+Baranyi is the Baranyi & Roberts (1994) model with m = 1.
+
+`fit_growth_model` runs a vectorized Levenberg-Marquardt: every curve keeps its
+own parameters and damping, but residuals, analytic Jacobians and the 4x4 normal
+equations of all curves are built and solved together in NumPy.
+"""
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from calculator_logic import max_growth_rate
+
+LN2 = np.log(2.0)
+
+
+def logistic(t: np.ndarray, params: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Logistic model: returns (y, Jacobian dy/d[y0, A, mu, lam])."""
+    y0, A, mu, lam = (params[..., i, np.newaxis] for i in range(4))
+    z = 4.0 * mu / A * (lam - t) + 2.0
+    s = 0.5 * (1.0 - np.tanh(0.5 * z))  # 1 / (1 + exp(z)) without overflow
+    ds_dz = -s * (1.0 - s)
+    y = y0 + A * s
+    jac = np.stack(np.broadcast_arrays(
+        np.ones_like(y),
+        s + A * ds_dz * (-4.0 * mu * (lam - t) / A ** 2),
+        A * ds_dz * (4.0 * (lam - t) / A),
+        A * ds_dz * (4.0 * mu / A),
+    ), axis=-1)
+    return y, jac
+
+
+def gompertz(t: np.ndarray, params: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Gompertz model: returns (y, Jacobian dy/d[y0, A, mu, lam])."""
+    y0, A, mu, lam = (params[..., i, np.newaxis] for i in range(4))
+    z = np.minimum(mu * np.e / A * (lam - t) + 1.0, 700.0)
+    ez = np.exp(z)
+    g = np.exp(-ez)
+    dg_dz = -ez * g
+    y = y0 + A * g
+    jac = np.stack(np.broadcast_arrays(
+        np.ones_like(y),
+        g + A * dg_dz * (-mu * np.e * (lam - t) / A ** 2),
+        A * dg_dz * (np.e * (lam - t) / A),
+        A * dg_dz * (mu * np.e / A),
+    ), axis=-1)
+    return y, jac
+
+
+def baranyi(t: np.ndarray, params: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Baranyi model: returns (y, Jacobian dy/d[y0, A, mu, lam])."""
+    y0, A, mu, lam = (params[..., i, np.newaxis] for i in range(4))
+    r = mu * LN2  # natural-log growth rate
+    a = A * LN2
+    e_t = np.exp(-r * t)
+    e_lam = np.exp(-r * lam)
+    d = e_t + e_lam - e_t * e_lam
+    q = r * t + np.log(d)  # natural-log growth reached at time t
+    eq = np.exp(np.minimum(q, 700.0))
+    denominator = np.exp(np.minimum(a, 700.0)) + eq - 1.0
+    y = y0 + (q - np.log1p((eq - 1.0) * np.exp(-a))) / LN2
+
+    dy_dq = (1.0 - eq / denominator) / LN2
+    dq_dr = t + (-t * e_t - lam * e_lam + (t + lam) * e_t * e_lam) / d
+    dq_dlam = r * e_lam * (e_t - 1.0) / d
+    jac = np.stack(np.broadcast_arrays(
+        np.ones_like(y),
+        (eq - 1.0) / denominator,
+        dy_dq * dq_dr * LN2,
+        dy_dq * dq_dlam,
+    ), axis=-1)
+    return y, jac
+
+
+MODELS: Dict[str, Callable] = {"logistic": logistic, "gompertz": gompertz, "baranyi": baranyi}
+
+
+def _initial_guess(t: np.ndarray, y: np.ndarray, usable: np.ndarray) -> np.ndarray:
+    """
+    Warm start: y0 and A from the observed range, mu and lam from the steepest
+    window of `max_growth_rate` (the growth_rate_fit slope of the exponential phase).
+    """
+    n_curves, n_points = y.shape
+    y_low = np.where(usable, y, np.inf).min(axis=1)
+    y_high = np.where(usable, y, -np.inf).max(axis=1)
+
+    window = int(max(3, n_points // 5))
+    k = np.full(n_curves, np.nan)
+    lag_time = np.full(n_curves, np.nan)
+    complete = usable.all(axis=1)
+    if complete.any():
+        # Complete curves are scanned together in one batch
+        best = max_growth_rate(t[complete], 2.0 ** y[complete], window)
+        k[complete], lag_time[complete] = best["k"], best["lag_time"]
+    for i in np.flatnonzero(~complete):
+        best = max_growth_rate(t[i, usable[i]], 2.0 ** y[i, usable[i]], min(window, usable[i].sum()))
+        k[i], lag_time[i] = best["k"], best["lag_time"]
+
+    mu = np.maximum(k, 1e-6)
+    lam = np.where(np.isfinite(lag_time), lag_time, np.where(usable, t, np.inf).min(axis=1))
+    return np.column_stack([y_low, np.maximum(y_high - y_low, 1e-6), mu, lam])
+
+
+def fit_growth_model(times, concentrations, model: str = "gompertz", max_iter: int = 100,
+                     tol: float = 1e-10) -> Dict[str, np.ndarray]:
+    """
+    Fits a sigmoidal growth model to many curves at once with a vectorized
+    Levenberg-Marquardt (one batched 4x4 solve per iteration for all curves).
+
+    Args:
+        times (array-like): Shared 1-D time axis (length T) or 2-D (curves x T).
+        concentrations (array-like): 1-D (single curve) or 2-D (curves x T)
+            concentrations (N). NaN marks a missing sample.
+        model (str): "logistic", "gompertz" or "baranyi".
+        max_iter (int): Maximum number of LM iterations.
+        tol (float): Relative decrease of the residual sum of squares below
+            which a curve counts as converged.
+
+    Returns:
+        Dict[str, np.ndarray]: Arrays with one value per curve (floats for 1-D input):
+            - mu_max: maximum specific growth rate (generations/time, like k)
+            - lag: lag time
+            - asymptote: carrying capacity in concentration units, 2 ** (y0 + A)
+            - N0: fitted initial concentration, 2 ** y0
+            - r_squared: R-squared of the fit on log2(N)
+            - converged: whether the curve met `tol` within `max_iter`
+
+    Raises:
+        ValueError: If inputs are invalid (shapes, model, non-positive values).
+    """
+    # 1. Validation checks
+    if model not in MODELS:
+        raise ValueError(f"Model must be one of {', '.join(MODELS)}.")
+    conc = np.asarray(concentrations, dtype=float)
+    single_curve = conc.ndim == 1
+    conc = np.atleast_2d(conc)
+    t = np.asarray(times, dtype=float)
+    if t.ndim == 1:
+        t = t[np.newaxis, :]
+    if conc.ndim != 2 or t.ndim != 2 or t.shape[1] != conc.shape[1] or t.shape[0] not in (1, conc.shape[0]):
+        raise ValueError("Time and concentration lists must have the same length.")
+    if np.any(conc <= 0):
+        raise ValueError("All concentration points must be positive (>0) for log transformation.")
+    t = np.array(np.broadcast_to(t, conc.shape))
+
+    usable = ~np.isnan(conc) & ~np.isnan(t)
+    if np.any(usable.sum(axis=1) < 5):
+        raise ValueError("At least five data points per curve are required for a sigmoidal fit.")
+    order = np.argsort(np.where(usable, t, np.inf), axis=1, kind='stable')
+    t = np.take_along_axis(t, order, axis=1)
+    y = np.log2(np.take_along_axis(conc, order, axis=1))
+    usable = np.take_along_axis(usable, order, axis=1)
+    t = np.where(usable, t, 0.0)
+    y = np.where(usable, y, 0.0)
+    weight = usable.astype(float)
+
+    # 2. Vectorized Levenberg-Marquardt
+    f = MODELS[model]
+    params = _initial_guess(np.where(usable, t, np.nan), np.where(usable, y, np.nan), usable)
+    params = np.where(np.isfinite(params), params, 1.0)
+
+    def cost_and_jacobian(p):
+        with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+            fitted, jac = f(t, p)
+        residual = (y - fitted) * weight
+        cost = np.einsum('ij,ij->i', residual, residual)
+        return np.where(np.isfinite(cost), cost, np.inf), residual, jac * weight[..., np.newaxis]
+
+    cost, residual, jac = cost_and_jacobian(params)
+    damping = np.full(conc.shape[0], 1e-3)
+    converged = np.zeros(conc.shape[0], dtype=bool)
+    stalled = np.zeros(conc.shape[0], dtype=bool)
+    lower = np.array([-np.inf, 1e-9, 1e-9, -np.inf])
+
+    for _ in range(max_iter):
+        active = ~(converged | stalled)
+        if not active.any():
+            break
+        jac = np.nan_to_num(jac)
+        jtj = np.einsum('cnp,cnq->cpq', jac, jac)
+        gradient = np.einsum('cnp,cn->cp', jac, np.nan_to_num(residual))
+        diagonal = np.einsum('cpp->cp', jtj)
+        system = jtj + damping[:, np.newaxis, np.newaxis] * np.eye(4) * np.maximum(diagonal, 1e-12)[:, np.newaxis, :]
+        try:
+            step = np.linalg.solve(system, gradient[..., np.newaxis])[..., 0]
+        except np.linalg.LinAlgError:
+            # A singular curve (e.g. flat data) must not stop the whole batch
+            step = (np.linalg.pinv(system) @ gradient[..., np.newaxis])[..., 0]
+
+        trial = np.maximum(params + step, lower)
+        trial_cost, trial_residual, trial_jac = cost_and_jacobian(trial)
+        better = active & (trial_cost < cost)
+
+        improvement = np.where(better, (cost - trial_cost) / np.maximum(cost, 1e-300), 0.0)
+        params = np.where(better[:, np.newaxis], trial, params)
+        residual = np.where(better[:, np.newaxis], trial_residual, residual)
+        jac = np.where(better[:, np.newaxis, np.newaxis], trial_jac, jac)
+        cost = np.where(better, trial_cost, cost)
+        damping = np.where(better, damping / 3.0, damping * 4.0)
+        converged |= (better & (improvement < tol)) | (cost == 0)
+        stalled |= damping > 1e12
+
+    # 3. Results
+    y_mean = np.sum(y * weight, axis=1) / weight.sum(axis=1)
+    ss_tot = np.sum(((y - y_mean[:, np.newaxis]) * weight) ** 2, axis=1)
+    r_squared = np.where(ss_tot > 0, 1.0 - cost / np.where(ss_tot > 0, ss_tot, 1.0), 1.0)
+
+    y0, A, mu, lam = params.T
+    result = {
+        "mu_max": mu,
+        "lag": lam,
+        "asymptote": 2.0 ** (y0 + A),
+        "N0": 2.0 ** y0,
+        "r_squared": r_squared,
+        "converged": converged,
+    }
+    if single_curve:
+        result = {key: value[0].item() for key, value in result.items()}
+    return result
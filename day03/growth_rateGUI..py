@@ -1,28 +1,90 @@
+import time
+STARTUP_START = time.perf_counter() # Taken before any other import, for the startup measurement
+import sys
 import tkinter as tk
 from tkinter import messagebox, ttk, filedialog # ADD filedialog
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-from scipy.stats import linregress
-import io
 
-# Import the enhanced logic, including the SciPy fitting function
-from calculator_logic import growth_rate_fit # Only need the fit function for the GUI
+from gui_startup import HeavyImports, StartupTimer
+from tk_worker import TkWorker, WorkerStatus
+
+# NumPy, Matplotlib (TkAgg) and the fitting modules are NOT imported here: they load
+# in a background warm-up thread once the window is shown, or on first use (see
+# on_modules_ready). Their names below are filled in by on_modules_ready.
+HEAVY_MODULES = [
+    "numpy",
+    "calculator_logic",
+    "data_loader",
+    "data_store",
+    "table_view",
+    "fit_plot",
+    "matplotlib.figure",
+    "matplotlib.backends.backend_tkagg",
+]
+np = None
+growth_rate_fit_result = None
+load_growth_data_cached = None
+FILE_FORMAT_INSTRUCTIONS = ""
 
 # --- Global Configuration and State ---
 ALLOWED_TIME_UNITS = ["hours", "minutes", "days", "seconds"]
-DATA_POINTS = [] # Global list to store (time, concentration) tuples
+MEASURE_STARTUP = "--measure-startup" in sys.argv # Print startup timings as JSON and exit
+DATA_STORE = None # GrowthDataStore: time-sorted columns; row ids double as Treeview item ids
+data_table = None # GrowthTable adapter of the Treeview
+fit_plot = None # FitPlot in the plot frame
 
 # --- Core Logic Functions ---
 
-def update_data_table(tree_widget: ttk.Treeview):
-    """Clears and repopulates the Treeview widget with current DATA_POINTS."""
-    # Clear existing data
-    for item in tree_widget.get_children():
-        tree_widget.delete(item)
-    # Insert new data
-    for i, (t, c) in enumerate(DATA_POINTS):
-        tree_widget.insert('', 'end', values=(i + 1, f"{t:.2f}", f"{c:.2f}"))
+def on_modules_ready(modules):
+    """Main thread: builds the data store, table adapter and plot once the heavy modules are loaded."""
+    global np, growth_rate_fit_result, load_growth_data_cached, FILE_FORMAT_INSTRUCTIONS
+    global DATA_STORE, data_table, fit_plot
+    np = modules["numpy"]
+    growth_rate_fit_result = modules["calculator_logic"].growth_rate_fit_result
+    load_growth_data_cached = modules["data_loader"].load_growth_data_cached
+    FILE_FORMAT_INSTRUCTIONS = modules["data_loader"].FILE_FORMAT_INSTRUCTIONS
+
+    DATA_STORE = modules["data_store"].GrowthDataStore()
+    # Diff-based updates; large datasets switch to a virtualized window of visible rows
+    data_table = modules["table_view"].GrowthTable(data_tree, tree_scrollbar, DATA_STORE)
+
+    # Matplotlib figure and canvas (a plain Figure: pyplot is not needed inside Tk)
+    fig = modules["matplotlib.figure"].Figure(figsize=(6, 4), dpi=100)
+    canvas = modules["matplotlib.backends.backend_tkagg"].FigureCanvasTkAgg(fig, master=plot_frame)
+    plot_placeholder.destroy()
+    canvas.get_tk_widget().grid(row=0, column=0, sticky='nsew', padx=5, pady=5)
+    # Axes and line artists are created once and reused for every fit
+    fit_plot = modules["fit_plot"].FitPlot(fig, canvas)
+    canvas.draw_idle()
+
+    startup_timer.mark("ready")
+    if MEASURE_STARTUP:
+        print(startup_timer.report())
+        root.after(0, on_close)
+
+def on_warm_up_error(e):
+    # The error is raised again (and shown) when a button needs the modules
+    plot_placeholder.config(text=f"Could not load the plotting modules: {e}")
+
+def update_data_table():
+    """Syncs the Treeview with DATA_STORE (only changed rows, or the visible window for large data)."""
+    heavy.require()
+    data_table.refresh()
+    show_live_fit()
+
+def show_live_fit():
+    """Shows k and R² of all current points from the store's running statistics (O(1), no refit)."""
+    if len(DATA_STORE) < 2:
+        result_label.config(text="Enter data points and click Calculate.", foreground="black")
+        return
+    try:
+        k, r_squared = DATA_STORE.fit_stats.result()
+    except ValueError as e: # e.g. all points at the same time
+        result_label.config(text=f"Live fit: {e}", foreground="red")
+        return
+    result_label.config(
+        text=f"Live k: {k:.4f} gen/{time_unit_var.get()} (R²: {r_squared:.4f})",
+        foreground="purple"
+    )
 
 def add_data_point():
     """Captures and validates time and concentration inputs, then updates the table/plot."""
@@ -33,10 +95,10 @@ def add_data_point():
         if t < 0 or c <= 0:
             raise ValueError("Time must be non-negative (>=0) and Concentration must be positive (>0).")
 
-        DATA_POINTS.append((t, c))
-        DATA_POINTS.sort(key=lambda x: x[0]) # Keep points sorted by time
+        heavy.require() # No-op once the warm-up has finished
+        DATA_STORE.add(t, c) # Inserted at its sorted position; the live fit statistics are updated
 
-        update_data_table(data_tree)
+        update_data_table()
         # Clear inputs for the next entry
         entry_time_t.delete(0, tk.END)
         entry_conc_N.delete(0, tk.END)
@@ -47,59 +109,31 @@ def add_data_point():
         messagebox.showerror("Error", f"An unexpected error occurred: {e}")
 
 def remove_data_point():
-    """Removes the selected data point from the list."""
-    selected_item = data_tree.selection()
-    if not selected_item:
+    """Removes the selected data point(s) from the store."""
+    selected_items = data_tree.selection()
+    if not selected_items:
         messagebox.showwarning("Selection Error", "Please select a data point to remove.")
         return
 
-    # Get the row index (0-based) from the selected item
-    # Note: data_tree.item()['values'][0] is the displayed index (1-based)
-    # The actual index is determined by finding the matching (t, c) tuple in the sorted list.
-    selected_values = data_tree.item(selected_item)['values']
-    
-    if len(selected_values) < 3:
-        messagebox.showerror("Error", "Invalid row data selected.")
-        return
-
-    # Attempt to find and remove the exact point from DATA_POINTS
-    # Convert displayed strings back to float for lookup
-    time_to_remove = float(selected_values[1])
-    conc_to_remove = float(selected_values[2])
-    
     try:
-        # Find the index of the point that matches both time and concentration
-        # This is more robust than relying on the displayed row index
-        index_to_pop = -1
-        for i, (t, c) in enumerate(DATA_POINTS):
-            # Use a small tolerance check for float matching
-            if abs(t - time_to_remove) < 1e-9 and abs(c - conc_to_remove) < 1e-9:
-                index_to_pop = i
-                break
-        
-        if index_to_pop != -1:
-            DATA_POINTS.pop(index_to_pop)
-            update_data_table(data_tree)
-        else:
-            messagebox.showerror("Error", "Could not find selected point in data list.")
-
+        heavy.require()
+        # Treeview item ids are the stable row ids of DATA_STORE, so no value matching is needed;
+        # each removal downdates the live fit statistics
+        for item in selected_items:
+            DATA_STORE.remove(int(item))
+        update_data_table()
+    except KeyError:
+        messagebox.showerror("Error", "Could not find selected point in data list.")
+        update_data_table()
     except Exception as e:
         messagebox.showerror("Error", f"Could not remove point: {e}")
 
-# Detailed instructions for the user about file format
-FILE_FORMAT_INSTRUCTIONS = (
-    "The file must contain two columns: Time (Column 1) and Concentration (Column 2).\n"
-    "Data must be separated by commas, tabs, or spaces.\n"
-    "Time must be >= 0. Concentration must be > 0 (for log calculation).\n"
-    "Example format:\n"
-    "0, 0.1\n"
-    "1.5, 0.25\n"
-)
+def _load_file_job(job, filepath):
+    """Worker thread: parses the file (or maps its binary sidecar), reporting progress."""
+    return load_growth_data_cached(filepath, progress=lambda fraction: job.progress(fraction, "Loading file..."))
 
 def load_data_from_file():
-    """Opens a file dialog, loads data from the selected file, and updates DATA_POINTS."""
-    global DATA_POINTS
-    
+    """Opens a file dialog and loads the selected file in the background (see on_data_loaded)."""
     # Open file dialog, defaulting to CSV files
     filepath = filedialog.askopenfilename(
         defaultextension=".csv",
@@ -107,134 +141,117 @@ def load_data_from_file():
     )
     if not filepath:
         return # User cancelled the dialog
-
-    new_data_points = []
     try:
-        with open(filepath, 'r') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue # Skip empty lines or comments
-
-                # Attempt to split by comma, tab, or space
-                parts = line.replace('\t', ',').replace(' ', ',').split(',')
-                parts = [p.strip() for p in parts if p.strip()]
-
-                if len(parts) < 2:
-                    messagebox.showwarning("Invalid Input", 
-                                           f"Line {line_num}: Missing data (Time, Concentration). \n\n" + FILE_FORMAT_INSTRUCTIONS)
-                    continue
-
-                try:
-                    t = float(parts[0])
-                    c = float(parts[1])
-                except ValueError:
-                    messagebox.showwarning("Invalid Input", 
-                                           f"Line {line_num}: Data must be valid numbers.\n\n" + FILE_FORMAT_INSTRUCTIONS)
-                    continue
-
-                if t < 0 or c <= 0:
-                    raise ValueError(f"Line {line_num}: Time must be non-negative (>=0) and Concentration must be positive (>0).\n\n" + FILE_FORMAT_INSTRUCTIONS)
-
-                new_data_points.append((t, c))
-
-        if not new_data_points:
-            messagebox.showwarning("Empty File", "The selected file did not contain valid data points.\n\n" + FILE_FORMAT_INSTRUCTIONS)
-            return
-
-        # Success: Clear old data and replace with new data
-        DATA_POINTS = new_data_points
-        DATA_POINTS.sort(key=lambda x: x[0])
-        update_data_table(data_tree)
-        
-        # Clear inputs for the next manual entry
-        entry_time_t.delete(0, tk.END)
-        entry_conc_N.delete(0, tk.END)
-        
-        messagebox.showinfo("Load Successful", f"{len(DATA_POINTS)} data points found and loaded.")
-
-    except ValueError as e:
-        messagebox.showerror("Input/Data Error", str(e))
+        heavy.require()
     except Exception as e:
-        messagebox.showerror("File Loading Error", f"An error occurred: {e}")
+        messagebox.showerror("Error", f"Could not load the data modules: {e}")
+        return
+
+    # Bad lines are skipped and collected into one report (no message box per line);
+    # an unchanged file is reopened from its binary sidecar without parsing
+    load_status.start("Loading file...")
+    worker.submit(_load_file_job, filepath, channel="load", pass_job=True,
+                  on_done=on_data_loaded, on_error=on_load_error, on_progress=load_status.show_progress)
+
+def on_data_loaded(result):
+    """Main thread: puts the loaded points into DATA_STORE and the table."""
+    load_status.finish()
+    times, concentrations, report = result
+
+    if report.n_points == 0:
+        messagebox.showwarning("Empty File", "The selected file did not contain valid data points.\n\n"
+                               + report.summary() + "\n\n" + FILE_FORMAT_INSTRUCTIONS)
+        return
+
+    # Success: Clear old data and replace with new data. A fit still running on the
+    # old data is superseded, so its result never shows up next to the new points
+    if worker.busy("fit"):
+        worker.cancel("fit")
+        fit_status.finish()
+        result_label.config(text="Data changed. Click Calculate to fit.", foreground="black")
+    DATA_STORE.replace(times, concentrations)
+    update_data_table()
+    
+    # Clear inputs for the next manual entry
+    entry_time_t.delete(0, tk.END)
+    entry_conc_N.delete(0, tk.END)
+    
+    if report.ok:
+        messagebox.showinfo("Load Successful", f"{len(DATA_STORE)} data points found and loaded.")
+    else:
+        messagebox.showwarning("Loaded With Warnings", report.summary() + "\n\n" + FILE_FORMAT_INSTRUCTIONS)
+
+def on_load_error(e):
+    load_status.finish()
+    messagebox.showerror("File Loading Error", f"An error occurred: {e}")
+
 
+def _fit_job(times, concentrations):
+    """Worker thread: fits the data and prepares the plot arrays (no Tk or Matplotlib calls)."""
+    # 2. Perform calculation (the result includes the intercept for the fitted line)
+    fit = growth_rate_fit_result(times, concentrations)
+
+    # Log-transformed (and, for long series, LTTB-downsampled) points for the plot
+    return fit, fit_plot.prepare(times, np.log2(concentrations), fit)
 
 def calculate_and_plot():
-    """Performs the multi-point growth rate calculation and generates the plot."""
+    """Starts the multi-point growth rate fit in the background; on_fit_done draws the plot."""
     # Use tk.Label for foreground (fg) support
     # FIX: Cleaned up spacing and ensured 'foreground' is used correctly (Line 75)
     result_label.config(text="Calculating...", foreground="blue") 
     
-    # 1. Prepare data
     try:
-        if len(DATA_POINTS) < 2:
-            messagebox.showwarning("Data Error", "Please enter at least two data points for the fit.")
-            result_label.config(text="Calculation Failed", foreground="red")
-            return
-
-        times = [t for t, c in DATA_POINTS]
-        concentrations = [c for t, c in DATA_POINTS]
-        unit_time = time_unit_var.get()
-
-        # 2. Perform calculation using SciPy fitting
-        k_fit, r_squared = growth_rate_fit(times, concentrations)
-
-        # 3. Update result display
-        result_label.config(
-            text=f"Fitted k: {k_fit:.4f} gen/{unit_time} (R²: {r_squared:.4f})",
-            foreground="purple"
-        )
-
-        # 4. Generate Plot
-        fig.clear()
-        ax = fig.add_subplot(111)
-
-        # Get log-transformed concentrations for plotting the linear fit
-        log2_concentrations = np.log2(concentrations)
-
-        # Plot the data points
-        ax.plot(times, log2_concentrations, 'o', label='Data Points (log2(N))')
-
-        # Calculate the linear fit line (y = kx + b)
-        # We need the intercept for the line equation, which is not returned by growth_rate_fit
-        # We re-run linregress just to get the intercept for the plot line
-        
-        # Check for the zero variance case before running linregress for the plot line
-        if np.all(log2_concentrations == log2_concentrations[0]):
-            slope = 0.0
-            intercept = log2_concentrations[0]
-        else:
-            slope, intercept, _, _, _ = linregress(times, log2_concentrations)
-        
-        # Create a line of best fit for plotting
-        x_fit = np.linspace(min(times), max(times), 100)
-        y_fit = slope * x_fit + intercept
-
-        # Plot the fitted line
-        ax.plot(x_fit, y_fit, 'r-', label=f'Linear Fit (k={k_fit:.4f})')
-
-        # Set plot labels and title
-        ax.set_xlabel(f"Time ({unit_time})")
-        ax.set_ylabel("Log₂ Concentration (log₂(N))")
-        ax.set_title(f"Growth Curve Linear Fit (k={k_fit:.4f})")
-        ax.legend()
-        ax.grid(True, linestyle='--', alpha=0.6)
-
-        # Redraw the canvas
-        canvas.draw()
+        heavy.require()
+    except Exception as e:
+        messagebox.showerror("Error", f"Could not load the fitting modules: {e}")
+        result_label.config(text="Calculation Failed", foreground="red")
+        return
 
-    except ValueError as e:
-        messagebox.showerror("Input Error", str(e))
+    # 1. Prepare data
+    if len(DATA_STORE) < 2:
+        messagebox.showwarning("Data Error", "Please enter at least two data points for the fit.")
         result_label.config(text="Calculation Failed", foreground="red")
-    except Exception as e:
+        return
+
+    # Snapshot the columns: the store may change while the worker runs
+    times = DATA_STORE.times.copy()
+    concentrations = DATA_STORE.concentrations.copy()
+    unit_time = time_unit_var.get()
+
+    fit_status.start("Fitting...")
+    worker.submit(_fit_job, times, concentrations, channel="fit",
+                  on_done=lambda result: on_fit_done(result, unit_time), on_error=on_fit_error)
+
+def on_fit_done(result, unit_time):
+    """Main thread: shows the fit result and updates the plot."""
+    fit_status.finish()
+    fit, prepared = result
+
+    # 3. Update result display
+    result_label.config(
+        text=f"Fitted k: {fit.k:.4f} gen/{unit_time} (R²: {fit.r_squared:.4f})",
+        foreground="purple"
+    )
+
+    # 4. Update the existing plot artists (set_data + blitting, no figure rebuild)
+    fit_plot.show(prepared, unit_time)
+
+def on_fit_error(e):
+    fit_status.finish()
+    if isinstance(e, ValueError):
+        messagebox.showerror("Input Error", str(e))
+    else:
         messagebox.showerror("Error", f"An unexpected error occurred: {e}")
-        result_label.config(text="Calculation Failed", foreground="red")
+    result_label.config(text="Calculation Failed", foreground="red")
 
 
 # --- Defining the Graphical User Interface (GUI) ---
 
 root = tk.Tk()
 root.title("Microbial Growth Rate Calculator (SciPy Fit)")
+
+# Background threads for loading and fitting; results come back through the Tk event loop
+worker = TkWorker(root)
 # Configure grid layout manager
 root.grid_columnconfigure(0, weight=1)
 root.grid_columnconfigure(1, weight=1)
@@ -281,6 +298,10 @@ time_unit_combo.set(ALLOWED_TIME_UNITS[0]) # Ensure default is set
 load_button = ttk.Button(entry_frame, text="Load Data from File (.csv/.txt)", command=load_data_from_file)
 load_button.grid(row=2, column=2, columnspan=2, padx=5, pady=5, sticky='ew')
 
+# Progress indicator and Cancel button for file loading (its own channel, next to the fit's)
+load_status = WorkerStatus(entry_frame, worker, channel="load")
+load_status.grid(row=3, column=2, columnspan=2, padx=5, pady=5, sticky='ew')
+
 
 # Frame for the Data Table (middle left)
 table_frame = ttk.LabelFrame(root, text="2. Data Points")
@@ -300,10 +321,10 @@ data_tree.grid(row=0, column=0, sticky='nsew', padx=5, pady=5)
 
 # Add Scrollbar
 tree_scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=data_tree.yview)
-data_tree.configure(yscrollcommand=tree_scrollbar.set)
 tree_scrollbar.grid(row=0, column=1, sticky='ns')
 
 
+
 # Frame for Calculation Button and Result (middle right)
 calc_frame = ttk.Frame(root)
 calc_frame.grid(row=1, column=1, padx=10, pady=5, sticky='nsew')
@@ -317,6 +338,10 @@ calculate_button.grid(row=0, column=0, pady=10, padx=5, sticky='ew')
 result_label = tk.Label(calc_frame, text="Enter data points and click Calculate.", font=('Arial', 10, 'bold'))
 result_label.grid(row=1, column=0, pady=5, padx=5, sticky='ew')
 
+# Progress indicator and Cancel button for the background fit
+fit_status = WorkerStatus(calc_frame, worker, channel="fit")
+fit_status.grid(row=2, column=0, pady=5, padx=5, sticky='ew')
+
 
 # Frame for Plot (bottom)
 plot_frame = ttk.LabelFrame(root, text="4. Growth Curve Fit")
@@ -325,23 +350,26 @@ plot_frame.grid_columnconfigure(0, weight=1)
 plot_frame.grid_rowconfigure(0, weight=1)
 
 
-# Matplotlib figure and canvas
-fig = plt.figure(figsize=(6, 4), dpi=100)
-# Create a dummy plot to initialize the canvas properly
-ax_dummy = fig.add_subplot(111)
-ax_dummy.text(0.5, 0.5, 'Click "Calculate & Plot" to see results.', 
-              horizontalalignment='center', verticalalignment='center', 
-              transform=ax_dummy.transAxes)
-ax_dummy.set_title("Growth Curve Fit")
-ax_dummy.set_xlabel("Time")
-ax_dummy.set_ylabel("Log₂ Concentration")
-ax_dummy.grid(True, linestyle='--', alpha=0.6)
+# Placeholder until Matplotlib is loaded (replaced by the canvas in on_modules_ready)
+plot_placeholder = ttk.Label(plot_frame, text="Loading plotting library...", anchor='center')
+plot_placeholder.grid(row=0, column=0, sticky='nsew', padx=5, pady=5)
+
+
+def on_close():
+    worker.shutdown()
+    root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", on_close)
 
+# Startup: the window is drawn first, then the heavy modules load in the background
+startup_timer = StartupTimer(STARTUP_START)
+heavy = HeavyImports(HEAVY_MODULES, on_ready=on_modules_ready)
 
-canvas = FigureCanvasTkAgg(fig, master=plot_frame)
-canvas_widget = canvas.get_tk_widget()
-canvas_widget.grid(row=0, column=0, sticky='nsew', padx=5, pady=5)
+def on_window_shown():
+    startup_timer.mark("window")
+    heavy.start_warm_up(worker, on_error=on_warm_up_error)
 
+root.after_idle(on_window_shown)
 
 # Start the GUI event loop
 root.mainloop()
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""gui_startup.py
+
+Fast startup for the Tkinter GUI.
+
+Importing Matplotlib with the TkAgg backend, NumPy and the fitting modules
+takes a second or more (several on slow machines), and the window only appears
+after the imports finish. The GUI therefore imports only tkinter and the
+small helper modules up front, builds its window, and lets `HeavyImports` load
+the rest:
+
+- in a background warm-up thread started as soon as the window is shown, or
+- synchronously on first use (`require()`), if the user clicks before the
+  warm-up has finished.
+
+`StartupTimer` records when the window appeared and when the warm-up finished;
+run the GUI with --measure-startup to print the timings as JSON and exit, so
+startup time can be tracked across releases.
+
+Example:
+    heavy = HeavyImports(["numpy", "fit_plot"], on_ready=build_plot)
+    root.after_idle(lambda: heavy.start_warm_up(worker))
+    ...
+    def calculate():
+        modules = heavy.require()
+"""
+import importlib
+import json
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+# Modules whose presence at window time means startup was not lazy
+HEAVY_MODULE_NAMES = ("numpy", "scipy", "matplotlib")
+
+
+class HeavyImports:
+    """
+    Loads a list of slow modules once, in the background or on demand.
+
+    Args:
+        names (Iterable[str]): Module names, imported in order.
+        on_ready (Callable): Called once on the main thread with {name: module}
+            when all modules are loaded (from the warm-up or from `require`).
+    """
+
+    def __init__(self, names: Iterable[str], on_ready: Optional[Callable[[Dict[str, object]], None]] = None):
+        self.names = list(names)
+        self.on_ready = on_ready
+        self.modules: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return len(self.modules) == len(self.names)
+
+    def _import_all(self) -> Dict[str, object]:
+        # importlib serializes imports of the same module between threads, so the
+        # warm-up thread and a `require` on the main thread never import twice
+        return {name: importlib.import_module(name) for name in self.names}
+
+    def _finish(self, modules: Dict[str, object]) -> Dict[str, object]:
+        """Main thread: stores the modules and runs on_ready exactly once."""
+        with self._lock:
+            if self.ready:
+                return self.modules
+            self.modules = modules
+        if self.on_ready is not None:
+            self.on_ready(modules)
+        return modules
+
+    def start_warm_up(self, worker, on_error: Optional[Callable] = None) -> None:
+        """Imports the modules on a `TkWorker` thread; on_ready runs when they are loaded."""
+        if not self.ready:
+            worker.submit(self._import_all, channel="warm-up", on_done=self._finish, on_error=on_error)
+
+    def require(self) -> Dict[str, object]:
+        """
+        Returns the loaded modules, importing them now if the warm-up has not finished
+        (waits for a module the warm-up thread is importing at this moment).
+        """
+        if self.ready:
+            return self.modules
+        return self._finish(self._import_all())
+
+
+class StartupTimer:
+    """
+    Wall-clock marks since `start` (default: creation of the timer).
+
+    Args:
+        start (float): A `time.perf_counter()` value taken as early as possible in the script.
+    """
+
+    def __init__(self, start: Optional[float] = None):
+        self.start = time.perf_counter() if start is None else start
+        self.marks: Dict[str, float] = {}
+        self.heavy_loaded: Dict[str, bool] = {}
+
+    def mark(self, name: str) -> float:
+        """Records the seconds elapsed until now under `name` (and which heavy modules were loaded)."""
+        elapsed = time.perf_counter() - self.start
+        self.marks[name] = round(elapsed, 4)
+        self.heavy_loaded[name] = any(module in sys.modules for module in HEAVY_MODULE_NAMES)
+        return elapsed
+
+    def report(self) -> str:
+        """JSON line with the marks, e.g. {"seconds": {"window": 0.08, "ready": 0.9}, ...}."""
+        return json.dumps({"seconds": self.marks, "heavy_modules_loaded": self.heavy_loaded})
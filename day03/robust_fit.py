@@ -0,0 +1,278 @@
+"""robust_fit.py
+
+Outlier-resistant line fits used by `calculator_logic.growth_rate_fit(method=...)`.
+
+- theil_sen(x, y): median of all pairwise slopes, found in O(n log n)-style
+  time without materializing the O(n^2) pairs (randomized slope selection).
+- ransac(x, y): random two-point consensus with a least-squares refit on the
+  inliers, for data with more outliers than Theil-Sen tolerates (~29%).
+
+Only NumPy is required.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Pairs in the current slope interval are enumerated explicitly once there are
+# at most this many (times n, with a floor for small inputs).
+_ENUMERATE_PER_POINT = 8
+_ENUMERATE_MIN = 50_000
+
+
+def _merge_passes(seq: np.ndarray):
+    """
+    Bottom-up merge sort of an integer permutation that records, for every pass,
+    which left-block elements are greater than each right-block element.
+
+    Every inversion (i < j with seq[i] > seq[j]) is recorded exactly once, so the
+    result can count, enumerate or uniformly sample inversions without ever
+    building all pairs.
+
+    Returns:
+        Tuple: (counts, first, left_ids, right_ids) concatenated over all passes:
+        right element right_ids[m] is inverted with left_ids[first[m] : first[m] + counts[m]].
+    """
+    n = seq.size
+    values = seq.astype(np.int64)
+    ids = np.arange(n)
+    position = np.arange(n)
+    counts, first, left_ids, right_ids = [], [], [], []
+    left_offset = 0
+
+    width = 1
+    while width < n:
+        block = position // width
+        pair = block // 2
+        keys = pair * n + values
+        is_right = (block % 2) == 1
+
+        left_keys = keys[~is_right]
+        right_keys = keys[is_right]
+        right_pair = pair[is_right]
+        # Left blocks are sorted and ordered by pair, so one searchsorted handles all blocks
+        left_end = np.searchsorted(left_keys, (right_pair + 1) * n, side='left')
+        first_greater = np.searchsorted(left_keys, right_keys, side='right')
+
+        counts.append(left_end - first_greater)
+        first.append(first_greater + left_offset)
+        left_ids.append(ids[~is_right])
+        right_ids.append(ids[is_right])
+        left_offset += left_keys.size
+
+        # Merge neighbouring blocks (two sorted runs each, cheap for a stable sort)
+        order = np.argsort(keys, kind='stable')
+        values = values[order]
+        ids = ids[order]
+        width *= 2
+
+    if not counts:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, empty
+    return (np.concatenate(counts), np.concatenate(first),
+            np.concatenate(left_ids), np.concatenate(right_ids))
+
+
+def _pick_inversions(passes, index: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the inversions with the given global indices as (left ids, right ids)."""
+    counts, first, left_ids, right_ids = passes
+    ends = np.cumsum(counts)
+    owner = np.searchsorted(ends, index, side='right')
+    offset = index - (ends[owner] - counts[owner])
+    return left_ids[first[owner] + offset], right_ids[owner]
+
+
+def _ranks(x: np.ndarray, y: np.ndarray, bound: Tuple[float, bool]) -> np.ndarray:
+    """
+    Rank of every point by y - theta * x for bound = (theta, inclusive).
+
+    Points are pre-sorted by (x, y), so for i < j the pair is inverted exactly
+    when its slope is < theta (<= theta if inclusive, i.e. just above theta);
+    pairs with equal x are never inverted.
+    """
+    theta, inclusive = bound
+    n = x.size
+    index = np.arange(n)
+    if theta == -np.inf:
+        return index
+    if theta == np.inf:
+        order = np.lexsort((index, y, -x))
+    elif inclusive:
+        # Just above theta, ties in y - theta * x are ordered by decreasing x
+        order = np.lexsort((index, -x, y - theta * x))
+    else:
+        order = np.argsort(y - theta * x, kind='stable')
+    ranks = np.empty(n, dtype=np.int64)
+    ranks[order] = index
+    return ranks
+
+
+def _slope_interval(x, y, lo: Tuple[float, bool], hi: Tuple[float, bool]):
+    """Inversion structure whose inversions are exactly the pairs with lo <= slope < hi."""
+    order_lo = np.argsort(_ranks(x, y, lo))
+    passes = _merge_passes(_ranks(x, y, hi)[order_lo])
+    return passes, order_lo
+
+
+def _count_below(x, y, bound: Tuple[float, bool]) -> int:
+    """Number of pairwise slopes strictly below the bound."""
+    return int(_merge_passes(_ranks(x, y, bound))[0].sum())
+
+
+def _select_slopes(x: np.ndarray, y: np.ndarray, k_low: int, k_high: int,
+                   rng: np.random.Generator) -> np.ndarray:
+    """
+    Returns the k_low-th .. k_high-th smallest pairwise slopes (0-based, pairs with
+    equal x excluded) by randomized interval shrinking: sample slopes inside the
+    current interval, narrow it around the target ranks, and enumerate the few
+    remaining pairs once the interval is small.
+
+    Interval bounds are (theta, inclusive) tuples, where (theta, True) sits just
+    above theta, so repeated slope values can be split off exactly.
+    """
+    n = x.size
+    lo, hi = (-np.inf, False), (np.inf, False)
+    below_lo = 0
+    passes, order_lo = _slope_interval(x, y, lo, hi)
+    inside = int(passes[0].sum())
+    limit = max(_ENUMERATE_PER_POINT * n, _ENUMERATE_MIN)
+
+    while inside > limit:
+        m = n
+        sample = np.sort(_pair_slopes(x, y, passes, order_lo, rng.integers(0, inside, size=m)))
+        spread = 3.0 * np.sqrt(m)
+        low_pos = int(np.floor((k_low - below_lo) / inside * m - spread))
+        high_pos = int(np.ceil((k_high - below_lo) / inside * m + spread))
+        new_lo = (sample[low_pos], False) if low_pos >= 0 else lo
+        new_hi = (sample[high_pos], True) if high_pos < m else hi
+
+        new_below_lo = below_lo if new_lo == lo else _count_below(x, y, new_lo)
+        passes_new, order_new = _slope_interval(x, y, new_lo, new_hi)
+        new_inside = int(passes_new[0].sum())
+        if not (new_below_lo <= k_low and k_high < new_below_lo + new_inside):
+            continue  # Unlucky sample; draw again from the same interval
+        if new_lo[0] == new_hi[0]:
+            # Only one (heavily repeated) slope value is left
+            return np.full(k_high - k_low + 1, new_lo[0])
+        if new_inside == inside:
+            # No progress: the interval is dominated by repeated slope values,
+            # so split it at a sampled value instead.
+            pivot = sample[m // 2]
+            below_pivot = _count_below(x, y, (pivot, False))
+            through_pivot = _count_below(x, y, (pivot, True))
+            if below_pivot <= k_low and k_high < through_pivot:
+                return np.full(k_high - k_low + 1, pivot)
+            if k_low < below_pivot <= k_high or k_low < through_pivot <= k_high:
+                # The targets straddle the pivot value: resolve them one at a time
+                return np.array([_select_slopes(x, y, k, k, rng)[0] for k in range(k_low, k_high + 1)])
+            if k_high < below_pivot:
+                new_hi = (pivot, False)
+            else:
+                new_lo, new_below_lo = (pivot, True), through_pivot
+            passes_new, order_new = _slope_interval(x, y, new_lo, new_hi)
+            new_inside = int(passes_new[0].sum())
+        lo, hi, below_lo = new_lo, new_hi, new_below_lo
+        passes, order_lo, inside = passes_new, order_new, new_inside
+
+    slopes = np.sort(_pair_slopes(x, y, passes, order_lo, np.arange(inside)))
+    return slopes[k_low - below_lo:k_high - below_lo + 1]
+
+
+def _pair_slopes(x, y, passes, order_lo, index):
+    """Slopes of the inversions with the given indices (ids refer to lo-rank order)."""
+    left, right = _pick_inversions(passes, index)
+    i = order_lo[left]
+    j = order_lo[right]
+    return (y[j] - y[i]) / (x[j] - x[i])
+
+
+def theil_sen(x, y, seed: Optional[int] = 0) -> Tuple[float, float]:
+    """
+    Theil-Sen line: slope = median of all pairwise slopes (pairs with equal x
+    are skipped), intercept = median of y - slope * x.
+
+    Args:
+        x (array-like): Independent values.
+        y (array-like): Dependent values.
+        seed (Optional[int]): Seed for the randomized selection (the result does
+            not depend on it, only the running time does).
+
+    Returns:
+        Tuple[float, float]: (slope, intercept).
+
+    Raises:
+        ValueError: If all x values are identical.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    order = np.lexsort((y, x))
+    x, y = x[order], y[order]
+
+    # Number of usable pairs: all pairs minus those sharing an x value
+    _, group_sizes = np.unique(x, return_counts=True)
+    n_pairs = x.size * (x.size - 1) // 2 - int((group_sizes * (group_sizes - 1) // 2).sum())
+    if n_pairs == 0:
+        raise ValueError("Time points must not all be identical.")
+
+    rng = np.random.default_rng(seed)
+    if n_pairs % 2:
+        slope = _select_slopes(x, y, n_pairs // 2, n_pairs // 2, rng)[0]
+    else:
+        slope = _select_slopes(x, y, n_pairs // 2 - 1, n_pairs // 2, rng).mean()
+    intercept = np.median(y - slope * x)
+    return float(slope), float(intercept)
+
+
+def ransac(x, y, residual_threshold: Optional[float] = None, n_trials: int = 500,
+           seed: Optional[int] = 0) -> Tuple[float, float, np.ndarray]:
+    """
+    RANSAC line: the two-point model with the most inliers wins, and the final
+    line is a least-squares refit on its inliers. All trial models are scored
+    in one vectorized pass.
+
+    Args:
+        x (array-like): Independent values.
+        y (array-like): Dependent values.
+        residual_threshold (Optional[float]): Maximum absolute residual of an inlier.
+            Defaults to 3 robust standard deviations of the Theil-Sen residuals.
+        n_trials (int): Number of random two-point models.
+        seed (Optional[int]): Seed for reproducible fits.
+
+    Returns:
+        Tuple[float, float, np.ndarray]: (slope, intercept, inlier mask).
+
+    Raises:
+        ValueError: If all x values are identical.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if np.all(x == x[0]):
+        raise ValueError("Time points must not all be identical.")
+
+    if residual_threshold is None:
+        slope, intercept = theil_sen(x, y, seed)
+        residuals = y - (intercept + slope * x)
+        mad = np.median(np.abs(residuals - np.median(residuals)))
+        residual_threshold = 3.0 * 1.4826 * mad
+        if residual_threshold == 0.0:
+            residual_threshold = np.finfo(float).eps * max(1.0, np.abs(y).max())
+
+    # 1. Random two-point models (pairs with equal x are skipped)
+    rng = np.random.default_rng(seed)
+    i = rng.integers(0, x.size, size=n_trials)
+    j = rng.integers(0, x.size, size=n_trials)
+    ok = x[i] != x[j]
+    i, j = i[ok], j[ok]
+    slopes = (y[j] - y[i]) / (x[j] - x[i])
+    intercepts = y[i] - slopes * x[i]
+
+    # 2. Score all models at once and keep the one with the most inliers
+    inliers = np.abs(y - (intercepts[:, np.newaxis] + slopes[:, np.newaxis] * x)) <= residual_threshold
+    best = inliers[np.argmax(inliers.sum(axis=1))] if slopes.size else np.ones(x.size, dtype=bool)
+
+    # 3. Least-squares refit on the inliers (fall back to all points if degenerate)
+    if best.sum() < 2 or np.all(x[best] == x[best][0]):
+        best = np.ones(x.size, dtype=bool)
+    dx = x[best] - x[best].mean()
+    slope = float(dx @ (y[best] - y[best].mean()) / (dx @ dx))
+    intercept = float(y[best].mean() - slope * x[best].mean())
+    return slope, intercept, best
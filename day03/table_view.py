@@ -0,0 +1,171 @@
+"""table_view.py
+
+Keeps the GUI's data Treeview in sync with a `GrowthDataStore` without
+rebuilding it.
+
+- Diff mode (small datasets): only rows whose ids appeared or disappeared
+  are inserted or deleted; the "#" column is renumbered from the first change.
+- Virtual mode (more than `virtual_threshold` points): the Treeview only holds
+  the rows that fit on screen. The scrollbar and mouse wheel move a window over
+  the store, and the visible rows are fetched on every scroll, so a table of
+  10^6 points costs the same as one of 50.
+
+Item ids are the store's row ids in both modes, so `Treeview.selection()`
+still maps directly to `GrowthDataStore.remove`.
+"""
+import tkinter as tk
+from tkinter import ttk
+from typing import List, Tuple
+
+import numpy as np
+
+from data_store import GrowthDataStore
+
+DEFAULT_VIRTUAL_THRESHOLD = 5000
+
+
+def diff_rows(old_ids, new_ids) -> Tuple[List[int], List[Tuple[int, int]], int]:
+    """
+    Computes the Treeview edits that turn `old_ids` into `new_ids`.
+
+    Both sequences must list the surviving ids in the same relative order
+    (true for the store: points never move relative to each other).
+
+    Returns:
+        Tuple: (ids to delete, (position, id) inserts in ascending position order,
+        first position whose "#" label changed (len(new_ids) if none)).
+    """
+    old_ids = np.asarray(old_ids, dtype=np.int64)
+    new_ids = np.asarray(new_ids, dtype=np.int64)
+    deleted_positions = np.flatnonzero(~np.isin(old_ids, new_ids))
+    inserted_positions = np.flatnonzero(~np.isin(new_ids, old_ids))
+    inserts = list(zip(inserted_positions.tolist(), new_ids[inserted_positions].tolist()))
+
+    # Rows in front of the first insert or delete keep their position
+    first_change = new_ids.size
+    for positions in (deleted_positions, inserted_positions):
+        if positions.size:
+            first_change = min(first_change, int(positions[0]))
+    deleted = old_ids[deleted_positions]
+    return deleted.tolist(), inserts, first_change
+
+
+def _row_values(position: int, t: float, c: float) -> tuple:
+    return (position + 1, f"{t:.2f}", f"{c:.2f}")
+
+
+class GrowthTable:
+    """
+    Treeview adapter for a `GrowthDataStore` with diff-based and virtualized updates.
+
+    Args:
+        tree: ttk.Treeview with the columns ("Index", "Time", "Concentration").
+        scrollbar: Vertical ttk.Scrollbar next to the tree.
+        store (GrowthDataStore): The data shown in the table.
+        virtual_threshold (int): Above this many points the table is virtualized.
+    """
+
+    def __init__(self, tree, scrollbar, store: GrowthDataStore,
+                 virtual_threshold: int = DEFAULT_VIRTUAL_THRESHOLD):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.store = store
+        self.virtual_threshold = virtual_threshold
+        self.virtual = False
+        self.offset = 0  # First store position shown in virtual mode
+        self._connect_scrolling(virtual=False)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tree.bind(sequence, self._on_wheel, add="+")
+        tree.bind("<Configure>", lambda event: self.virtual and self._render_window(), add="+")
+
+    def _connect_scrolling(self, virtual: bool) -> None:
+        if virtual:
+            self.tree.configure(yscrollcommand="")
+            self.scrollbar.configure(command=self._on_scrollbar)
+        else:
+            self.tree.configure(yscrollcommand=self.scrollbar.set)
+            self.scrollbar.configure(command=self.tree.yview)
+        self.virtual = virtual
+
+    def visible_rows(self) -> int:
+        """Number of rows that fit in the tree (at least 10)."""
+        try:
+            row_height = int(ttk.Style(self.tree).lookup("Treeview", "rowheight") or 20)
+        except (tk.TclError, ValueError):
+            row_height = 20
+        return max(10, int(self.tree.winfo_height()) // max(row_height, 1))
+
+    def refresh(self) -> None:
+        """Brings the tree in line with the store (call after every add, remove or load)."""
+        virtual = len(self.store) > self.virtual_threshold
+        if virtual != self.virtual:
+            self._connect_scrolling(virtual)
+        if virtual:
+            self._render_window()
+        else:
+            self._apply_diff()
+
+    def _apply_diff(self) -> None:
+        old_ids = [int(item) for item in self.tree.get_children()]
+        ids = self.store.ids
+        deleted, inserts, first_change = diff_rows(old_ids, ids)
+        if deleted:
+            self.tree.delete(*map(str, deleted))
+
+        times = self.store.times
+        concentrations = self.store.concentrations
+        for position, row_id in inserts:
+            self.tree.insert('', position, iid=str(row_id),
+                             values=_row_values(position, times[position], concentrations[position]))
+
+        # Renumber the "#" column behind the first change only
+        inserted = {position for position, _ in inserts}
+        for position in range(first_change, ids.size):
+            if position not in inserted:
+                self.tree.set(str(ids[position]), "Index", position + 1)
+
+    def scroll_to(self, offset: int) -> None:
+        """Virtual mode: shows the rows starting at store position `offset`."""
+        self.offset = offset
+        self._render_window()
+
+    def _render_window(self) -> None:
+        n_rows = self.visible_rows()
+        n = len(self.store)
+        self.offset = max(0, min(self.offset, n - n_rows))
+        stop = min(n, self.offset + n_rows)
+
+        selected = set(self.tree.selection())
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        ids = self.store.ids[self.offset:stop].tolist()
+        times = self.store.times[self.offset:stop].tolist()
+        concentrations = self.store.concentrations[self.offset:stop].tolist()
+        for i, (row_id, t, c) in enumerate(zip(ids, times, concentrations)):
+            self.tree.insert('', 'end', iid=str(row_id), values=_row_values(self.offset + i, t, c))
+        keep = [str(row_id) for row_id in ids if str(row_id) in selected]
+        if keep:
+            self.tree.selection_set(keep)
+
+        if n:
+            self.scrollbar.set(self.offset / n, stop / n)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_scrollbar(self, action, amount, unit=None) -> None:
+        n_rows = self.visible_rows()
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.store)))
+        elif action == "scroll":
+            step = n_rows if unit == "pages" else 1
+            self.scroll_to(self.offset + int(amount) * step)
+
+    def _on_wheel(self, event):
+        if not self.virtual:
+            return None
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"
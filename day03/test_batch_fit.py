@@ -0,0 +1,85 @@
+import json
+
+import numpy as np
+import pytest
+
+from batch_fit import fit_file, main, read_growth_file
+
+
+def _write_curve(path, k, n=6):
+    """Writes a perfect exponential curve with growth rate k in the two-column file format."""
+    lines = ["# Time, Concentration"]
+    lines += [f"{t}, {0.1 * 2 ** (k * t)}" for t in range(n)]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_read_growth_file_mixed_delimiters(tmp_path):
+    """Test that commas, tabs and spaces are accepted and comments are skipped."""
+    path = tmp_path / "data.txt"
+    path.write_text("# header\n0, 0.1\n1.5\t0.25\n\n3.0 0.5\n")
+    times, concentrations = read_growth_file(str(path))
+    assert times == [0.0, 1.5, 3.0]
+    assert concentrations == [0.1, 0.25, 0.5]
+
+
+def test_fit_file_reports_errors_instead_of_raising(tmp_path):
+    """Test that a bad file produces an error entry rather than an exception."""
+    path = tmp_path / "bad.csv"
+    path.write_text("0, 0.1\n1, -0.2\n")
+    result = fit_file(str(path))
+    assert result["k"] is None
+    assert "Line 2" in result["error"]
+
+
+def test_main_streams_jsonl_with_process_pool(tmp_path):
+    """Test the CLI end to end with two workers and JSON-lines output."""
+    for i, k in enumerate([0.5, 1.0, 2.0]):
+        _write_curve(tmp_path / f"well_{i}.csv", k)
+    output = tmp_path / "results.jsonl"
+    exit_code = main([str(tmp_path), "--output", str(output), "--workers", "2", "--chunksize", "1"])
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert exit_code == 0
+    assert len(results) == 3
+    rates = sorted(r["k"] for r in results)
+    assert np.allclose(rates, [0.5, 1.0, 2.0])
+
+
+def test_main_plate_mode_fits_every_well(tmp_path):
+    """Test that --plate writes one row per well with growth_rate_fit's k."""
+    lines = ["Time,A1,A2,A3"]
+    lines += [f"{t},{0.1 * 2 ** (0.5 * t)},{0.1 * 2 ** (2.0 * t)},{'' if t else 0.1}" for t in range(6)]
+    (tmp_path / "plate.csv").write_text("\n".join(lines) + "\n")
+    output = tmp_path / "results.jsonl"
+    exit_code = main([str(tmp_path), "--plate", "--output", str(output), "--workers", "1"])
+    results = {r["well"]: r for r in map(json.loads, output.read_text().splitlines())}
+    assert exit_code == 1  # A3 has a single point
+    assert np.isclose(results["A1"]["k"], 0.5)
+    assert np.isclose(results["A2"]["k"], 2.0)
+    assert results["A3"]["k"] is None and results["A3"]["n_points"] == 1
+
+
+def test_main_writes_data_sidecars_only_when_asked(tmp_path):
+    """Test that the data directory is left untouched unless --data-cache is given."""
+    data = tmp_path / "data"
+    data.mkdir()
+    _write_curve(data / "well.csv", 1.0)
+    output = tmp_path / "results.csv"
+    assert main([str(data), "--output", str(output), "--workers", "1"]) == 0
+    assert sorted(p.name for p in data.iterdir()) == ["well.csv"]
+    assert main([str(data), "--output", str(output), "--workers", "1", "--data-cache"]) == 0
+    assert ".well.csv.growth.npy" in [p.name for p in data.iterdir()]
+
+
+def test_main_plate_mode_uses_fit_cache(tmp_path, capsys):
+    """Test that --plate fills --cache-dir and rejects --data-cache."""
+    data = tmp_path / "data"
+    data.mkdir()
+    lines = ["Time,A1"] + [f"{t},{0.1 * 2 ** (0.5 * t)}" for t in range(6)]
+    (data / "plate.csv").write_text("\n".join(lines) + "\n")
+    cache_dir = tmp_path / "fits"
+    output = tmp_path / "results.jsonl"
+    assert main([str(data), "--plate", "--cache-dir", str(cache_dir), "--output", str(output), "--workers", "1"]) == 0
+    assert len(list(cache_dir.glob("*.pkl"))) == 1
+    with pytest.raises(SystemExit):
+        main([str(data), "--plate", "--data-cache"])
+    assert "--data-cache" in capsys.readouterr().err
@@ -1,5 +1,16 @@
 import pytest
-from calculator_logic import growth_rate, growth_rate_fit
+from calculator_logic import (
+    GrowthRateAccumulator,
+    growth_rate,
+    growth_rate_batch,
+    growth_rate_bootstrap_ci,
+    growth_rate_fit,
+    growth_rate_fit_batch,
+    growth_rate_fit_result,
+    growth_rate_fit_stats,
+    max_growth_rate,
+    segment_growth_phases,
+)
 import numpy as np
 
 # --- Tests for the single-point growth_rate function ---
@@ -36,7 +47,39 @@ def test_growth_rate_negative_nt_raises_value_error():
     with pytest.raises(ValueError, match="All parameters.*must be positive"):
         growth_rate(N_t=-100.0, N_0=50.0, t=5.0)
 
-# --- Tests for the multi-point growth_rate_fit function (SciPy) ---
+# --- Tests for the vectorized growth_rate_batch function ---
+
+def test_growth_rate_batch_matches_scalar():
+    """Test that the batch version gives the same k as the scalar function."""
+    rng = np.random.default_rng(0)
+    N_t = rng.uniform(0.1, 100.0, size=1000)
+    N_0 = rng.uniform(0.1, 100.0, size=1000)
+    t = rng.uniform(0.1, 10.0, size=1000)
+    k, valid = growth_rate_batch(N_t, N_0, t)
+    expected = [growth_rate(a, b, c) for a, b, c in zip(N_t, N_0, t)]
+    assert valid.all()
+    assert np.allclose(k, expected, rtol=1e-12, atol=1e-12)
+
+def test_growth_rate_batch_broadcasts_plate_against_times():
+    """Test that a (wells x 1) plate broadcasts against a row of time intervals."""
+    N_0 = 10.0
+    N_t = np.array([[20.0], [40.0]])
+    t = np.array([1.0, 2.0])
+    k, valid = growth_rate_batch(N_t, N_0, t)
+    assert k.shape == (2, 2)
+    assert np.allclose(k, [[1.0, 0.5], [2.0, 1.0]])
+    assert valid.all()
+
+def test_growth_rate_batch_masks_invalid_elements():
+    """Test that bad values are flagged in the mask (k=NaN) instead of raising."""
+    k, valid = growth_rate_batch([100.0, 100.0, -1.0, 100.0, np.nan],
+                                 [50.0, 0.0, 50.0, 50.0, 50.0],
+                                 [1.0, 1.0, 1.0, 0.0, 1.0])
+    assert valid.tolist() == [True, False, False, False, False]
+    assert k[0] == 1.0
+    assert np.isnan(k[1:]).all()
+
+# --- Tests for the multi-point growth_rate_fit function ---
 
 def test_growth_rate_fit_perfect_data_k1():
     """Test perfect linear data where k should be 1.0."""
@@ -82,4 +125,288 @@ def test_growth_rate_fit_non_positive_concentration():
     times = [0, 1, 2]
     concentrations = [1.0, 2.0, -4.0] # Negative concentration
     with pytest.raises(ValueError, match="All concentration points must be positive"):
-        growth_rate_fit(times, concentrations)
\ No newline at end of file
+        growth_rate_fit(times, concentrations)
+
+def test_growth_rate_fit_identical_time_points():
+    """Test that identical time points raise ValueError (like scipy.stats.linregress), not k=NaN."""
+    with pytest.raises(ValueError, match="all x values are identical"):
+        growth_rate_fit([1.0, 1.0, 1.0], [1.0, 2.0, 4.0])
+
+def test_growth_rate_fit_matches_scipy_linregress():
+    """Test that the NumPy closed form gives the same numbers as scipy.stats.linregress."""
+    from scipy.stats import linregress
+    times = [0.0, 1.0, 2.0, 3.0, 4.0]
+    concentrations = [10.0, 14.5, 21.0, 30.0, 43.0]
+    expected = linregress(times, np.log2(concentrations))
+    k, r2 = growth_rate_fit(times, concentrations)
+    assert k == expected.slope
+    assert r2 == expected.rvalue ** 2
+
+def test_growth_rate_fit_result_includes_intercept():
+    """Test that the full result matches growth_rate_fit and carries the line's intercept."""
+    from scipy.stats import linregress
+    times = [0.0, 1.0, 2.0, 3.0, 4.0]
+    concentrations = [10.0, 14.5, 21.0, 30.0, 43.0]
+    fit = growth_rate_fit_result(times, concentrations)
+    expected = linregress(times, np.log2(concentrations))
+    assert (fit.k, fit.r_squared) == growth_rate_fit(times, concentrations)
+    assert fit.intercept == expected.intercept
+    assert fit.n_points == 5 and fit.method == "ols"
+    assert np.isclose(fit.line(2.0), expected.intercept + 2.0 * expected.slope)
+    flat = growth_rate_fit_result([0, 1, 2], [5.0, 5.0, 5.0])
+    assert (flat.k, flat.intercept, flat.r_squared) == (0.0, np.log2(5.0), 1.0)
+
+def test_growth_rate_fit_stats_matches_scipy_linregress():
+    """Test the p-value and standard errors against scipy.stats.linregress."""
+    from scipy.stats import linregress
+    times = [0.0, 1.0, 2.0, 3.0, 4.0]
+    concentrations = [10.0, 14.5, 21.0, 30.0, 43.0]
+    expected = linregress(times, np.log2(concentrations))
+    stats = growth_rate_fit_stats(times, concentrations)
+    assert np.isclose(stats["intercept"], expected.intercept)
+    assert np.isclose(stats["p_value"], expected.pvalue)
+    assert np.isclose(stats["stderr"], expected.stderr)
+    assert np.isclose(stats["intercept_stderr"], expected.intercept_stderr)
+
+@pytest.mark.parametrize("method", ["theil-sen", "ransac"])
+def test_growth_rate_fit_robust_methods_ignore_outliers(method):
+    """Test that the robust methods recover k=1.0 despite bubble outliers that drag OLS."""
+    times = np.arange(20.0)
+    concentrations = 2 ** times
+    concentrations[[3, 11, 17]] *= 64.0  # Outliers (+6 in log2)
+    k_ols, _ = growth_rate_fit(times, concentrations)
+    k, r2 = growth_rate_fit(times, concentrations, method=method)
+    assert np.isclose(k, 1.0)
+    assert not np.isclose(k_ols, 1.0)
+    assert 0.0 <= r2 <= 1.0
+
+def test_growth_rate_fit_unknown_method():
+    """Test that an unknown fitting method raises ValueError."""
+    with pytest.raises(ValueError, match="Method must be one of"):
+        growth_rate_fit([0.0, 1.0], [1.0, 2.0], method="lasso")
+
+# --- Tests for the batched multi-curve growth_rate_fit_batch function ---
+
+def test_growth_rate_fit_batch_matches_per_curve_fit():
+    """Test that every row matches growth_rate_fit, including the zero-variance row."""
+    times = [0.0, 1.0, 2.0, 3.0, 4.0]
+    matrix = [
+        [1.0, 2.0, 4.0, 8.0, 16.0],
+        [5.0, 5.0, 5.0, 5.0, 5.0],
+        [10.0, 14.5, 21.0, 30.0, 43.0],
+    ]
+    k, intercept, r2 = growth_rate_fit_batch(times, matrix)
+    for i, row in enumerate(matrix):
+        expected_k, expected_r2 = growth_rate_fit(times, row)
+        assert np.isclose(k[i], expected_k)
+        assert np.isclose(r2[i], expected_r2)
+    assert np.allclose(intercept[:2], [0.0, np.log2(5.0)])
+
+def test_growth_rate_fit_batch_per_curve_time_axis():
+    """Test a separate time axis for each curve."""
+    times = [[0.0, 1.0, 2.0], [0.0, 2.0, 4.0]]
+    matrix = [[1.0, 2.0, 4.0], [1.0, 2.0, 4.0]]
+    k, _, r2 = growth_rate_fit_batch(times, matrix)
+    assert np.allclose(k, [1.0, 0.5])
+    assert np.allclose(r2, 1.0)
+
+def test_growth_rate_fit_batch_nan_marks_missing_samples():
+    """Test that NaN samples are skipped and rows with < 2 points give NaN."""
+    times = [0.0, 1.0, 2.0, 3.0]
+    matrix = [[1.0, np.nan, 4.0, 8.0], [3.0, np.nan, np.nan, np.nan]]
+    k, intercept, r2 = growth_rate_fit_batch(times, matrix)
+    assert np.isclose(k[0], 1.0) and np.isclose(r2[0], 1.0)
+    assert np.isnan(k[1]) and np.isnan(intercept[1]) and np.isnan(r2[1])
+
+def test_growth_rate_fit_batch_mismatched_time_axis():
+    """Test that a time axis of the wrong length raises ValueError."""
+    with pytest.raises(ValueError, match="Time axis must have one entry per time point"):
+        growth_rate_fit_batch([0.0, 1.0], [[1.0, 2.0, 4.0]])
+
+# --- Tests for the streaming GrowthRateAccumulator ---
+
+def test_accumulator_matches_growth_rate_fit():
+    """Test that feeding points one by one gives the same fit as growth_rate_fit."""
+    times = [0.0, 1.0, 2.0, 3.0, 4.0]
+    concentrations = [10.0, 14.5, 21.0, 30.0, 43.0]
+    acc = GrowthRateAccumulator()
+    for t, c in zip(times, concentrations):
+        acc.add(t, c)
+    k, r2 = acc.result()
+    expected_k, expected_r2 = growth_rate_fit(times, concentrations)
+    assert np.isclose(k, expected_k)
+    assert np.isclose(r2, expected_r2)
+
+def test_accumulator_window_evicts_old_points():
+    """Test that a fixed window only fits the most recent points."""
+    acc = GrowthRateAccumulator(window=3)
+    # Lag phase first, then perfect doubling (k=1.0)
+    for t, c in [(0, 1.0), (1, 1.0), (2, 1.0), (3, 2.0), (4, 4.0), (5, 8.0)]:
+        acc.add(t, c)
+    k, r2 = acc.result()
+    assert acc.n == 3
+    assert np.isclose(k, 1.0)
+    assert np.isclose(r2, 1.0)
+    assert np.isclose(acc.intercept, -2.0)
+
+def test_accumulator_remove_and_stagnant_data():
+    """Test that removing points downdates the fit and constant data gives k=0, R2=1."""
+    acc = GrowthRateAccumulator()
+    for t, c in [(0, 5.0), (1, 5.0), (2, 5.0), (3, 80.0)]:
+        acc.add(t, c)
+    acc.remove(3, 80.0)
+    assert acc.result() == (0.0, 1.0)
+
+def test_accumulator_window_remove_then_add():
+    """Test that a point removed from a window is not evicted a second time by later adds."""
+    acc = GrowthRateAccumulator(window=3)
+    for t, c in [(0, 1.0), (1, 2.0), (2, 4.0)]:
+        acc.add(t, c)
+    acc.remove(2, 4.0)
+    for t, c in [(3, 8.0), (4, 16.0), (5, 64.0)]:
+        acc.add(t, c)
+    assert acc.n == 3
+    k, r2 = acc.result()
+    expected_k, expected_r2 = growth_rate_fit([3, 4, 5], [8.0, 16.0, 64.0])
+    assert np.isclose(k, expected_k)
+    assert np.isclose(r2, expected_r2)
+    with pytest.raises(ValueError, match="not in the current window"):
+        acc.remove(0, 1.0)
+
+def test_accumulator_recompute_matches_updates():
+    """Test that an exact rebuild from arrays agrees with incremental updates."""
+    times = np.arange(6.0)
+    concentrations = 3.0 * 2 ** (0.5 * times)
+    acc = GrowthRateAccumulator()
+    for t, c in zip(times, concentrations):
+        acc.add(t, c)
+    rebuilt = GrowthRateAccumulator()
+    rebuilt.recompute(times, concentrations)
+    assert rebuilt.n == 6
+    assert np.allclose(rebuilt.result(), acc.result())
+    assert np.isclose(rebuilt.intercept, acc.intercept)
+    with pytest.raises(ValueError, match="must be positive"):
+        rebuilt.recompute([0.0, 1.0], [1.0, 0.0])
+
+def test_accumulator_not_enough_points():
+    """Test that reading the fit with fewer than two points raises ValueError."""
+    acc = GrowthRateAccumulator()
+    acc.add(0.0, 1.0)
+    with pytest.raises(ValueError, match="At least two data points"):
+        acc.result()
+
+# --- Tests for the sliding-window max_growth_rate detector ---
+
+def _lag_exp_stationary_curve():
+    """Lag (5 points), exponential doubling (k=1.0, 10 points), stationary (5 points)."""
+    times = np.arange(20.0)
+    log2_n = np.concatenate([np.zeros(5), np.arange(1.0, 11.0), np.full(5, 10.0)])
+    return times, 0.1 * 2 ** log2_n
+
+def test_max_growth_rate_finds_exponential_phase():
+    """Test that the best window lies in the exponential phase with k=1.0 and lag=4."""
+    times, concentrations = _lag_exp_stationary_curve()
+    result = max_growth_rate(times, concentrations, window=6)
+    assert 4 <= result["start"] and result["stop"] <= 15
+    assert np.isclose(result["k"], 1.0)
+    assert np.isclose(result["r_squared"], 1.0)
+    assert np.isclose(result["lag_time"], 4.0)
+
+def test_max_growth_rate_matches_growth_rate_fit_on_window():
+    """Test that the reported k and R2 equal growth_rate_fit on the chosen window."""
+    rng = np.random.default_rng(1)
+    times = np.linspace(0.0, 10.0, 60)
+    concentrations = 2 ** (np.tanh(times - 5.0) * 3 + rng.normal(0, 0.05, times.size))
+    result = max_growth_rate(times, concentrations, window=8)
+    window = slice(result["start"], result["stop"])
+    k, r2 = growth_rate_fit(times[window], concentrations[window])
+    assert np.isclose(result["k"], k)
+    assert np.isclose(result["r_squared"], r2)
+
+def test_max_growth_rate_batch_of_curves():
+    """Test scanning several curves at once, including a stagnant one."""
+    times, concentrations = _lag_exp_stationary_curve()
+    matrix = np.vstack([concentrations, 3 * concentrations, np.full(20, 5.0)])
+    result = max_growth_rate(times, matrix, window=6)
+    assert np.allclose(result["k"], [1.0, 1.0, 0.0])
+    assert np.allclose(result["lag_time"][:2], 4.0)
+    assert np.isnan(result["lag_time"][2])
+
+def test_max_growth_rate_window_too_long():
+    """Test that a window longer than the curve raises ValueError."""
+    with pytest.raises(ValueError, match="Window is longer"):
+        max_growth_rate([0.0, 1.0], [1.0, 2.0], window=3)
+
+# --- Tests for the segment_growth_phases changepoint search ---
+
+def _noisy_phase_curve(n, seed=0):
+    """Lag until t=5, doubling (k=1.0) until t=15, stationary until t=20, log2 noise 0.05."""
+    rng = np.random.default_rng(seed)
+    times = np.linspace(0.0, 20.0, n)
+    log2_n = np.clip(times - 5.0, 0.0, 10.0) + rng.normal(0, 0.05, n)
+    return times, 2 ** log2_n
+
+def test_segment_growth_phases_exact_curve():
+    """Test that a noise-free three-phase curve is split exactly at its phase boundaries."""
+    times, concentrations = _lag_exp_stationary_curve()
+    result = segment_growth_phases(times, concentrations)
+    # The kink points (t=4, t=14) lie on both neighbouring lines
+    assert [(seg["start"], seg["stop"]) for seg in result["segments"]] == [(0, 4), (4, 14), (14, 20)]
+    assert np.allclose([seg["k"] for seg in result["segments"]], [0.0, 1.0, 0.0])
+    assert np.isclose(result["mu_max"], 1.0)
+    assert np.isclose(result["lag_time"], 4.0)
+    assert np.isclose(result["carrying_capacity"], 0.1 * 2 ** 10)
+
+def test_segment_growth_phases_noisy_curve():
+    """Test lag time, mu_max and carrying capacity on a noisy curve."""
+    times, concentrations = _noisy_phase_curve(200)
+    result = segment_growth_phases(times, concentrations)
+    assert len(result["segments"]) == 3
+    assert np.isclose(result["mu_max"], 1.0, atol=0.02)
+    assert np.isclose(result["lag_time"], 5.0, atol=0.2)
+    assert np.isclose(np.log2(result["carrying_capacity"]), 10.0, atol=0.1)
+
+def test_segment_growth_phases_long_curve_uses_refined_grid():
+    """Test that a 10^5-point curve is segmented with boundaries refined to full resolution."""
+    times, concentrations = _noisy_phase_curve(100_000)
+    result = segment_growth_phases(times, concentrations)
+    boundaries = [seg["t_start"] for seg in result["segments"][1:]]
+    assert len(result["segments"]) == 3
+    assert np.allclose(boundaries, [5.0, 15.0], atol=0.05)
+
+def test_segment_growth_phases_invalid_min_size():
+    """Test that min_size below two raises ValueError."""
+    with pytest.raises(ValueError, match="min_size"):
+        segment_growth_phases([0.0, 1.0, 2.0], [1.0, 2.0, 4.0], min_size=1)
+
+# --- Tests for growth_rate_bootstrap_ci ---
+
+def _noisy_exponential(seed=0, n=50):
+    """Exponential curve with k=0.5 and log2 noise 0.2."""
+    rng = np.random.default_rng(seed)
+    times = np.linspace(0.0, 10.0, n)
+    return times, 2 ** (0.5 * times + rng.normal(0, 0.2, n))
+
+@pytest.mark.parametrize("method", ["pairs", "residual"])
+def test_bootstrap_ci_contains_point_estimate(method):
+    """Test that the interval brackets k and is close to the analytic 95% interval."""
+    times, concentrations = _noisy_exponential()
+    ci = growth_rate_bootstrap_ci(times, concentrations, method=method, seed=1)
+    half_width = 1.96 * growth_rate_fit_stats(times, concentrations)["stderr"]
+    assert ci["lower"] < ci["k"] < ci["upper"]
+    assert np.isclose(ci["upper"] - ci["lower"], 2 * half_width, rtol=0.25)
+
+def test_bootstrap_ci_is_reproducible_with_process_pool():
+    """Test that a seeded 2-D run gives the same intervals in-process and on a process pool."""
+    times, concentrations = _noisy_exponential()
+    matrix = np.vstack([concentrations, 2 * concentrations])
+    serial = growth_rate_bootstrap_ci(times, matrix, n_resamples=2000, seed=3)
+    pooled = growth_rate_bootstrap_ci(times, matrix, n_resamples=2000, seed=3, workers=2)
+    assert np.array_equal(serial["lower"], pooled["lower"])
+    assert np.array_equal(serial["upper"], pooled["upper"])
+
+def test_bootstrap_ci_invalid_method():
+    """Test that an unknown resampling method raises ValueError."""
+    with pytest.raises(ValueError, match="Method must be"):
+        growth_rate_bootstrap_ci([0.0, 1.0, 2.0], [1.0, 2.0, 4.0], method="jackknife")
+
@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+
+import data_loader
+
+from data_loader import (BAD_TIME, MISSING_WELLS, LoadReport, cache_paths, load_growth_data,
+                         load_growth_data_cached, load_plate_data)
+
+
+def test_load_growth_data_collects_all_bad_lines(tmp_path):
+    """Test that bad lines are skipped and reported together with their line numbers."""
+    path = tmp_path / "data.csv"
+    path.write_text("# Time, Concentration\n0, 0.1\nabc, 1\n1.5\t0.25\n4\n\n3.0 0.5\n5, -1\n6, nan\n")
+    times, concentrations, report = load_growth_data(str(path))
+    assert np.allclose(times, [0.0, 1.5, 3.0])
+    assert np.allclose(concentrations, [0.1, 0.25, 0.5])
+    assert report.n_points == 3
+    assert [line_num for line_num, _ in report.errors] == [3, 5, 8, 9]
+    assert "valid numbers" in report.errors[0][1]
+    assert "Missing data" in report.errors[1][1]
+    assert "4 lines skipped" in report.summary()
+
+
+def test_load_growth_data_blocks_match_single_pass(tmp_path):
+    """Test that tiny parse blocks give the same data, order and line numbers as one block."""
+    path = tmp_path / "data.csv"
+    rows = [f"{t}, {0.1 * 2 ** (0.3 * t)}" for t in range(50, 0, -1)]
+    rows[7] = "7, 0"
+    path.write_text("\r\n".join(rows))
+    whole = load_growth_data(str(path))
+    blocked = load_growth_data(str(path), block_bytes=16)
+    assert np.array_equal(whole[0], blocked[0])
+    assert np.array_equal(whole[1], blocked[1])
+    assert np.all(np.diff(whole[0]) > 0)
+    assert whole[2].errors == blocked[2].errors == [(8, whole[2].errors[0][1])]
+
+
+def test_bad_lines_only_slow_parse_their_piece(tmp_path, monkeypatch):
+    """Test that a block with a few bad lines is split, keeping the fast parser on the clean pieces."""
+    path = tmp_path / "data.csv"
+    rows = [f"{t}, {0.1 * 2 ** (0.01 * t)}" for t in range(2000)]
+    rows[150] = "oops, 1"
+    rows[1500] = "# comment"
+    rows[1700] = "1700, -1"
+    path.write_text("\n".join(rows) + "\n")
+    monkeypatch.setattr(data_loader, "_SLOW_PARSE_BYTES", 256)
+    slow_lines = []
+    parse_slow = data_loader._parse_block_slow
+    monkeypatch.setattr(data_loader, "_parse_block_slow",
+                        lambda block, *args: slow_lines.append(block.count(b"\n")) or parse_slow(block, *args))
+    times, concentrations, report = load_growth_data(str(path))
+    assert report.errors == [(151, data_loader.NOT_A_NUMBER), (1701, data_loader.OUT_OF_RANGE)]
+    assert times.size == 1997 and 150 not in times and 1700 not in times
+    assert sum(slow_lines) < 50
+
+
+def test_load_report_summary_truncates():
+    """Test that the summary lists at most max_lines diagnostics."""
+    report = LoadReport("x.csv")
+    for line_num in range(1, 21):
+        report.add(line_num, "Data must be valid numbers.")
+    text = report.summary(max_lines=5)
+    assert not report.ok
+    assert "Line 5:" in text and "Line 6:" not in text
+    assert "... and 15 more." in text
+
+
+def test_cached_load_memory_maps_sidecar(tmp_path):
+    """Test that the second load comes from the memory-mapped sidecar with the same data and report."""
+    path = tmp_path / "data.csv"
+    path.write_text("0, 0.1\n1, 0.2\nbad\n2, 0.4\n")
+    first = load_growth_data_cached(str(path))
+    second = load_growth_data_cached(str(path))
+    assert not first[2].from_cache and second[2].from_cache
+    assert isinstance(second[0].base, np.memmap) or isinstance(second[0], np.memmap)
+    assert np.array_equal(first[0], second[0]) and np.array_equal(first[1], second[1])
+    assert second[2].errors == first[2].errors == [(3, first[2].errors[0][1])]
+
+
+def test_cached_load_rebuilds_stale_sidecar(tmp_path):
+    """Test that a changed source (size/mtime) or a broken sidecar triggers a re-parse."""
+    path = tmp_path / "data.csv"
+    path.write_text("0, 0.1\n1, 0.2\n")
+    load_growth_data_cached(str(path), cache_dir=str(tmp_path / "cache"))
+
+    path.write_text("0, 0.1\n1, 0.2\n2, 0.4\n")
+    times, _, report = load_growth_data_cached(str(path), cache_dir=str(tmp_path / "cache"))
+    assert not report.from_cache
+    assert np.allclose(times, [0, 1, 2])
+
+    _, meta_path = cache_paths(str(path), str(tmp_path / "cache"))
+    with open(meta_path, "w") as f:
+        f.write("{not json")
+    times, _, report = load_growth_data_cached(str(path), cache_dir=str(tmp_path / "cache"))
+    assert not report.from_cache and times.size == 3
+    assert load_growth_data_cached(str(path), cache_dir=str(tmp_path / "cache"))[2].from_cache
+    assert not any(name.startswith(".") for name in os.listdir(tmp_path))
+
+
+def test_load_plate_data_wide_format_in_chunks(tmp_path):
+    """Test that a wide export becomes a (wells x time) matrix with well ids, in any chunk size."""
+    path = tmp_path / "plate.tsv"
+    lines = ["# Kinetic read", "Time\tT 600\tA1\tA2\tB1"]
+    for t in [2, 0, 1, 3]:
+        lines.append(f"{t}\t37.0\t{0.1 * 2 ** (0.5 * t)}\t{0.2 * 2 ** t}\t" + ("OVRFLW" if t == 1 else "0.3"))
+    lines.append("x\t37.0\t1\t1\t1")
+    path.write_text("\n".join(lines) + "\n")
+
+    times, wells, values, report = load_plate_data(str(path), chunk_rows=2)
+    assert wells == ["A1", "A2", "B1"]
+    assert np.allclose(times, [0, 1, 2, 3])
+    assert values.shape == (3, 4)
+    assert np.allclose(values[0], 0.1 * 2 ** (0.5 * times))
+    assert np.isnan(values[2, 1])
+    assert report.errors == [(5, MISSING_WELLS), (7, BAD_TIME)]
+    assert np.array_equal(load_plate_data(str(path))[2], values, equal_nan=True)
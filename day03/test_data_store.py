@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from calculator_logic import growth_rate_fit
+from data_store import GrowthDataStore
+
+
+def test_add_keeps_points_sorted_with_stable_ids():
+    """Test sorted insertion (ties keep insertion order) and id lookup after shifts."""
+    store = GrowthDataStore(capacity=2)
+    ids = [store.add(t, c) for t, c in [(2.0, 0.4), (0.0, 0.1), (1.0, 0.2), (1.0, 0.25)]]
+    assert np.array_equal(store.times, [0.0, 1.0, 1.0, 2.0])
+    assert np.array_equal(store.concentrations, [0.1, 0.2, 0.25, 0.4])
+    assert list(store.ids) == [ids[1], ids[2], ids[3], ids[0]]
+    assert store.get(ids[3]) == (1.0, 0.25)
+    assert store.position(ids[0]) == 3
+
+
+def test_remove_by_id_and_views_are_read_only():
+    """Test removal by row id, unknown ids, and that the views cannot be written."""
+    store = GrowthDataStore()
+    ids = [store.add(t, 0.1 * 2 ** t) for t in range(5)]
+    assert store.remove(ids[2]) == (2.0, 0.4)
+    assert np.array_equal(store.times, [0, 1, 3, 4])
+    with pytest.raises(KeyError):
+        store.remove(ids[2])
+    with pytest.raises(ValueError):
+        store.times[0] = 5.0
+
+
+def test_replace_sorts_and_invalidates_old_ids():
+    """Test bulk replacement (file load) against an argsort of the input."""
+    rng = np.random.default_rng(0)
+    times = rng.integers(0, 50, size=1000).astype(float)
+    concentrations = rng.random(1000) + 0.1
+    store = GrowthDataStore()
+    old_id = store.add(1.0, 1.0)
+    ids = store.replace(times, concentrations)
+    order = np.argsort(times, kind='stable')
+    assert np.array_equal(store.times, times[order])
+    assert np.array_equal(store.concentrations, concentrations[order])
+    assert store.position(int(ids[500])) == 500
+    with pytest.raises(KeyError):
+        store.position(old_id)
+
+
+def test_live_fit_statistics_follow_edits():
+    """Test that add/remove/replace keep fit_stats equal to a full refit, drift bounded by rebuilds."""
+    rng = np.random.default_rng(1)
+    store = GrowthDataStore(recompute_every=50)
+    store.replace(np.arange(1000.0), 0.01 * 2 ** (0.1 * np.arange(1000.0)))
+    ids = list(store.ids)
+    for _ in range(120):
+        store.remove(int(ids.pop(rng.integers(len(ids)))))
+        ids.append(store.add(rng.random() * 1000, rng.random() + 0.5))
+    k, r2 = store.fit_stats.result()
+    expected_k, expected_r2 = growth_rate_fit(store.times, store.concentrations)
+    assert np.isclose(k, expected_k) and np.isclose(r2, expected_r2)
+    assert store.fit_stats.n == len(store) == 1000
+
+    with pytest.raises(ValueError):
+        store.add(1.0, 0.0)
+    assert len(store) == 1000
+    store.clear()
+    assert store.fit_stats.n == 0
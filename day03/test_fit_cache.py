@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from calculator_logic import growth_rate_fit, max_growth_rate
+from fit_cache import FitCache
+
+TIMES = [0.0, 1.0, 2.0, 3.0, 4.0]
+CONCENTRATIONS = [10.0, 14.5, 21.0, 30.0, 43.0]
+
+
+def test_memoize_hits_on_identical_content():
+    """Test that equal inputs (list or array) hit the cache and give the same result."""
+    cache = FitCache()
+    fit = cache.memoize(growth_rate_fit)
+    first = fit(TIMES, CONCENTRATIONS)
+    second = fit(np.array(TIMES), np.array(CONCENTRATIONS))
+    assert first == second == growth_rate_fit(TIMES, CONCENTRATIONS)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_options_are_part_of_the_key():
+    """Test that different options (method, window) are cached separately."""
+    cache = FitCache()
+    fit = cache.memoize(growth_rate_fit)
+    fit(TIMES, CONCENTRATIONS)
+    fit(TIMES, CONCENTRATIONS, method="theil-sen")
+    fit(TIMES, [10.0, 14.5, 21.0, 30.0, 44.0])
+    assert cache.misses == 3 and cache.hits == 0
+
+
+def test_lru_eviction_by_entry_count():
+    """Test that the least recently used entry is evicted first."""
+    cache = FitCache(max_entries=2)
+    fit = cache.memoize(growth_rate_fit)
+    a, b, c = ([1.0, 2.0, 4.0], [1.0, 3.0, 9.0], [1.0, 4.0, 16.0])
+    fit(TIMES[:3], a)
+    fit(TIMES[:3], b)
+    fit(TIMES[:3], a)  # a is now the most recent
+    fit(TIMES[:3], c)  # evicts b
+    assert len(cache) == 2
+    fit(TIMES[:3], a)
+    assert cache.hits == 2
+    fit(TIMES[:3], b)
+    assert cache.misses == 4
+
+
+def test_byte_limit_is_respected():
+    """Test that the memory tier never exceeds its byte budget."""
+    cache = FitCache(max_entries=100, max_bytes=400)
+    fit = cache.memoize(max_growth_rate)
+    for scale in range(1, 10):
+        fit(TIMES, [c * scale for c in CONCENTRATIONS], 3)
+    assert 0 < cache.current_bytes <= 400
+
+
+def test_returned_results_are_copies():
+    """Test that mutating a returned result does not corrupt the cache."""
+    cache = FitCache()
+    fit = cache.memoize(max_growth_rate)
+    result = fit(TIMES, CONCENTRATIONS, 3)
+    result["k"] = -1.0
+    assert fit(TIMES, CONCENTRATIONS, 3)["k"] > 0
+
+
+def test_disk_tier_shared_between_caches(tmp_path):
+    """Test that a second cache (e.g. another process) reads results from disk."""
+    FitCache(disk_dir=str(tmp_path)).call(growth_rate_fit, TIMES, CONCENTRATIONS)
+    other = FitCache(disk_dir=str(tmp_path))
+    assert other.call(growth_rate_fit, TIMES, CONCENTRATIONS) == growth_rate_fit(TIMES, CONCENTRATIONS)
+    assert other.disk_hits == 1 and other.misses == 0
+
+
+def test_errors_are_not_cached():
+    """Test that a failing fit raises every time and is never stored."""
+    cache = FitCache()
+    fit = cache.memoize(growth_rate_fit)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            fit([1.0], [10.0])
+    assert len(cache) == 0 and cache.misses == 2
+
+
+def test_changed_fit_code_misses_the_disk_tier(tmp_path, monkeypatch):
+    """Test that entries written by older fit code or another CACHE_VERSION are not served."""
+    def fit(times, concentrations):
+        return 1.0
+
+    FitCache(disk_dir=str(tmp_path)).call(fit, TIMES, CONCENTRATIONS)
+
+    def fit(times, concentrations):  # Same name, new code
+        return 2.0
+
+    cache = FitCache(disk_dir=str(tmp_path))
+    assert cache.call(fit, TIMES, CONCENTRATIONS) == 2.0
+    assert cache.disk_hits == 0
+    key = FitCache.make_key(fit, (TIMES, CONCENTRATIONS), {})
+    monkeypatch.setattr("fit_cache.CACHE_VERSION", 2)
+    assert FitCache.make_key(fit, (TIMES, CONCENTRATIONS), {}) != key
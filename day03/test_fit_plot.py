@@ -0,0 +1,56 @@
+import os
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+
+from calculator_logic import growth_rate_fit_result
+from fit_plot import FitPlot, lttb
+
+# Budget for preparing and redrawing a 10^6-point fit (best of three runs).
+# Override with REPLOT_BUDGET=<seconds> on slow machines.
+REPLOT_BUDGET = float(os.environ.get("REPLOT_BUDGET", "0.1"))
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    """Test that LTTB returns n_out points, keeps both ends and a single-sample spike."""
+    x = np.arange(100_000, dtype=float)
+    y = np.sin(x / 5000.0)
+    y[31_337] = 10.0
+    xs, ys = lttb(x, y, 500)
+    assert xs.size == ys.size == 500
+    assert xs[0] == 0 and xs[-1] == x[-1]
+    assert np.all(np.diff(xs) > 0)
+    assert 10.0 in ys
+    small_x, small_y = lttb(x[:10], y[:10], 500)
+    assert small_x.size == 10
+
+
+def test_fit_plot_reuses_artists_and_replots_quickly():
+    """Test that refits only update the same Line2D objects and a 10^6-point replot is fast."""
+    fig = plt.figure(figsize=(6, 4), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    plot = FitPlot(fig, canvas)
+    points_line, fit_line = plot.points_line, plot.fit_line
+
+    t = np.linspace(0, 10, 1_000_000)
+    y = 0.7 * t + np.random.default_rng(0).normal(0, 0.05, t.size)
+    fit = growth_rate_fit_result(t, 2.0 ** y)
+    plot.show(plot.prepare(t, y, fit), "hours")
+
+    elapsed = []
+    for _ in range(3):
+        start = time.perf_counter()
+        plot.show(plot.prepare(t, y, fit), "hours")
+        elapsed.append(time.perf_counter() - start)
+
+    assert plot.points_line is points_line and plot.fit_line is fit_line
+    assert len(plot.ax.lines) == 2
+    assert points_line.get_xdata().size == plot.max_points
+    assert np.isclose(fit_line.get_ydata()[-1], fit.intercept + fit.k * 10)
+    best = min(elapsed)
+    assert best < REPLOT_BUDGET, f"replot took {best:.3f}s (budget {REPLOT_BUDGET}s)"
+    plt.close(fig)
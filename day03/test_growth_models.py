@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from growth_models import MODELS, fit_growth_model
+
+TRUE_PARAMS = np.array([
+    [-3.0, 8.0, 0.9, 4.0],  # y0, A, mu, lam
+    [-2.0, 6.0, 0.5, 6.0],
+    [-4.0, 7.0, 1.2, 2.0],
+])
+TIMES = np.linspace(0.0, 24.0, 40)
+
+
+@pytest.mark.parametrize("model", sorted(MODELS))
+def test_analytic_jacobian_matches_finite_differences(model):
+    """Test every model's analytic Jacobian against central differences."""
+    f = MODELS[model]
+    _, jac = f(TIMES, TRUE_PARAMS)
+    eps = 1e-6
+    for i in range(4):
+        shift = eps * np.eye(4)[i]
+        numeric = (f(TIMES, TRUE_PARAMS + shift)[0] - f(TIMES, TRUE_PARAMS - shift)[0]) / (2 * eps)
+        assert np.allclose(jac[..., i], numeric, atol=1e-6)
+
+
+@pytest.mark.parametrize("model", sorted(MODELS))
+def test_fit_growth_model_recovers_parameters_in_batch(model):
+    """Test that noisy curves of several wells are fitted together and recover mu, lag and asymptote."""
+    rng = np.random.default_rng(0)
+    log2_n, _ = MODELS[model](TIMES, TRUE_PARAMS)
+    concentrations = 2 ** (log2_n + rng.normal(0, 0.03, log2_n.shape))
+    result = fit_growth_model(TIMES, concentrations, model=model)
+    assert result["converged"].all()
+    assert np.allclose(result["mu_max"], TRUE_PARAMS[:, 2], rtol=0.05)
+    assert np.allclose(result["lag"], TRUE_PARAMS[:, 3], atol=0.3)
+    assert np.allclose(np.log2(result["asymptote"]), TRUE_PARAMS[:, 0] + TRUE_PARAMS[:, 1], atol=0.1)
+    assert (result["r_squared"] > 0.99).all()
+
+
+def test_fit_growth_model_single_curve_with_missing_samples():
+    """Test a single 1-D curve where NaN marks missing samples."""
+    log2_n, _ = MODELS["gompertz"](TIMES, TRUE_PARAMS[:1])
+    concentrations = 2 ** log2_n[0]
+    concentrations[[5, 17, 30]] = np.nan
+    result = fit_growth_model(TIMES, concentrations)
+    assert isinstance(result["mu_max"], float)
+    assert np.isclose(result["mu_max"], 0.9, rtol=1e-3)
+    assert np.isclose(result["lag"], 4.0, atol=1e-2)
+
+
+def test_fit_growth_model_unknown_model():
+    """Test that an unknown model name raises ValueError."""
+    with pytest.raises(ValueError, match="Model must be one of"):
+        fit_growth_model(TIMES, np.ones(TIMES.size), model="richards")
@@ -0,0 +1,76 @@
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+
+from gui_startup import HeavyImports, StartupTimer
+from tk_worker import TkWorker
+
+# Budget (seconds) for the imports that run before the GUI window is built.
+# Override with GUI_STARTUP_BUDGET=<seconds> on slow machines.
+GUI_STARTUP_BUDGET = float(os.environ.get("GUI_STARTUP_BUDGET", "0.3"))
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GUI_SCRIPT = os.path.join(HERE, "growth_rateGUI..py")
+
+
+class FakeRoot:
+    """Stand-in for a Tk root: `after` callbacks are run by `pump` on the test thread."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def pump(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            self.pending.pop(0)()
+            time.sleep(0.001)
+
+
+def _gui_eager_imports():
+    """Import statements at the top level of the GUI script (those run before the window exists)."""
+    with open(GUI_SCRIPT, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def test_heavy_imports_warm_up_and_require_call_on_ready_once():
+    """Test that the modules load in the background or on demand, and on_ready runs once."""
+    ready = []
+    heavy = HeavyImports(["fractions", "decimal"], on_ready=lambda modules: ready.append(sorted(modules)))
+    root = FakeRoot()
+    worker = TkWorker(root)
+    heavy.start_warm_up(worker)
+    modules = heavy.require()  # The user was faster than the warm-up
+    root.pump()
+    assert ready == [["decimal", "fractions"]]
+    assert heavy.ready and modules["fractions"].Fraction(1, 2) == 0.5
+    worker.shutdown()
+
+
+def test_startup_timer_marks_and_reports():
+    """Test that marks are seconds since the start and are reported as JSON."""
+    timer = StartupTimer(time.perf_counter() - 1.0)
+    assert timer.mark("window") >= 1.0
+    report = json.loads(timer.report())
+    assert report["seconds"]["window"] >= 1.0
+    assert "window" in report["heavy_modules_loaded"]
+
+
+def test_gui_eager_imports_are_light():
+    """Test that the GUI's top-level imports load no NumPy/Matplotlib and stay within budget (best of 3)."""
+    script = "\n".join(["import json, sys, time", "start = time.perf_counter()"] + _gui_eager_imports() + [
+        "elapsed = time.perf_counter() - start",
+        "print(json.dumps({'seconds': elapsed, 'heavy': sorted(m for m in ('numpy', 'scipy', 'matplotlib')"
+        " if m in sys.modules)}))",
+    ])
+    runs = [json.loads(subprocess.run([sys.executable, "-c", script], cwd=HERE, capture_output=True,
+                                      text=True, check=True).stdout) for _ in range(3)]
+    assert runs[0]["heavy"] == []
+    best = min(run["seconds"] for run in runs)
+    assert best < GUI_STARTUP_BUDGET, f"GUI imports took {best:.3f}s (budget {GUI_STARTUP_BUDGET}s)"
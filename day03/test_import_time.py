@@ -0,0 +1,35 @@
+import json
+import os
+import subprocess
+import sys
+
+# Cold-start budget (seconds) for `import calculator_logic`. Override with
+# IMPORT_TIME_BUDGET=<seconds> on slow machines.
+IMPORT_TIME_BUDGET = float(os.environ.get("IMPORT_TIME_BUDGET", "0.5"))
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+MEASURE_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import calculator_logic
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "scipy_loaded": "scipy" in sys.modules}))
+"""
+
+def _measure_import():
+    """Imports calculator_logic in a fresh interpreter and returns its measurements."""
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE_SCRIPT],
+        cwd=HERE, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output)
+
+def test_import_does_not_load_scipy():
+    """Test that SciPy is not imported at module load (only lazily for p-values)."""
+    assert not _measure_import()["scipy_loaded"]
+
+def test_import_time_within_budget():
+    """Test that a cold `import calculator_logic` stays within the time budget (best of 3)."""
+    best = min(_measure_import()["seconds"] for _ in range(3))
+    assert best < IMPORT_TIME_BUDGET, f"import took {best:.3f}s (budget {IMPORT_TIME_BUDGET}s)"
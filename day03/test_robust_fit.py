@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from robust_fit import _merge_passes, ransac, theil_sen
+
+
+def test_merge_passes_counts_inversions():
+    """Test the inversion count against a brute-force double loop."""
+    rng = np.random.default_rng(0)
+    for size in [1, 2, 7, 33, 64]:
+        seq = rng.permutation(size)
+        expected = sum(1 for i in range(size) for j in range(i + 1, size) if seq[i] > seq[j])
+        assert _merge_passes(seq)[0].sum() == expected
+
+
+@pytest.mark.parametrize("n", [5, 60, 1500])
+def test_theil_sen_matches_scipy(n):
+    """Test the median slope against scipy.stats.theilslopes, including tied x and y values."""
+    from scipy.stats import theilslopes
+    rng = np.random.default_rng(n)
+    x = rng.integers(0, max(2, n // 3), n).astype(float)
+    y = rng.normal(size=n).round(1)
+    assert np.isclose(theil_sen(x, y)[0], theilslopes(y, x).slope)
+
+
+def test_theil_sen_large_curve_with_outliers():
+    """Test a 10^4-point line with 20% gross outliers (no O(n^2) pair matrix is built)."""
+    rng = np.random.default_rng(1)
+    x = np.sort(rng.uniform(0.0, 10.0, 10_000))
+    y = 0.5 * x + rng.normal(0, 0.1, x.size)
+    y[rng.random(x.size) < 0.2] += 5.0
+    slope, intercept = theil_sen(x, y)
+    assert np.isclose(slope, 0.5, atol=0.01)
+    assert np.isclose(intercept, 0.0, atol=0.1)
+
+
+def test_ransac_ignores_heavy_contamination():
+    """Test that RANSAC recovers the line when 40% of the points are outliers."""
+    rng = np.random.default_rng(2)
+    x = np.linspace(0.0, 10.0, 200)
+    y = 2.0 * x + 1.0 + rng.normal(0, 0.05, x.size)
+    outliers = rng.random(x.size) < 0.4
+    y[outliers] = rng.uniform(-20.0, 40.0, outliers.sum())
+    slope, intercept, inliers = ransac(x, y)
+    assert np.isclose(slope, 2.0, atol=0.02)
+    assert np.isclose(intercept, 1.0, atol=0.1)
+    assert not inliers[outliers & (np.abs(y - (2.0 * x + 1.0)) > 1.0)].any()
+
+
+def test_theil_sen_identical_x_raises_value_error():
+    """Test that a vertical data set (all x equal) raises ValueError."""
+    with pytest.raises(ValueError, match="must not all be identical"):
+        theil_sen([1.0, 1.0, 1.0], [1.0, 2.0, 3.0])
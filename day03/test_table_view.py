@@ -0,0 +1,114 @@
+import numpy as np
+
+from data_store import GrowthDataStore
+from table_view import GrowthTable, diff_rows
+
+
+class FakeTree:
+    """Minimal stand-in for ttk.Treeview (no display needed) that counts edits."""
+
+    def __init__(self):
+        self.rows = []  # [iid, values] in display order
+        self.edits = 0
+
+    def get_children(self):
+        return tuple(iid for iid, _ in self.rows)
+
+    def insert(self, parent, index, iid, values):
+        position = len(self.rows) if index == 'end' else index
+        self.rows.insert(position, [iid, list(values)])
+        self.edits += 1
+
+    def delete(self, *items):
+        self.rows = [row for row in self.rows if row[0] not in items]
+        self.edits += len(items)
+
+    def set(self, item, column, value):
+        next(row for row in self.rows if row[0] == item)[1][0] = value
+        self.edits += 1
+
+    def selection(self):
+        return ()
+
+    def selection_set(self, items):
+        pass
+
+    def configure(self, **options):
+        pass
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def yview(self, *args):
+        pass
+
+
+class FakeScrollbar:
+    def __init__(self):
+        self.position = None
+
+    def set(self, first, last):
+        self.position = (first, last)
+
+    def configure(self, **options):
+        pass
+
+
+class SmallTable(GrowthTable):
+    def visible_rows(self):
+        return 10
+
+
+def _labels(tree):
+    return [values[0] for _, values in tree.rows]
+
+
+def test_diff_rows_only_touches_changed_rows():
+    """Test that the diff lists the new and gone ids and where numbering changes."""
+    deleted, inserts, first_change = diff_rows([1, 2, 3, 4], [1, 2, 9, 4, 7])
+    assert deleted == [3]
+    assert inserts == [(2, 9), (4, 7)]
+    assert first_change == 2
+    assert diff_rows([1, 2], [1, 2]) == ([], [], 2)
+
+
+def test_table_diff_mode_matches_store_with_few_edits():
+    """Test that appending a point is one insert, and the table always mirrors the store."""
+    store = GrowthDataStore()
+    tree = FakeTree()
+    table = SmallTable(tree, FakeScrollbar(), store, virtual_threshold=100)
+    for t in range(20):
+        store.add(float(t), 1.0)
+    table.refresh()
+    tree.edits = 0
+    store.add(25.0, 2.0)
+    table.refresh()
+    assert tree.edits == 1
+
+    middle = int(store.ids[5])
+    store.remove(middle)
+    store.add(2.5, 3.0)
+    table.refresh()
+    assert [int(iid) for iid in tree.get_children()] == store.ids.tolist()
+    assert _labels(tree) == list(range(1, len(store) + 1))
+
+
+def test_table_virtual_mode_renders_only_visible_window():
+    """Test that a large store only puts one screen of rows into the tree."""
+    store = GrowthDataStore()
+    store.replace(np.arange(100_000, dtype=float), np.ones(100_000))
+    tree = FakeTree()
+    scrollbar = FakeScrollbar()
+    table = SmallTable(tree, scrollbar, store, virtual_threshold=1000)
+    table.refresh()
+    assert table.virtual and len(tree.rows) == 10
+
+    table._on_scrollbar("moveto", "0.5")
+    assert _labels(tree)[0] == 50_001
+    assert [int(iid) for iid in tree.get_children()] == store.ids[50_000:50_010].tolist()
+    assert scrollbar.position == (0.5, 0.5001)
+
+    store.replace(np.arange(5, dtype=float), np.ones(5))
+    table.refresh()
+    assert not table.virtual
+    assert [int(iid) for iid in tree.get_children()] == store.ids.tolist()
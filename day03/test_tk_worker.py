@@ -0,0 +1,74 @@
+import threading
+import time
+
+from tk_worker import JobCancelled, TkWorker
+
+
+class FakeRoot:
+    """Stand-in for a Tk root: `after` callbacks are run by `pump` on the test thread."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def pump(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            callback = self.pending.pop(0)
+            callback()
+            time.sleep(0.001)
+
+
+def test_results_are_delivered_on_the_polling_thread():
+    """Test that done/error callbacks run in the thread that pumps the event loop."""
+    root = FakeRoot()
+    worker = TkWorker(root)
+    delivered = []
+    worker.submit(sum, [1, 2, 3], channel="a",
+                  on_done=lambda result: delivered.append((result, threading.current_thread())))
+    worker.submit(int, "not a number", channel="b", on_error=lambda e: delivered.append(type(e)))
+    root.pump()
+    assert (6, threading.current_thread()) in delivered
+    assert ValueError in delivered
+    assert not worker.busy("a") and not worker.busy("b")
+    worker.shutdown()
+
+
+def test_superseded_and_cancelled_jobs_are_discarded():
+    """Test that only the newest job of a channel reports, and cancel stops a job at its next check."""
+    root = FakeRoot()
+    worker = TkWorker(root)
+    release = threading.Event()
+    delivered = []
+
+    def slow(job, value):
+        release.wait(5)
+        job.progress(0.5)
+        return value
+
+    worker.submit(slow, "old", channel="fit", pass_job=True, on_done=delivered.append)
+    worker.submit(slow, "new", channel="fit", pass_job=True, on_done=delivered.append,
+                  on_progress=lambda fraction, message: delivered.append(fraction))
+    release.set()
+    root.pump()
+    assert delivered == [0.5, "new"]
+
+    cancelled = []
+
+    def loop(job):
+        while True:
+            try:
+                job.check()
+            except JobCancelled:
+                cancelled.append(True)
+                raise
+            time.sleep(0.001)
+
+    worker.submit(loop, channel="fit", pass_job=True, on_error=delivered.append)
+    worker.cancel("fit")
+    root.pump()
+    assert cancelled == [True]
+    assert delivered == [0.5, "new"]
+    worker.shutdown()
@@ -0,0 +1,202 @@
+"""tk_worker.py
+
+Background jobs for Tkinter GUIs.
+
+Tk widgets may only be touched from the main thread, so long work (parsing a
+file, fitting, preparing a figure, a slow import) runs on a small thread pool
+and its result is handed back through the Tk event loop: workers put messages
+on a queue that the main thread drains with `root.after`.
+
+Jobs are grouped in channels (e.g. "load", "fit"). Submitting a new job on a
+channel supersedes the previous one: the old job is asked to stop and its
+result, if it still arrives, is discarded. Jobs can report progress and check
+for cancellation through the `Job` object.
+
+Example:
+    worker = TkWorker(root)
+    status = WorkerStatus(frame, worker, channel="load")  # One status per channel
+    status.grid(row=3, column=0)
+    worker.submit(parse_file, path, channel="load", on_done=show_data,
+                  on_progress=status.show_progress)
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk
+from typing import Callable, Dict, Optional
+
+
+class JobCancelled(Exception):
+    """Raised inside a job (by `Job.progress`/`Job.check`) once it has been cancelled."""
+
+
+class Job:
+    """Handle of one background job, passed to the work function when `pass_job=True`."""
+
+    def __init__(self, worker: "TkWorker", channel: str, generation: int):
+        self.worker = worker
+        self.channel = channel
+        self.generation = generation
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def check(self) -> None:
+        """Raises JobCancelled if the job was cancelled or superseded."""
+        if self.cancelled:
+            raise JobCancelled()
+
+    def progress(self, fraction: Optional[float] = None, message: str = "") -> None:
+        """
+        Reports progress (fraction in [0, 1], or None if unknown) to the GUI.
+
+        Raises:
+            JobCancelled: If the job was cancelled, so work functions stop at their next report.
+        """
+        self.check()
+        self.worker._messages.put(("progress", self, (fraction, message)))
+
+
+class TkWorker:
+    """
+    Runs functions on a thread pool and delivers their results on the Tk main thread.
+
+    Args:
+        root: The Tk root (or any widget) whose event loop receives the results.
+        max_workers (int): Number of worker threads.
+        poll_ms (int): How often the main thread checks for finished jobs while any are running.
+    """
+
+    def __init__(self, root, max_workers: int = 2, poll_ms: int = 30):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tk-worker")
+        self._messages: "queue.Queue" = queue.Queue()
+        self._current: Dict[str, Job] = {}
+        self._callbacks: Dict[Job, tuple] = {}
+        self._generation = 0
+        self._polling = False
+
+    def submit(self, func: Callable, *args, channel: str = "default",
+               on_done: Optional[Callable] = None, on_error: Optional[Callable] = None,
+               on_progress: Optional[Callable] = None, pass_job: bool = False, **kwargs) -> Job:
+        """
+        Runs func(*args, **kwargs) in the background (func(job, *args, **kwargs) with
+        `pass_job`). Supersedes the running job of the same channel.
+
+        The callbacks run on the Tk main thread, and only for the current job of
+        the channel: on_done(result), on_error(exception), on_progress(fraction, message).
+        """
+        self.cancel(channel)
+        self._generation += 1
+        job = Job(self, channel, self._generation)
+        self._current[channel] = job
+        self._callbacks[job] = (on_done, on_error, on_progress)
+
+        def run():
+            try:
+                result = func(job, *args, **kwargs) if pass_job else func(*args, **kwargs)
+                self._messages.put(("done", job, result))
+            except BaseException as exc:  # Delivered to the GUI, never lost in the thread
+                self._messages.put(("error", job, exc))
+
+        self._executor.submit(run)
+        self._start_polling()
+        return job
+
+    def cancel(self, channel: str = "default") -> None:
+        """Cancels the current job of a channel; its result will be discarded."""
+        job = self._current.pop(channel, None)
+        if job is not None:
+            job.cancel()
+
+    def busy(self, channel: str = "default") -> bool:
+        """True while a job of the channel is running."""
+        return channel in self._current
+
+    def _start_polling(self) -> None:
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self) -> None:
+        """Main thread: delivers queued messages of current jobs, drops stale ones."""
+        while True:
+            try:
+                kind, job, payload = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            current = self._current.get(job.channel) is job
+            on_done, on_error, on_progress = self._callbacks.get(job, (None, None, None))
+            if kind != "progress":
+                self._callbacks.pop(job, None)
+                if current:
+                    del self._current[job.channel]
+            if not current or (kind == "error" and isinstance(payload, JobCancelled)):
+                continue
+            if kind == "progress" and on_progress is not None:
+                on_progress(*payload)
+            elif kind == "done" and on_done is not None:
+                on_done(payload)
+            elif kind == "error" and on_error is not None:
+                on_error(payload)
+
+        if self._callbacks:
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
+
+    def shutdown(self) -> None:
+        """Cancels all jobs and stops the threads (call when the window closes)."""
+        for channel in list(self._current):
+            self.cancel(channel)
+        self._executor.shutdown(wait=False)
+
+
+class WorkerStatus(ttk.Frame):
+    """
+    Progress bar, status text and Cancel button for the jobs of one channel.
+
+    Call `start(text)` when submitting, pass `show_progress` as `on_progress`,
+    and call `finish()` from the done/error callbacks.
+    """
+
+    def __init__(self, master, worker: TkWorker, channel: str = "default", **kwargs):
+        super().__init__(master, **kwargs)
+        self.worker = worker
+        self.channel = channel
+        self.bar = ttk.Progressbar(self, mode="indeterminate", length=120, maximum=1.0)
+        self.label = ttk.Label(self, text="")
+        self.cancel_button = ttk.Button(self, text="Cancel", command=self.cancel, state="disabled")
+        self.bar.grid(row=0, column=0, padx=2)
+        self.label.grid(row=0, column=1, padx=2, sticky="w")
+        self.cancel_button.grid(row=0, column=2, padx=2)
+
+    def start(self, text: str = "Working...") -> None:
+        """Shows the busy state (the Cancel button stops the jobs of this status's channel)."""
+        self.bar.configure(mode="indeterminate", value=0)
+        self.bar.start(15)
+        self.label.configure(text=text)
+        self.cancel_button.configure(state="normal")
+
+    def show_progress(self, fraction: Optional[float] = None, message: str = "") -> None:
+        if fraction is not None:
+            self.bar.stop()
+            self.bar.configure(mode="determinate", value=fraction)
+        if message:
+            self.label.configure(text=message)
+
+    def finish(self, text: str = "") -> None:
+        self.bar.stop()
+        self.bar.configure(mode="determinate", value=0)
+        self.label.configure(text=text)
+        self.cancel_button.configure(state="disabled")
+
+    def cancel(self) -> None:
+        self.worker.cancel(self.channel)
+        self.finish("Cancelled.")